@@ -1,21 +1,12 @@
-import lxml
-import requests
-from bs4 import BeautifulSoup
-import re
-import time
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'cricket-mcp-server-main'))
+import scraper  # noqa: E402
 
+# Live scores come from the bridge scraper layer (pooled session, parse memo)
+live_matches = [f"{m['name']}: {m['score']} {m['status']}".strip()
+                for m in scraper.get_cricbuzz_matches()]
 
-link = f"https://www.cricbuzz.com/cricket-match/live-scores"
-source = requests.get(link).text
-page = BeautifulSoup(source, "lxml")
-
-page = page.find("div",class_="cb-col cb-col-100 cb-bg-white")
-matches = page.find_all("div",class_="cb-scr-wll-chvrn cb-lv-scrs-col")
-
-live_matches = []
-
-for i in range(len(matches)):
-    live_matches.append(matches[i].text.strip())
-
-print(live_matches)
\ No newline at end of file
+print(live_matches)
@@ -1,27 +1,13 @@
-import lxml
-import requests
-from bs4 import BeautifulSoup
-import re
-import time
+import os
+import sys
 
-link = f"https://www.cricbuzz.com/cricket-schedule/upcoming-series/international"
-source = requests.get(link).text
-page = BeautifulSoup(source, "lxml")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'cricket-mcp-server-main'))
+import bridge_server  # noqa: E402
 
-# Find all match containers
-match_containers = page.find_all("div", class_="cb-col-100 cb-col")
+# Upcoming fixtures from the bridge schedule index (shared cache)
+bridge_server.load_schedule()
+upcoming, _ = bridge_server.schedule_index.query(upcoming=True)
+matches = [f"{m['date']} - {m['name']}" for m in upcoming]
 
-matches = []
-
-# Iterate through each match container
-for container in match_containers:
-    # Extract match details
-    date = container.find("div", class_="cb-lv-grn-strip text-bold")
-    match_info = container.find("div", class_="cb-col-100 cb-col")
-    
-    if date and match_info:
-        match_date = date.text.strip()
-        match_details = match_info.text.strip()
-        matches.append(f"{match_date} - {match_details}")
-
-print(f"Upcoming Matches: {matches}")
\ No newline at end of file
+print(f"Upcoming Matches: {matches}")
@@ -0,0 +1,67 @@
+"""
+Startup benchmark — cold import time and time to first 200.
+===========================================================
+Each run starts a fresh interpreter, imports bridge_server and serves
+GET /health through Flask's test client (no network), so the numbers are
+what a freshly scaled dyno pays before it can answer traffic.
+
+Usage:
+    python bench_startup.py                 # median of 5 runs, printed as JSON
+    python bench_startup.py --runs 9 --max-import-ms 400 --max-first-ms 50
+
+With thresholds set the exit code is 1 on regression, so CI can track it.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import bridge_server
+t1 = time.perf_counter()
+res = bridge_server.app.test_client().get('/health')
+t2 = time.perf_counter()
+assert res.status_code == 200, res.status_code
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "first_200_ms": (t2 - t1) * 1000}))
+"""
+
+
+def run_once():
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=here, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure bridge_server cold start.")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float)
+    parser.add_argument('--max-first-ms', type=float)
+    args = parser.parse_args(argv)
+
+    samples = [run_once() for _ in range(args.runs)]
+    result = {
+        metric: round(statistics.median(s[metric] for s in samples), 1)
+        for metric in ("import_ms", "first_200_ms")
+    }
+    result["runs"] = args.runs
+    print(json.dumps(result))
+
+    failed = False
+    if args.max_import_ms is not None and result["import_ms"] > args.max_import_ms:
+        print(f"REGRESSION: import {result['import_ms']} ms > {args.max_import_ms} ms")
+        failed = True
+    if args.max_first_ms is not None and result["first_200_ms"] > args.max_first_ms:
+        print(f"REGRESSION: first 200 {result['first_200_ms']} ms > {args.max_first_ms} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
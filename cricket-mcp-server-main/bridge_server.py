@@ -9,13 +9,38 @@ Designed to handle 1M+ users with aggressive TTL caching.
 """
 
 import os
+import sys
+import json
 import time
+import hashlib
+import hmac
+import calendar
 import threading
+import math
 import urllib.parse
 import scraper
-from flask import Flask, jsonify, request
+import crawler
+import extract_rules
+import match_priority
+from ratelimit import RateLimiter, ConcurrencyGate, Overloaded
+from schedule_store import ScheduleStore
+from live_state import LiveState
+from shared_cache import SqliteCache
+from commentary_scheduler import CommentaryScheduler, classify_status
+from profile_index import ProfileIndex
+from profiler import Profiler
+from key_pool import KeyPool, mask
+import payload as payloads
+try:
+    from dotenv import load_dotenv
+except ImportError:  # optional outside the Railway/Heroku image
+    load_dotenv = None
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
-import requests as http_requests
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+if load_dotenv:
+    load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
 
 app = Flask(__name__)
 CORS(app)
@@ -24,6 +49,9 @@ CORS(app)
 # API KEYS — set via environment variables for security
 # =============================================================================
 CRICKET_API_KEY = os.environ.get('CRICKET_API_KEY', '8a6dca69-ebae-44c8-b6c5-6e5259aae943')
+# Comma-separated; calls are spread across the keys (key_pool.py)
+CRICKET_API_KEYS = [k for k in os.environ.get('CRICKET_API_KEYS', '').split(',') if k.strip()] or [CRICKET_API_KEY]
+CRICKET_KEY_COOLDOWN = int(os.environ.get('CRICKET_KEY_COOLDOWN', 900))  # seconds out of rotation after a quota error
 NEWS_API_KEY = os.environ.get('NEWS_API_KEY', 'pub_f3adb2303ff64d9eb25d17fd3c68fd13')
 
 # =============================================================================
@@ -41,6 +69,77 @@ RANKINGS_TTL = 21600    # 6 hours (rankings change daily at most)
 NEWS_TTL = 3600         # 1 hour (news doesn't need real-time)
 PLAYER_TTL = 86400      # 24 hours (player stats change rarely)
 MATCH_TTL = 300         # 5 minutes (match details)
+# Cricbuzz profiles are served for PROFILE_TTL but refreshed in the
+# background once older than PLAYER_TTL; the name -> id index lives longer
+PROFILE_TTL = int(os.environ.get('PROFILE_TTL', 7 * 86400))
+PROFILE_INDEX_TTL = int(os.environ.get('PROFILE_INDEX_TTL', 30 * 86400))
+PROFILE_MISS_TTL = int(os.environ.get('PROFILE_MISS_TTL', 3600))  # names a search did not find
+
+# =============================================================================
+# CRAWLER LIMITS — cricapi pages list endpoints in windows of 25 rows
+# =============================================================================
+SCHEDULE_MAX_PAGES = int(os.environ.get('SCHEDULE_MAX_PAGES', 10))
+PLAYER_SEARCH_MAX_PAGES = int(os.environ.get('PLAYER_SEARCH_MAX_PAGES', 3))
+CRAWL_MAX_WORKERS = int(os.environ.get('CRAWL_MAX_WORKERS', 4))
+CRICAPI_QUOTA_RESERVE = int(os.environ.get('CRICAPI_QUOTA_RESERVE', 10))
+# With fewer not-yet-started cricapi matches than this, or when the crawl could
+# not cover cricapi's totalRows, /schedule also merges Cricbuzz upcoming series
+SCHEDULE_MIN_UPCOMING = int(os.environ.get('SCHEDULE_MIN_UPCOMING', 10))
+
+# =============================================================================
+# CACHE PRIMING — 0 disables the background job (see prime_cache.py)
+# =============================================================================
+PRIME_INTERVAL = int(os.environ.get('PRIME_INTERVAL', 0))
+PRIME_TOP_PLAYERS = int(os.environ.get('PRIME_TOP_PLAYERS', 10))
+PRIME_MATCH_IDS = [m for m in os.environ.get('PRIME_MATCH_IDS', '').split(',') if m]
+
+# =============================================================================
+# ADMISSION CONTROL — per client+route token buckets, global upstream cap
+# =============================================================================
+# (requests per minute, burst) keyed by Flask endpoint name
+RATE_LIMIT_DEFAULT = (int(os.environ.get('RATE_LIMIT_PER_MIN', 300)),
+                      int(os.environ.get('RATE_LIMIT_BURST', 60)))
+RATE_LIMITS = {
+    'get_player': (30, 10),        # cache misses cost two cricapi calls
+    'get_profile': (30, 10),       # cache misses cost a search and a scrape
+    'get_match_details': (120, 30),
+    'get_commentary': (120, 30),
+    'clear_cache': (2, 2),
+    'prime_cache_now': (1, 1),
+    'profile_report': (6, 3),
+    'slow_requests': (6, 3),
+}
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 10000))
+UPSTREAM_CONCURRENCY = int(os.environ.get('UPSTREAM_CONCURRENCY', 16))
+# Proxies in front of the app (the Railway/Heroku router is one). The client
+# address is taken this many hops from the right of X-Forwarded-For, so
+# entries a client forges on the left are ignored; 0 when serving directly
+TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 1))
+# Admin routes (/cache/*, /debug/*) require a matching X-Admin-Token header
+# and are disabled while it is unset
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+# =============================================================================
+# LEGACY ROUTES — Cricket-API-main's main.py turns this on: /players/<name>
+# serves the Cricbuzz profile in its old shape; /live and /schedule list
+# cricapi's matches only, with the old item fields
+# =============================================================================
+LEGACY_ROUTES = os.environ.get('LEGACY_ROUTES', 'false').lower() == 'true'
+
+# =============================================================================
+# PROFILING — opt-in stack sampling (profiler.py); both off by default
+# =============================================================================
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # fraction of requests
+PROFILE_SLOW_MS = int(os.environ.get('PROFILE_SLOW_MS', 0))             # capture requests slower than this
+PROFILE_INTERVAL_MS = int(os.environ.get('PROFILE_INTERVAL_MS', 10))
+
+# =============================================================================
+# SCRAPE WORKER — when SCRAPE_INLINE=false, worker.py owns every Cricbuzz
+# scrape and web processes only read what it wrote (needs a shared CACHE_PATH)
+# =============================================================================
+CACHE_PATH = os.environ.get('CACHE_PATH', '')
+SCRAPE_INLINE = os.environ.get('SCRAPE_INLINE', 'true').lower() == 'true'
+WORKER_STALE_TTL = int(os.environ.get('WORKER_STALE_TTL', 86400))  # serve worker output this long
 
 # =============================================================================
 # CACHING SYSTEM — thread-safe, serves 1M+ users from memory
@@ -62,6 +161,21 @@ class Cache:
         with self._lock:
             self._store[key] = {"data": data, "timestamp": time.time()}
 
+    def stamp(self, key):
+        """Timestamp of the current entry for `key` (None if absent)."""
+        with self._lock:
+            entry = self._store.get(key)
+            return entry["timestamp"] if entry else None
+
+    def claim(self, key, ttl_seconds):
+        """Stamp `key` unless it was stamped within `ttl_seconds`; True if we did."""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry and time.time() - entry["timestamp"] < ttl_seconds:
+                return False
+            self._store[key] = {"data": True, "timestamp": time.time()}
+            return True
+
     def clear(self):
         with self._lock:
             self._store.clear()
@@ -73,31 +187,94 @@ class Cache:
                          if time.time() - v["timestamp"] < 86400)
             return {"total_keys": total, "active_keys": active}
 
-cache = Cache()
+cache = SqliteCache(CACHE_PATH) if CACHE_PATH else Cache()
+if CACHE_PATH:
+    # One page memo, fetch counters and extraction telemetry for every process
+    scraper.use_shared_cache(cache)
+rate_limiter = RateLimiter(max_keys=RATE_LIMIT_MAX_KEYS)
+upstream_gate = ConcurrencyGate(UPSTREAM_CONCURRENCY)
+cricapi_keys = KeyPool(CRICKET_API_KEYS, cooldown=CRICKET_KEY_COOLDOWN)
+profiler = Profiler(PROFILE_SAMPLE_RATE, PROFILE_SLOW_MS, PROFILE_INTERVAL_MS / 1000)
+response_variants = payloads.VariantCache()
+live_state = LiveState(history=int(os.environ.get('LIVE_HISTORY', 64)))
+commentary_scheduler = CommentaryScheduler()
+schedule_index = ScheduleStore()
+profile_index = ProfileIndex(cache, PROFILE_INDEX_TTL, PROFILE_MISS_TTL)
+
+def match_due_by(row):
+    """When a crawled cricapi match row goes stale: its start, or now while in play."""
+    if row.get('matchEnded'):
+        return None
+    if row.get('matchStarted'):
+        return 0
+    try:
+        return calendar.timegm(time.strptime((row.get('dateTimeGMT') or '')[:19], '%Y-%m-%dT%H:%M:%S'))
+    except ValueError:
+        return None
+
+
+# Raw cricapi rows merged by id across crawls. Finished pages back off to
+# PLAYER_TTL; pages with matches in play stay at SCHEDULE_TTL, and no page
+# waits past a match start, so matchStarted/matchEnded stay fresh
+matches_index = crawler.PagedIndex(min_interval=SCHEDULE_TTL, max_interval=PLAYER_TTL,
+                                   due_by=match_due_by)
+players_index = crawler.PagedIndex()
 
 # =============================================================================
 # HELPER — make API calls with error handling
 # =============================================================================
+_http = None
+_http_lock = threading.Lock()
+
+def http_session():
+    """Pooled requests session; `requests` is imported on first use only."""
+    global _http
+    if _http is None:
+        with _http_lock:
+            if _http is None:
+                import requests
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount('https://', adapter)
+                _http = session
+    return _http
+
+
 def cricket_api(endpoint, params=None):
-    """Call CricketData.org API with automatic key injection."""
+    """Call CricketData.org API with the healthiest key from the pool."""
     url = f"{CRICKET_API_BASE}/{endpoint}"
     if params is None:
         params = {}
-    params['apikey'] = CRICKET_API_KEY
 
-    try:
-        res = http_requests.get(url, params=params, timeout=15)
-        res.raise_for_status()
-        data = res.json()
-        if data.get('status') != 'success':
-            return {"error": data.get('info', 'API returned failure'), "status": "error"}
-        return data
-    except http_requests.exceptions.Timeout:
-        return {"error": "Cricket API timeout", "status": "error"}
-    except http_requests.exceptions.ConnectionError:
-        return {"error": "Cricket API connection error", "status": "error"}
-    except Exception as e:
-        return {"error": f"Cricket API error: {str(e)}", "status": "error"}
+    http = http_session()
+    import requests as http_requests  # already loaded by http_session()
+
+    with upstream_gate.slot():
+        key = cricapi_keys.acquire()
+        if key is None:
+            return {"error": "Cricket API quota exhausted on all keys", "status": "error"}
+        params['apikey'] = key
+        info, result = None, None
+        try:
+            res = http.get(url, params=params, timeout=15)
+            res.raise_for_status()
+            data = res.json()
+            info = data.get('info')
+            if data.get('status') != 'success':
+                result = {"error": data.get('reason') or data.get('info', 'API returned failure'),
+                          "status": "error"}
+            else:
+                result = data
+        except http_requests.exceptions.Timeout:
+            result = {"error": "Cricket API timeout", "status": "error"}
+        except http_requests.exceptions.ConnectionError:
+            result = {"error": "Cricket API connection error", "status": "error"}
+        except Exception as e:
+            # HTTPError messages carry the request URL, key included
+            result = {"error": f"Cricket API error: {str(e).replace(key, mask(key))}", "status": "error"}
+        finally:
+            cricapi_keys.release(key, info, result.get('error') if result else "aborted")
+        return result
 
 
 def news_api(params=None):
@@ -107,22 +284,153 @@ def news_api(params=None):
         params = {}
     params['apikey'] = NEWS_API_KEY
 
-    try:
-        res = http_requests.get(url, params=params, timeout=15)
-        res.raise_for_status()
-        return res.json()
-    except Exception as e:
-        return {"error": f"News API error: {str(e)}", "status": "error"}
+    with upstream_gate.slot():
+        try:
+            res = http_session().get(url, params=params, timeout=15)
+            res.raise_for_status()
+            return res.json()
+        except Exception as e:
+            return {"error": f"News API error: {str(e)}", "status": "error"}
+
+
+# =============================================================================
+# ADMISSION — applied to every route before the handler runs
+# =============================================================================
+if TRUSTED_PROXIES > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES)
+
+
+def client_ip():
+    return request.remote_addr or 'unknown'
+
+
+@app.before_request
+def admit_request():
+    """Reject clients that exceed their per-route token bucket with 429."""
+    if request.endpoint is None:
+        return None
+    rate, burst = RATE_LIMITS.get(request.endpoint, RATE_LIMIT_DEFAULT)
+    allowed, retry_after = rate_limiter.allow((client_ip(), request.endpoint), rate, burst)
+    if allowed:
+        return None
+    response = jsonify({"error": "Too many requests"})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+@app.before_request
+def start_profile():
+    if profiler.enabled and request.url_rule is not None:
+        g.profile = profiler.begin(f"{request.method} {request.url_rule.rule}")
+
+
+@app.teardown_request
+def end_profile(exc):
+    profiler.end(g.pop('profile', None))
+
+
+@app.errorhandler(Overloaded)
+def upstream_overloaded(e):
+    response = jsonify({"error": str(e)})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+def admin_denied():
+    """403 while ADMIN_TOKEN is unset, 401 when it is not presented."""
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Admin routes are disabled (set ADMIN_TOKEN)"}), 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN):
+        return jsonify({"error": "Unauthorized"}), 401
+    return None
+
+
+# =============================================================================
+# RESPONSES — ?fields= projection and negotiated compression
+# =============================================================================
+def read_stamp(source):
+    """Stamp of the cache key `source` (a tuple for a list of keys, None if absent)."""
+    if isinstance(source, list):
+        stamps = tuple(cache.stamp(key) for key in source)
+        return stamps if any(s is not None for s in stamps) else None
+    return cache.stamp(source)
+
+
+def send_json(data, source=None, status=200, stamp=None, project=payloads.project):
+    """Serialize `data` honoring ?fields= and Accept-Encoding.
+
+    With `source` (the cache key `data` was read from, or a list of keys) and
+    `stamp` (read_stamp(source) taken *before* loading `data`) the encoded body
+    is kept per path/query/encoding until a key is rewritten, so repeat
+    requests skip both JSON encoding and compression. Bodies are looked up
+    under the current stamp but only kept when it still equals `stamp`: data
+    read across a rewrite is never stored under the newer stamp. Without
+    `source`, `stamp` is trusted as is (/bootstrap checks its own).
+    """
+    encoding = payloads.negotiate_encoding(request.headers.get('Accept-Encoding'))
+    current = keep = None
+    if status == 200:
+        if source:
+            current = read_stamp(source)
+            keep = current if current == stamp else None
+        else:
+            current = keep = stamp
+    variant = (request.path, request.query_string, encoding)
+
+    hit = response_variants.get(variant, current) if current is not None else None
+    if hit is not None:
+        body, used = hit
+    else:
+        fields = payloads.parse_fields(request.args.get('fields'))
+        body = json.dumps(project(data, fields), separators=(',', ':')).encode('utf-8')
+        used = encoding if len(body) >= payloads.MIN_COMPRESS_BYTES else None
+        body = payloads.compress(body, used)
+        if keep is not None:
+            response_variants.set(variant, keep, body, used)
+
+    response = Response(body, status=status, mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    if used:
+        response.headers['Content-Encoding'] = used
+    return response
 
 
 # =============================================================================
 # ENDPOINT: /live — Live cricket matches
 # =============================================================================
-@app.route('/live')
-def get_live():
-    """Get live scores from API + Scraper (Hybrid Mode)."""
+def store_scraped_live(scraped_data):
+    """Add the demo fixture to a Cricbuzz live list and cache it."""
+    # --- DEMO INJECTION START ---
+    # User requested India vs Pakistan T20 WC Hype Match for text/demo
+    demo_match = {
+        "id": "demo_ind_pak_2026",
+        "name": "India vs Pakistan, T20 World Cup 2026",
+        "status": "Upcoming • Today • 7:00 PM",
+        "score": "High Voltage Clash",
+        "team1": "India",
+        "team2": "Pakistan",
+        "source": "cricbuzz" 
+    }
+    # Check if already exists (unlikely if upcoming)
+    found = False
+    for m in scraped_data:
+        if "India" in m.get("name", "") and "Pakistan" in m.get("name", ""):
+            found = True
+            break
+    if not found:
+        scraped_data.insert(0, demo_match) # Top priority
+    # --- DEMO INJECTION END ---
+
+    cache.set("scraped_live", scraped_data) # Cache the result including demo match
+    return scraped_data
+
+
+def load_live(refresh=False):
+    """Build the merged live list from API + Scraper (Hybrid Mode)."""
     # 1. Fetch Official API Data
-    official_data = cache.get("live_matches", LIVE_TTL)
+    official_data = None if refresh else cache.get("live_matches", LIVE_TTL)
     if not official_data:
         data = cricket_api('currentMatches')
         if 'error' in data:
@@ -136,40 +444,26 @@ def get_live():
             official_data = []
 
     # 2. Fetch Scraper Data (for missing matches like Ind vs Pak)
-    scraped_data = cache.get("scraped_live", LIVE_TTL)    # 2. Fetch Premium Live Data (Scraper)
+    scraped_data = None if refresh else cache.get("scraped_live", LIVE_TTL)
     if not scraped_data: # Only scrape if not in cache
         scraped_data = [] # Default empty
-        try:
-            # Run scraper in separate thread or just call it? 
-            # It's blocking. We rely on cache.
-            # For now, just call it.
-            scraped_data = scraper.get_cricbuzz_matches()
-            
-            # --- DEMO INJECTION START ---
-            # User requested India vs Pakistan T20 WC Hype Match for text/demo
-            demo_match = {
-                "id": "demo_ind_pak_2026",
-                "name": "India vs Pakistan, T20 World Cup 2026",
-                "status": "Upcoming • Today • 7:00 PM",
-                "score": "High Voltage Clash",
-                "team1": "India",
-                "team2": "Pakistan",
-                "source": "cricbuzz" 
-            }
-            # Check if already exists (unlikely if upcoming)
-            found = False
-            for m in scraped_data:
-                if "India" in m.get("name", "") and "Pakistan" in m.get("name", ""):
-                    found = True
-                    break
-            if not found:
-                scraped_data.insert(0, demo_match) # Top priority
-            # --- DEMO INJECTION END ---
-            
-            cache.set("scraped_live", scraped_data) # Cache the result including demo match
-        except Exception as e:
-            print(f"Scraper failed: {e}")
-            scraped_data = []
+        if not SCRAPE_INLINE:
+            # worker.py owns this key; serve whatever it wrote last
+            scraped_data = cache.get("scraped_live", WORKER_STALE_TTL) or []
+        else:
+            try:
+                with upstream_gate.slot():
+                    scraped = scraper.get_cricbuzz_matches()
+                scraped_data = store_scraped_live(scraped)
+            except Exception as e:
+                print(f"Scraper failed: {e}")
+                scraped_data = []
+
+    # Rebuild the merged feed only when one of its sources was rewritten
+    sources = [cache.stamp("live_matches"), cache.stamp("scraped_live")]
+    feed = cache.get("live_feed", LIVE_TTL)
+    if feed and feed["sources"] == sources:
+        return feed["matches"]
 
     final_list = []
     
@@ -221,10 +515,12 @@ def get_live():
             "status": status_text,
             "venue": m.get('venue', ''),
             "date": m.get('date', ''),
+            "teams": m.get('teams', []),
             "score": score,
             "is_premium": False, # Official
             "source": "official",
-            "details_url": match_url
+            "details_url": match_url,
+            "scorecard_url": f"/match-details?id={match_id}"
         })
         
     # 4. Append Scraped Matches (Premium)
@@ -279,152 +575,579 @@ def get_live():
             "score": score_obj,
             "is_premium": True,
             "source": "cricbuzz",
-            "cricbuzz_id": sm["id"]
+            "cricbuzz_id": sm["id"],
+            "scorecard_url": f"/match-details?id={sm['id']}"
         })
 
-    return jsonify(final_list)
+    # Ranked once per rebuild; /live and /live?limit=N serve this order as-is
+    final_list = match_priority.rank_matches(final_list)
+    cache.set("live_feed", {"sources": sources, "matches": final_list})
+    return final_list
 
-@app.route('/commentary/<match_id>')
-def get_commentary(match_id):
-    """Get commentary for a match."""
+
+LEGACY_LIVE_FIELDS = ("id", "name", "status", "score", "teams", "venue")
+
+
+def legacy_live(official):
+    """cricapi current matches as Cricket-API-main's old /live listed them."""
+    return [{k: m.get(k) for k in LEGACY_LIVE_FIELDS} for m in official]
+
+
+@app.route('/live')
+def get_live():
+    """Get live scores from API + Scraper (Hybrid Mode).
+
+    Matches come highest priority first; ?limit=N returns the top N.
+    ?since=<version> returns only added/removed/changed matches since that
+    version, or the full snapshot ("full": true) when it is too old.
+    """
+    if LEGACY_ROUTES:
+        stamp = read_stamp("live_matches")
+        load_live()
+        official = cache.get("live_matches", WORKER_STALE_TTL)
+        if not official:
+            return jsonify({"error": "Failed to fetch from API"}), 500
+        return send_json(legacy_live(official), source="live_matches", stamp=stamp)
+
+    stamp = read_stamp("live_feed")
+    matches = load_live()
+    version = live_state.sync(matches, stamp)
+
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return jsonify({"error": "limit must be a positive integer"}), 400
+
+    since = request.args.get('since')
+    if since is None:
+        response = send_json(matches[:limit], source="live_feed", stamp=stamp)
+    else:
+        try:
+            delta = live_state.delta(int(since))
+        except ValueError:
+            return jsonify({"error": "since must be an integer version"}), 400
+        response = send_json(delta or live_state.snapshot(), source="live_feed", stamp=stamp,
+                             project=payloads.project_live)
+    response.headers['X-Live-Version'] = str(version)
+    return response
+
+
+COMMENTARY_DEMAND_KEY = "comm_demand"
+SCORECARD_DEMAND_KEY = "scorecard_demand"
+COMMENTARY_DEMAND_WINDOW = int(os.environ.get('COMMENTARY_DEMAND_WINDOW', 600))
+_demand_noted = {}
+
+def note_demand(key, item):
+    """Tell the scrape worker someone asked for `item` under `key` (at most every 30s)."""
+    global _demand_noted
+    now = time.time()
+    if now - _demand_noted.get((key, item), 0) < 30:
+        return
+    if len(_demand_noted) > 256:
+        _demand_noted = {k: v for k, v in _demand_noted.items() if now - v < 30}
+    _demand_noted[(key, item)] = now
+    # The worker reads demand from the last two windows; older entries are dropped
+    demand = cache.get(key, WORKER_STALE_TTL) or {}
+    demand = {k: v for k, v in demand.items() if now - v < COMMENTARY_DEMAND_WINDOW * 2}
+    demand[item] = now
+    cache.set(key, demand)
+
+
+def note_commentary_demand(match_id):
+    note_demand(COMMENTARY_DEMAND_KEY, match_id)
+
+
+def load_commentary(match_id, refresh=False):
+    """Return cached commentary lines for a Cricbuzz match id."""
+    if not match_id.isdigit():
+        return []
     # Cache key
     cache_key = f"comm_{match_id}"
-    cached = cache.get(cache_key, 60)
+    if not SCRAPE_INLINE:
+        note_commentary_demand(match_id)
+        return cache.get(cache_key, WORKER_STALE_TTL) or []
+
+    # TTL follows the match: short while live and read, long once finished
+    feed = cache.get("live_feed", WORKER_STALE_TTL)
+    if feed:
+        commentary_scheduler.sync_live(feed["matches"], cache.stamp("live_feed"))
+    interval = commentary_scheduler.record_demand(match_id)
+    ttl = interval if interval is not None else WORKER_STALE_TTL
+
+    cached = None if refresh else cache.get(cache_key, ttl)
     if cached:
-         return jsonify({"status": "success", "data": cached})
-         
-    try:
+        return cached
+
+    with upstream_gate.slot():
         data = scraper.get_commentary(match_id)
-        cache.set(cache_key, data)
-        return jsonify({"status": "success", "data": data})
+    previous = cache.get(cache_key, WORKER_STALE_TTL)
+    commentary_scheduler.record_fetch(match_id, data != previous)
+    cache.set(cache_key, data)
+    return data
+
+
+@app.route('/commentary/<match_id>')
+def get_commentary(match_id):
+    """Get commentary for a match."""
+    try:
+        stamp = read_stamp(f"comm_{match_id}")
+        data = load_commentary(match_id)
+        return send_json({"status": "success", "data": data}, source=f"comm_{match_id}", stamp=stamp)
+    except Overloaded:
+        raise
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)})
 
 
+# =============================================================================
+# ENDPOINT: /match-details — Scorecard for a cricapi id or a Cricbuzz id
+# =============================================================================
+# Innings are frozen once a later innings has started or the match is over;
+# refreshes only rebuild the innings still in progress.
+scorecard_stats = {"refreshes": 0, "innings_built": 0, "innings_reused": 0}
+
+
+def official_innings(match_id, skip):
+    """(innings after `skip`, match meta) from cricapi match_scorecard."""
+    data = cricket_api('match_scorecard', {'id': match_id})
+    if 'error' in data or not data.get('data'):
+        return [], None
+    info = data['data']
+    scores = info.get('score') or []
+    innings = []
+    for number, card in enumerate(info.get('scorecard') or [], start=1):
+        if number <= skip:
+            continue
+        title = card.get('inning', f"Innings {number}")
+        score = next((x for x in scores if x.get('inning') == title), None)
+        innings.append({
+            "number": number,
+            "title": title,
+            "score": f"{score.get('r', '-')}-{score.get('w', '-')} ({score.get('o', '-')} Ov)" if score else "",
+            "batting": [{
+                "name": (b.get('batsman') or {}).get('name', ''),
+                "dismissal": b.get('dismissal-text', ''),
+                "r": str(b.get('r', '')), "b": str(b.get('b', '')),
+                "4s": str(b.get('4s', '')), "6s": str(b.get('6s', '')), "sr": str(b.get('sr', '')),
+            } for b in card.get('batting') or []],
+            "bowling": [{
+                "name": (b.get('bowler') or {}).get('name', ''),
+                "o": str(b.get('o', '')), "m": str(b.get('m', '')), "r": str(b.get('r', '')),
+                "w": str(b.get('w', '')), "nb": str(b.get('nb', '')), "wd": str(b.get('wd', '')),
+                "eco": str(b.get('eco', '')),
+            } for b in card.get('bowling') or []],
+            "extras": str((card.get('extras') or {}).get('r', '')),
+        })
+    meta = {"name": info.get('name', ''), "status": info.get('status', ''),
+            "venue": info.get('venue', ''), "ended": bool(info.get('matchEnded'))}
+    return innings, meta
+
+
+def cricbuzz_feed_match(match_id):
+    """The /live feed entry for a Cricbuzz id ({} when the feed does not list it)."""
+    feed = cache.get("live_feed", WORKER_STALE_TTL) or {}
+    return next((m for m in feed.get("matches", [])
+                 if str(m.get('cricbuzz_id', '')) == match_id
+                 or (m.get('source') == 'cricbuzz' and str(m.get('id')) == match_id)), {})
+
+
+def cricbuzz_meta(match_id, scorecard_status=""):
+    """Match meta for a Cricbuzz id from the merged /live feed.
+
+    Ids the feed does not list (finished and dropped, or never live) use
+    `scorecard_status`, the result line scraped from the scorecard itself.
+    """
+    match = cricbuzz_feed_match(match_id)
+    status = match.get('status', '') if match else scorecard_status
+    return {"name": match.get('name', ''), "status": status, "venue": match.get('venue', ''),
+            "ended": bool(status) and classify_status(status) == "completed"}
+
+
+def cricbuzz_innings(match_id, skip):
+    """(innings after `skip`, match meta) from the Cricbuzz scorecard page."""
+    with upstream_gate.slot():
+        innings, status = scraper.get_scorecard_and_status(match_id, skip,
+                                                           status=not cricbuzz_feed_match(match_id))
+    return innings, cricbuzz_meta(match_id, status)
+
+
+def scorecard_due(match_id):
+    """(cached scorecard or None, whether it needs rebuilding)."""
+    cache_key = f"match_{match_id}"
+    cached = cache.get(cache_key, PLAYER_TTL)
+    if cached is None:
+        return None, True
+    return cached, not cached["final"] and time.time() - (cache.stamp(cache_key) or 0) >= MATCH_TTL
+
+
+def frozen_innings(cached):
+    return [i for i in (cached or {}).get("innings", []) if i["complete"]]
+
+
+def load_match_details(match_id, refresh=False):
+    """Return (payload, http_status) for a scorecard, rebuilding only live innings."""
+    cached, due = scorecard_due(match_id)
+    if cached is not None and not due and not refresh:
+        return cached, 200
+
+    if match_id.isdigit() and not SCRAPE_INLINE:
+        # worker.py scrapes scorecards readers asked for
+        note_demand(SCORECARD_DEMAND_KEY, match_id)
+        if cached is not None:
+            return cached, 200
+        return {"error": "Scorecard not available yet, retry shortly"}, 404
+
+    frozen = frozen_innings(cached)
+    if match_id.isdigit():
+        fresh, meta = cricbuzz_innings(match_id, len(frozen))
+    else:
+        fresh, meta = official_innings(match_id, len(frozen))
+    return store_match_details(match_id, cached, fresh, meta)
+
+
+def store_match_details(match_id, cached, fresh, meta):
+    """Merge freshly built innings over the frozen ones in `cached` and cache it."""
+    frozen = frozen_innings(cached)
+    if meta is None or not (frozen or fresh):
+        if cached is not None:
+            return cached, 200
+        return {"error": "Scorecard not available"}, 404
+
+    # Copies: the frozen innings belong to the cached card (other readers hold
+    # it with the in-memory cache) and fresh ones may be the scraper's memo
+    innings = [dict(i) for i in frozen + [i for i in fresh if i["number"] > len(frozen)]]
+    for pos, inn in enumerate(innings):
+        inn["complete"] = inn.get("complete") or pos < len(innings) - 1 or meta["ended"]
+    scorecard_stats["refreshes"] += 1
+    scorecard_stats["innings_reused"] += len(frozen)
+    scorecard_stats["innings_built"] += len(innings) - len(frozen)
+
+    result = {
+        "id": match_id,
+        "source": "cricbuzz" if match_id.isdigit() else "official",
+        "name": meta["name"],
+        "status": meta["status"],
+        "venue": meta["venue"],
+        "innings": innings,
+        "final": meta["ended"],
+    }
+    cache.set(f"match_{match_id}", result)
+    return result, 200
+
+
+@app.route('/match-details')
+def get_match_details():
+    """Scorecard for ?id= (a cricapi match id, or a Cricbuzz id from /live)."""
+    match_id = request.args.get('id', '').strip()
+    if not match_id:
+        return jsonify({"error": "id is required"}), 400
+    stamp = read_stamp(f"match_{match_id}")
+    payload, status = load_match_details(match_id)
+    return send_json(payload, source=f"match_{match_id}", status=status, stamp=stamp)
 
 
 # =============================================================================
 # ENDPOINT: /schedule — Upcoming match schedule
 # =============================================================================
+def fetch_all_matches():
+    """Crawl every cricapi `matches` window into `matches_index`."""
+    result = crawler.crawl(
+        lambda offset: cricket_api('matches', {'offset': offset}),
+        matches_index,
+        max_workers=CRAWL_MAX_WORKERS,
+        max_pages=SCHEDULE_MAX_PAGES,
+        quota_reserve=CRICAPI_QUOTA_RESERVE,
+    )
+    if 'error' in result and not len(matches_index):
+        return result
+    total = result.get('total_rows')
+    complete = 'error' not in result and (total is None or len(matches_index) >= total)
+    # stale: the crawl failed, so some rows are left over from earlier crawls
+    return {"data": matches_index.values(), "status": "success", "complete": complete,
+            "stale": 'error' in result}
+
+
+def store_upcoming_series(records):
+    """Cache Cricbuzz's upcoming fixtures (the /schedule supplement)."""
+    cache.set("schedule_cricbuzz", records)
+    return records
+
+
+def load_upcoming_series(refresh=False):
+    """Return scraped Cricbuzz upcoming fixtures, scraping when the cache is stale."""
+    cache_key = "schedule_cricbuzz"
+    if not SCRAPE_INLINE:
+        return cache.get(cache_key, WORKER_STALE_TTL) or []
+
+    cached = None if refresh else cache.get(cache_key, SCHEDULE_TTL)
+    if cached is not None:
+        return cached
+    with upstream_gate.slot():
+        records = scraper.get_upcoming_schedule()
+    return store_upcoming_series(records)
+
+
+def schedule_supplement(official):
+    """Cricbuzz fixtures cricapi did not list, matched on teams and day."""
+    seen = {(frozenset(t.lower() for t in r.get('teams') or []), (r.get('date') or '')[:10])
+            for r in official}
+    return [r for r in load_upcoming_series()
+            if (frozenset(t.lower() for t in r['teams']), r['date'][:10]) not in seen]
+
+
+def load_schedule(refresh=False):
+    """Return the transformed schedule, refreshing it (and its index) when stale.
+
+    When cricapi's listing is incomplete, Cricbuzz's upcoming series are
+    merged into the index (and the returned list) as a supplementary source.
+    When the crawl fails, "schedule_stale" is set until one succeeds.
+    """
+    cached = None if refresh else cache.get("schedule", SCHEDULE_TTL)
+    if cached is None:
+        data = fetch_all_matches()
+        if 'error' in data:
+            # The index keeps serving the last good crawl
+            cache.set("schedule_stale", True)
+            return load_schedule_supplement([], complete=False)
+
+        cached = []
+        for m in data.get('data', []):
+            cached.append({
+                "id": m.get('id', ''),
+                "name": m.get('name', 'TBA'),
+                "venue": m.get('venue', 'TBA'),
+                "date": m.get('dateTimeGMT', m.get('date', '')),
+                "matchType": m.get('matchType', ''),
+                "status": m.get('status', ''),
+                "teams": m.get('teams', []),
+                "series_id": m.get('series_id', ''),
+                "started": m.get('matchStarted', False),
+                "local_date": m.get('date', ''),
+            })
+        cache.set("schedule", cached)
+        cache.set("schedule_complete", data['complete'])
+        cache.set("schedule_stale", data['stale'])
+
+    stamp = cache.stamp("schedule")
+    if schedule_index.stamp != stamp:
+        schedule_index.load(cached, stamp)
+    return load_schedule_supplement(cached, cache.get("schedule_complete", SCHEDULE_TTL))
+
+
+def load_schedule_supplement(official, complete):
+    """Merge Cricbuzz fixtures into the index when cricapi's list falls short."""
+    upcoming = sum(1 for r in official if r.get('started') is False)
+    if complete and upcoming >= SCHEDULE_MIN_UPCOMING:
+        return official
+    extra = schedule_supplement(official)
+    stamp = cache.stamp("schedule_cricbuzz")
+    if extra and schedule_index.sources.get("cricbuzz") != stamp:
+        # Upserts by id: only the scraped rows are touched, cricapi rows stay
+        schedule_index.merge(extra, source="cricbuzz", stamp=stamp)
+    if not official and not extra:
+        return None
+    return official + extra
+
+
+def legacy_schedule(records, upcoming=True):
+    """cricapi matches as Cricket-API-main's old /schedule listed them (not started only)."""
+    return [{"id": r.get("id"), "name": r.get("name"),
+             "date": r.get("local_date") or (r.get("date") or "")[:10],
+             "venue": r.get("venue"), "teams": r.get("teams")}
+            for r in records if not (upcoming and r.get("started"))]
+
+
 @app.route('/schedule')
 def get_schedule():
-    """Get upcoming cricket match schedule."""
-    cached = cache.get("schedule", SCHEDULE_TTL)
-    if cached is not None:
-        return jsonify(cached)
+    """Get upcoming cricket match schedule.
 
-    data = cricket_api('matches', {'offset': 0})
-    if 'error' in data:
-        return jsonify([])
+    Optional filters: ?team=&format=&series=&from=&to= (dates as YYYY-MM-DD),
+    ?upcoming=1 for matches not yet started, paged with ?limit=&cursor=.
+    The next cursor is sent in X-Next-Cursor; X-Schedule-Stale: 1 marks a
+    listing left over from an earlier crawl because the last one failed.
+    """
+    if LEGACY_ROUTES:
+        stamp = read_stamp("schedule")
+        if load_schedule() is None:
+            return jsonify({"error": "Failed to fetch from API"}), 500
+        upcoming = request.args.get('upcoming', '1').lower() in ('1', 'true', 'yes')
+        response = send_json(legacy_schedule(cache.get("schedule", WORKER_STALE_TTL) or [], upcoming),
+                             source="schedule", stamp=stamp)
+        return mark_stale_schedule(response)
 
-    matches = data.get('data', [])
-    transformed = []
+    sources = ["schedule", "schedule_cricbuzz"]
+    stamp = read_stamp(sources)
+    if load_schedule() is None and not len(schedule_index):
+        return send_json([])
 
-    for m in matches:
-        match_name = m.get('name', 'TBA')
-        venue = m.get('venue', 'TBA')
-        date = m.get('dateTimeGMT', m.get('date', ''))
-        match_type = m.get('matchType', '')
-        status = m.get('status', '')
-        teams = m.get('teams', [])
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return jsonify({"error": "limit must be a positive integer"}), 400
 
-        transformed.append({
-            "name": match_name,
-            "venue": venue,
-            "date": date,
-            "matchType": match_type,
-            "status": status,
-            "teams": teams
-        })
+    try:
+        results, next_cursor = schedule_index.query(
+            team=request.args.get('team'),
+            fmt=request.args.get('format'),
+            series=request.args.get('series'),
+            date_from=request.args.get('from'),
+            date_to=request.args.get('to'),
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            upcoming=request.args.get('upcoming', '').lower() in ('1', 'true', 'yes'),
+        )
+    except ValueError:
+        return jsonify({"error": "cursor must be a value from X-Next-Cursor"}), 400
+    response = send_json(results, source=sources, stamp=stamp)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return mark_stale_schedule(response)
 
-    cache.set("schedule", transformed)
-    return jsonify(transformed)
+
+def mark_stale_schedule(response):
+    """Flag a schedule served from an earlier crawl after the last one failed."""
+    if cache.get("schedule_stale", WORKER_STALE_TTL):
+        response.headers['X-Schedule-Stale'] = '1'
+    return response
 
 
 # =============================================================================
 # ENDPOINT: /rankings — ICC rankings
 # =============================================================================
-@app.route('/rankings')
-def get_rankings():
-    """Get ICC rankings."""
-    # 1. Define constants
-    categories = {'batting': 'Batsmen', 'bowling': 'Bowlers', 'allrounder': 'All-Rounders'}
-    formats = ['test', 'odi', 't20']
+RANKINGS_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rankings.json")
+_rankings_snapshot = None
 
-    # 2. Check Cache
-    cache_key = "rankings_all" 
-    
-    cached = cache.get(cache_key, RANKINGS_TTL)
-    if cached is not None:
-         return jsonify(cached)
-         
+def rankings_snapshot():
+    """rankings.json indexed by (type, format); read from disk once per process."""
+    global _rankings_snapshot
+    if _rankings_snapshot is None:
+        snapshot = {}
+        try:
+            with open(RANKINGS_SNAPSHOT_PATH, "r") as f:
+                # snapshot is list of {type, format, rank}
+                for entry in json.load(f):
+                    snapshot[(entry['type'], entry['format'])] = entry['rank']
+        except Exception as e:
+            print(f"Snapshot load failed: {e}")
+        _rankings_snapshot = snapshot
+    return _rankings_snapshot
+
+RANKING_CATEGORIES = {'batting': 'Batsmen', 'bowling': 'Bowlers',
+                      'allrounder': 'All-Rounders', 'teams': 'Teams'}
+RANKING_FORMATS = ['test', 'odi', 't20']
+
+
+def ranking_jobs():
+    """Scraper categories that make up /rankings (one page fetch each)."""
+    # Map api_cat 'allrounder' to scraper 'all-rounder'
+    return ['all-rounder' if api_cat == 'allrounder' else api_cat
+            for api_cat in RANKING_CATEGORIES]
+
+
+def store_rankings(scraped):
+    """Build ranking blocks from {scrape_cat: {fmt: rows}} and cache them.
+
+    Empty scrapes fall back to the rankings.json snapshot.
+    """
     all_rankings = []
-    
-    # Scrape each category
-    # categories keys: batting, bowling, allrounder
-    # formats: test, odi, t20
-    
-    # Optimization: 'batting' page has all formats. So we only fetch URL 4 times total.
-    # get_icc_rankings handles the fetching.
-    
-    for api_cat, display_cat in categories.items():
-        # api_cat: batting, bowling, etc.
-        # But get_icc_rankings takes (category, format).
-        # And slicing logic implies we can reuse the fetch?
-        # get_icc_rankings does fetching internally. 
-        # So calling it 3 times for batting/test, batting/odi, batting/t20 results in 3 fetches effectively?
-        # No, requests are cached by OS? No.
-        # We should optimize scraper to cache the page? 
-        # For MVP, just call it. 12 requests is okay for 24h cache.
-        
-        for fmt in formats:
-            # Map api_cat 'allrounder' to scraper 'all-rounder'
-            scrape_cat = 'all-rounder' if api_cat == 'allrounder' else api_cat
-            
-            data = scraper.get_icc_rankings(scrape_cat, fmt)
-            
+    for api_cat, display_cat in RANKING_CATEGORIES.items():
+        scrape_cat = 'all-rounder' if api_cat == 'allrounder' else api_cat
+        page = scraped.get(scrape_cat) or {}
+        for fmt in RANKING_FORMATS:
+            data = page.get(fmt)
+
             # Fallback to Static JSON if Scraper Fails
             if not data:
                 print(f"Scraper failed for {display_cat} {fmt}, checking localized snapshot...")
-                try:
-                    import json
-                    with open("rankings.json", "r") as f:
-                        snapshot = json.load(f)
-                        # snapshot is list of {type, format, rank}
-                        # Find matching entry
-                        for entry in snapshot:
-                            if entry['type'] == display_cat and entry['format'] == fmt.upper():
-                                data = entry['rank']
-                                print(f"Loaded snapshot for {display_cat} {fmt}")
-                                break
-                except Exception as e:
-                    print(f"Snapshot load failed: {e}")
-            
+                data = rankings_snapshot().get((display_cat, fmt.upper()))
+                if data:
+                    print(f"Loaded snapshot for {display_cat} {fmt}")
+
             # If still no data, use old mock or empty?
             if not data:
                  print(f"No data available for {display_cat} {fmt}")
-                 
+
             all_rankings.append({
                 "type": display_cat,
                 "format": fmt.upper(),
                 "rank": data or []
             })
-            time.sleep(0.5) # Be nice to Cricbuzz
 
-            
-    cache.set("rankings", all_rankings)
-    return jsonify(all_rankings)
+    cache.set("rankings_all", all_rankings)
+    # Ranking rows link each player's profile; remember the ids for /profiles
+    profile_index.learn_rankings(all_rankings)
+    return all_rankings
+
+
+def load_rankings(refresh=False):
+    """Return all ICC ranking blocks, scraping Cricbuzz when the cache is stale."""
+    cache_key = "rankings_all"
+    if not SCRAPE_INLINE:
+        cached = cache.get(cache_key, WORKER_STALE_TTL)
+        if cached is not None:
+            return cached
+        # Worker has not delivered yet: serve the snapshot without caching it
+        return [{"type": display_cat, "format": fmt.upper(),
+                 "rank": rankings_snapshot().get((display_cat, fmt.upper()), [])}
+                for display_cat in RANKING_CATEGORIES.values() for fmt in RANKING_FORMATS]
+
+    cached = None if refresh else cache.get(cache_key, RANKINGS_TTL)
+    if cached is not None:
+         return cached
+
+    scraped = {}
+    for scrape_cat in ranking_jobs():
+        # Each category page carries all three formats
+        with upstream_gate.slot():
+            scraped[scrape_cat] = scraper.get_icc_rankings_page(scrape_cat)
+        time.sleep(0.5) # Be nice to Cricbuzz
+    return store_rankings(scraped)
+
+
+RANKING_CATEGORY_ALIASES = {
+    'batting': 'Batsmen', 'batsmen': 'Batsmen',
+    'bowling': 'Bowlers', 'bowlers': 'Bowlers',
+    'allrounder': 'All-Rounders', 'all-rounder': 'All-Rounders', 'all-rounders': 'All-Rounders',
+    'teams': 'Teams', 'team': 'Teams',
+}
+
+
+def filter_rankings(blocks, category='', fmt=''):
+    """Narrow ranking blocks to a category (or alias) and/or format."""
+    category, fmt = (category or '').lower(), (fmt or '').upper()
+    if category:
+        wanted = RANKING_CATEGORY_ALIASES.get(category, category)
+        blocks = [b for b in blocks if b['type'].lower() == wanted.lower()]
+    if fmt:
+        blocks = [b for b in blocks if b['format'] == fmt]
+    return blocks
+
+
+@app.route('/rankings')
+def get_rankings():
+    """Get ICC rankings, optionally narrowed with ?category= and ?format=."""
+    stamp = read_stamp("rankings_all")
+    blocks = filter_rankings(load_rankings(), request.args.get('category'),
+                             request.args.get('format'))
+    return send_json(blocks, source="rankings_all", stamp=stamp)
 
 
 # =============================================================================
 # ENDPOINT: /news — Latest cricket news
 # =============================================================================
-@app.route('/news')
-def get_news():
-    """Get latest cricket news from NewsData.io."""
-    cached = cache.get("news", NEWS_TTL)
+def load_news(refresh=False):
+    """Return transformed NewsData.io articles (empty list on upstream failure)."""
+    cached = None if refresh else cache.get("news", NEWS_TTL)
     if cached is not None:
-        return jsonify(cached)
+        return cached
 
     data = news_api({
         'q': 'cricket',
@@ -434,7 +1157,7 @@ def get_news():
     })
 
     if 'error' in data or 'results' not in data:
-        return jsonify([])
+        return []
 
     articles = data.get('results', [])
     transformed = []
@@ -451,27 +1174,56 @@ def get_news():
         })
 
     cache.set("news", transformed)
-    return jsonify(transformed)
+    return transformed
+
+
+@app.route('/news')
+def get_news():
+    """Get latest cricket news from NewsData.io."""
+    stamp = read_stamp("news")
+    return send_json(load_news(), source="news", stamp=stamp)
 
 
 # =============================================================================
 # ENDPOINT: /players/<name> — Player stats
 # =============================================================================
-@app.route('/players/<path:player_name>')
-def get_player(player_name):
-    """Get player statistics from CricketData.org."""
+def find_player(player_name):
+    """Resolve a player row, preferring ids already merged from earlier searches."""
+    wanted = player_name.strip().lower()
+    for p in players_index.values():
+        if p.get('name', '').lower() == wanted:
+            return p
+
+    results = crawler.PagedIndex()
+    outcome = crawler.crawl(
+        lambda offset: cricket_api('players', {'offset': offset, 'search': player_name}),
+        results,
+        max_workers=CRAWL_MAX_WORKERS,
+        max_pages=PLAYER_SEARCH_MAX_PAGES,
+        quota_reserve=CRICAPI_QUOTA_RESERVE,
+    )
+    if 'error' in outcome:
+        return outcome
+
+    players = results.values()
+    players_index.upsert(players)
+    for p in players:
+        if p.get('name', '').lower() == wanted:
+            return p
+    return players[0] if players else None
+
+
+def load_player(player_name, refresh=False):
+    """Return (payload, http_status) for a player's stats from CricketData.org."""
     cache_key = f"player_{player_name.lower().replace(' ', '_')}"
-    cached = cache.get(cache_key, PLAYER_TTL)
+    cached = None if refresh else cache.get(cache_key, PLAYER_TTL)
     if cached is not None:
-        return jsonify(cached)
+        return cached, 200
 
-    search_data = cricket_api('players', {'offset': 0, 'search': player_name})
-    if 'error' in search_data: return jsonify({"error": search_data['error']}), 500
-    
-    players = search_data.get('data', [])
-    if not players: return jsonify({"error": "Player not found"}), 404
+    player = find_player(player_name)
+    if player is None: return {"error": "Player not found"}, 404
+    if 'error' in player: return {"error": player['error']}, 500
 
-    player = players[0]
     detail_data = cricket_api('players_info', {'id': player.get('id')})
     
     info = detail_data.get('data', {}) if 'data' in detail_data else {}
@@ -502,7 +1254,208 @@ def get_player(player_name):
             }
 
     cache.set(cache_key, result)
-    return jsonify(result)
+    return result, 200
+
+
+def legacy_player(profile):
+    """A /profiles payload in Cricket-API-main's old /players shape (avg/sr keys)."""
+    if 'error' in profile:
+        return profile
+    legacy = dict(profile)
+    legacy["batting_stats"] = {fmt: dict(stats, avg=stats.get("average", ""),
+                                         sr=stats.get("strike_rate", ""))
+                               for fmt, stats in profile.get("batting_stats", {}).items()}
+    return legacy
+
+
+@app.route('/players/<path:player_name>')
+def get_player(player_name):
+    """Get player statistics from CricketData.org (Cricbuzz profile under LEGACY_ROUTES)."""
+    if LEGACY_ROUTES:
+        payload, status = load_profile(player_name)
+        return send_json(legacy_player(payload), status=status)
+    cache_key = f"player_{player_name.lower().replace(' ', '_')}"
+    stamp = read_stamp(cache_key)
+    payload, status = load_player(player_name)
+    return send_json(payload, source=cache_key, status=status, stamp=stamp)
+
+
+# =============================================================================
+# ENDPOINT: /profiles/<name> — Cricbuzz player profile (ICC ranks, career stats)
+# =============================================================================
+# With SCRAPE_INLINE=false the web process only reads: unknown names and
+# ageing profiles are noted under PROFILE_DEMAND_KEY for worker.py.
+PROFILE_DEMAND_KEY = "profile_demand"
+_profiles_refreshing = set()
+_profiles_lock = threading.Lock()
+
+
+def resolve_profile_id(player_name):
+    """Cricbuzz profile id from the index, falling back to one web search."""
+    profile_id = profile_index.lookup(player_name)
+    if profile_id or not SCRAPE_INLINE or profile_index.missed(player_name):
+        return profile_id
+    if not len(profile_index):
+        # Empty after a restart without CACHE_PATH: rankings links refill it
+        load_rankings()
+        profile_id = profile_index.lookup(player_name)
+        if profile_id:
+            return profile_id
+    with upstream_gate.slot():
+        profile_id = scraper.profile_id_from_url(scraper.find_profile_url(player_name))
+    learn_profile_id(player_name, profile_id)
+    return profile_id
+
+
+def learn_profile_id(player_name, profile_id):
+    if profile_id:
+        profile_index.learn([(player_name, profile_id)])
+    else:
+        profile_index.miss(player_name)
+
+
+def store_profile(profile_id, url, profile):
+    """Cache a scraped profile by id and index its name ({} stays uncached)."""
+    if profile:
+        profile["profile_id"] = profile_id
+        profile["profile_url"] = url
+        cache.set(f"profile_{profile_id}", profile)
+        profile_index.learn([(profile["name"], profile_id)])
+    return profile
+
+
+def fetch_profile(profile_id, player_name):
+    """Scrape one profile page and cache it by id ({} on failure)."""
+    url = scraper.profile_url(profile_id, player_name)
+    with upstream_gate.slot():
+        profile = scraper.get_player_profile(url)
+    return store_profile(profile_id, url, profile)
+
+
+def profile_due(profile_id):
+    """True when a cached profile is older than PLAYER_TTL (or missing)."""
+    return time.time() - (cache.stamp(f"profile_{profile_id}") or 0) > PLAYER_TTL
+
+
+def refresh_profile_later(profile_id, player_name):
+    """Re-scrape an ageing profile on a background thread (once at a time)."""
+    if not SCRAPE_INLINE:
+        note_demand(PROFILE_DEMAND_KEY, player_name)
+        return
+    with _profiles_lock:
+        if profile_id in _profiles_refreshing:
+            return
+        _profiles_refreshing.add(profile_id)
+
+    def run():
+        try:
+            fetch_profile(profile_id, player_name)
+        except Exception as e:
+            print(f"Profile refresh failed for {profile_id}: {e}")
+        finally:
+            with _profiles_lock:
+                _profiles_refreshing.discard(profile_id)
+    threading.Thread(target=run, daemon=True).start()
+
+
+def load_profile(player_name, refresh=False):
+    """Return (payload, http_status) for a player's scraped Cricbuzz profile."""
+    profile_id = resolve_profile_id(player_name)
+    if not profile_id and (SCRAPE_INLINE or profile_index.missed(player_name)):
+        return {"error": "No player profile found"}, 404
+
+    cached = None
+    if profile_id:
+        cached = None if refresh else cache.get(f"profile_{profile_id}", PROFILE_TTL)
+    if cached is not None:
+        # Serve what we have; refresh it behind the response once it ages
+        if profile_due(profile_id):
+            refresh_profile_later(profile_id, player_name)
+        return cached, 200
+
+    if not SCRAPE_INLINE:
+        note_demand(PROFILE_DEMAND_KEY, player_name)
+        return {"error": "Player profile not available yet, retry shortly"}, 404
+
+    profile = fetch_profile(profile_id, player_name)
+    if not profile:
+        return {"error": "Failed to read player profile"}, 502
+    return profile, 200
+
+
+@app.route('/profiles/<path:player_name>')
+def get_profile(player_name):
+    """Get a player's Cricbuzz profile (richer than the CricketData.org stats)."""
+    # An id first learned by this load is cached from the next request on
+    profile_id = profile_index.lookup(player_name)
+    source = f"profile_{profile_id}" if profile_id else None
+    stamp = read_stamp(source) if source else None
+    payload, status = load_profile(player_name)
+    return send_json(payload, source=source, status=status, stamp=stamp)
+
+
+# =============================================================================
+# ENDPOINT: /bootstrap — live, schedule, rankings and news in one round trip
+# =============================================================================
+BOOTSTRAP_SOURCES = ["live_feed", "schedule", "schedule_cricbuzz", "rankings_all", "news"]
+BOOTSTRAP_SCHEDULE_LIMIT = int(os.environ.get('BOOTSTRAP_SCHEDULE_LIMIT', 20))
+_bootstrap = {"stamps": None, "document": None, "etag": None}
+_bootstrap_lock = threading.Lock()
+
+
+def bootstrap_document():
+    """Return (document, etag, stamps), reassembled only when a source key changed.
+
+    The stamps are read before the data, and the document is only kept when
+    no source was rewritten meanwhile, so it is never pinned to newer stamps.
+    The ETag hashes the document itself: a source rewritten with the same
+    content (worker re-scrapes, TTL refreshes) keeps it, so clients get 304.
+    """
+    stamps = tuple(cache.stamp(key) for key in BOOTSTRAP_SOURCES)
+    matches = load_live()
+    load_schedule()
+    rankings = load_rankings()
+    news = load_news()
+    current = tuple(cache.stamp(key) for key in BOOTSTRAP_SOURCES)
+
+    with _bootstrap_lock:
+        if _bootstrap["stamps"] == current:
+            return _bootstrap["document"], _bootstrap["etag"], current
+
+    upcoming, _ = schedule_index.query(upcoming=True, limit=BOOTSTRAP_SCHEDULE_LIMIT)
+    document = {
+        "live": matches,
+        "live_version": live_state.sync(matches, stamps[0]),
+        "schedule": upcoming,
+        "rankings": rankings,
+        "news": news,
+    }
+    # Weak: the same document is served gzip, br or identity
+    canonical = json.dumps(document, sort_keys=True, separators=(',', ':'), default=str)
+    etag = 'W/"%s"' % hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:20]
+    if current != stamps:
+        return document, etag, None     # served once, not kept
+    with _bootstrap_lock:
+        _bootstrap.update(stamps=stamps, document=document, etag=etag)
+    return document, etag, stamps
+
+
+@app.route('/bootstrap')
+def get_bootstrap():
+    """Home screen data (/live, upcoming /schedule, /rankings, /news) in one document.
+
+    Send the ETag back as If-None-Match to get a 304 while nothing changed.
+    """
+    document, etag, stamps = bootstrap_document()
+    wanted = [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]
+    if etag in wanted or '*' in wanted:
+        response = Response(status=304)
+    else:
+        response = send_json(document, stamp=stamps)
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Live-Version'] = str(document["live_version"])
+    return response
 
 
 # =============================================================================
@@ -514,13 +1467,127 @@ def index():
 
 @app.route('/health')
 def health():
-    return jsonify({"status": "ok", "cache": cache.stats()})
+    return jsonify({"status": "ok", "cache": cache.stats(),
+                    "rate_limiter": rate_limiter.stats(),
+                    "upstream": upstream_gate.stats(),
+                    "cricapi_keys": cricapi_keys.stats(),
+                    "response_variants": response_variants.stats(),
+                    "commentary_scheduler": commentary_scheduler.stats(),
+                    "scorecards": dict(scorecard_stats),
+                    "profiles": {"indexed": len(profile_index),
+                                 "refreshing": len(_profiles_refreshing)},
+                    "scraper": scraper.fetch_stats(),
+                    "extraction": extract_rules.telemetry(),
+                    "profiler": profiler.stats(),
+                    "primer": dict(primer_state, interval=PRIME_INTERVAL)})
 
 @app.route('/cache/clear', methods=['POST'])
 def clear_cache():
+    denied = admin_denied()
+    if denied:
+        return denied
+    # The profile index is rebuilt only slowly (rankings links, web searches)
+    index = profile_index.entries()
     cache.clear()
+    profile_index.restore(index)
+    response_variants.clear()
     return jsonify({"status": "cleared"})
 
+@app.route('/cache/prime', methods=['POST'])
+def prime_cache_now():
+    """Warm hot keys in the background; body may set {"players": N, "matches": [ids]}."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    body = request.get_json(silent=True) or {}
+    try:
+        players = int(body.get('players', PRIME_TOP_PLAYERS))
+    except (TypeError, ValueError):
+        return jsonify({"error": "players must be an integer"}), 400
+    match_ids = [str(m) for m in body.get('matches') or PRIME_MATCH_IDS]
+    if not _prime_lock.acquire(blocking=False):
+        return jsonify({"status": "already priming"}), 202
+
+    def run():
+        try:
+            run_prime(players, match_ids)
+        finally:
+            _prime_lock.release()
+    threading.Thread(target=run, name="cache-primer-now", daemon=True).start()
+    return jsonify({"status": "priming", "progress": "/health (primer)"}), 202
+
+
+@app.route('/debug/profile')
+def profile_report():
+    """Folded stacks for flame graphs: ?kind=sampled|slow, ?reset=1 clears after reading."""
+    denied = admin_denied()
+    if denied:
+        return denied
+    kind = request.args.get('kind', 'sampled')
+    if kind not in ('sampled', 'slow'):
+        return jsonify({"error": "kind must be sampled or slow"}), 400
+    body = profiler.folded(kind)
+    if request.args.get('reset') in ('1', 'true'):
+        profiler.reset()
+    return Response(body, mimetype='text/plain')
+
+@app.route('/debug/slow')
+def slow_requests():
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify({"slow_ms": profiler.slow_ms, "requests": list(profiler.slow_requests)})
+
+
+# One prime at a time per process; the scheduled job additionally claims
+# PRIME_LEASE_KEY so only one process sharing CACHE_PATH primes per interval.
+PRIME_LEASE_KEY = "prime_lease"
+_prime_lock = threading.Lock()
+_primer_start_lock = threading.Lock()
+_primer_started = False
+primer_state = {"running": False, "last": None}
+
+
+def run_prime(players=PRIME_TOP_PLAYERS, match_ids=PRIME_MATCH_IDS):
+    import prime_cache
+    started = time.time()
+    primer_state["running"] = True
+    try:
+        report = prime_cache.prime(players, match_ids, server=sys.modules[__name__])
+        failed = [k for k, v in report.items() if not v["ok"]]
+        primer_state["last"] = {"at": started, "seconds": round(time.time() - started, 1),
+                                "keys": len(report), "failed": failed}
+        print(f"Primed {len(report)} keys in {time.time() - started:.1f}s"
+              + (f" (failed: {', '.join(failed)})" if failed else ""))
+    except Exception as e:
+        primer_state["last"] = {"at": started, "error": str(e)}
+        print(f"Cache priming failed: {e}")
+    finally:
+        primer_state["running"] = False
+
+
+def _prime_forever():
+    while True:
+        started = time.time()
+        if cache.claim(PRIME_LEASE_KEY, PRIME_INTERVAL * 0.9) and _prime_lock.acquire(blocking=False):
+            try:
+                run_prime()
+            finally:
+                _prime_lock.release()
+        time.sleep(max(PRIME_INTERVAL - (time.time() - started), 1))
+
+
+@app.before_request
+def start_primer():
+    """Start scheduled priming in serving processes only (not on import)."""
+    global _primer_started
+    if PRIME_INTERVAL > 0 and not _primer_started:
+        with _primer_start_lock:
+            if _primer_started:
+                return
+            _primer_started = True
+        threading.Thread(target=_prime_forever, name="cache-primer", daemon=True).start()
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('DEBUG', 'false').lower() == 'true'
@@ -0,0 +1,210 @@
+"""
+Commentary Scheduler — adaptive per-match polling intervals.
+============================================================
+Each Cricbuzz match gets its own refresh interval from:
+  - match state from the /live merge (Live / Upcoming / Completed)
+  - how often its commentary actually changed on recent fetches (EWMA)
+  - subscriber demand (requests seen in the last DEMAND_WINDOW seconds)
+
+Live matches with readers and moving commentary poll fastest; unread or
+quiet ones back off. Upcoming and completed matches are only polled while
+someone reads them; a completed match gets one final fetch on its first read
+and is then dropped (remembered in a bounded list so the feed does not
+re-add it).
+Matches that left the feed and have no readers are dropped too. A heap of
+(next_due, match_id) hands the scrape worker the matches that are due,
+oldest first.
+"""
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
+STATE_INTERVALS = {"live": 15, "upcoming": 300, "completed": 120}
+MIN_INTERVAL = 10
+MAX_INTERVAL = 900
+DEMAND_WINDOW = 600
+MAX_FINISHED = 2048
+
+# Results only: toss text ("India won the toss and opt to bat") must stay live
+_COMPLETED_MARKERS = ('won by', 'won the super over', ' beat ', 'drawn', 'no result',
+                      'abandon', 'tied', 'completed')
+_UPCOMING_MARKERS = ('upcoming', 'preview', 'starts', 'yet to begin', 'scheduled')
+
+
+def classify_status(status):
+    """Map a /live status string to 'live', 'upcoming' or 'completed'."""
+    s = (status or '').lower()
+    if any(marker in s for marker in _COMPLETED_MARKERS):
+        return "completed"
+    if any(marker in s for marker in _UPCOMING_MARKERS):
+        return "upcoming"
+    return "live"
+
+
+class _Match:
+    __slots__ = ("state", "change_rate", "last_demand", "readers", "next_due")
+
+    def __init__(self):
+        self.state = None          # set by the first /live sync
+        self.change_rate = 1.0     # EWMA of "commentary changed on fetch"
+        self.last_demand = 0.0
+        self.readers = 0.0         # decayed request count
+        self.next_due = 0.0
+
+
+class CommentaryScheduler:
+    """Thread-safe priority queue of next-due commentary fetches."""
+
+    def __init__(self, state_intervals=None, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, demand_window=DEMAND_WINDOW,
+                 max_finished=MAX_FINISHED):
+        self._lock = threading.Lock()
+        self._matches = {}
+        self._finished = OrderedDict()   # match ids given their final fetch
+        self._in_feed = set()            # match ids in the last /live sync
+        self.max_finished = max_finished
+        self._heap = []            # (next_due, match_id); stale entries skipped
+        self.state_intervals = dict(state_intervals or STATE_INTERVALS)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.demand_window = demand_window
+        self.live_stamp = None
+        self.fetches = 0
+
+    def _get(self, match_id):
+        m = self._matches.get(match_id)
+        if m is None:
+            m = self._matches[match_id] = _Match()
+        return m
+
+    def _interval(self, m, now):
+        interval = self.state_intervals.get(m.state, self.state_intervals["live"])
+        # Quiet commentary backs off up to 4x; changing commentary stays at base
+        interval /= max(m.change_rate, 0.25)
+        # Nobody reading: stretch 4x. Many readers: tighten down to half.
+        if now - m.last_demand > self.demand_window:
+            interval *= 4
+        elif m.readers > 1:
+            interval /= min(1 + m.readers / 10, 2)
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    def _wanted(self, m, now):
+        """Live matches are always polled; others only while someone reads them."""
+        return m.state in ("live", None) or now - m.last_demand <= self.demand_window
+
+    def _push(self, match_id, m, due):
+        m.next_due = due
+        heapq.heappush(self._heap, (due, match_id))
+        if len(self._heap) > 2 * len(self._matches) + 64:
+            self._heap = [(t.next_due, mid) for mid, t in self._matches.items() if t.next_due]
+            heapq.heapify(self._heap)
+
+    def _prune(self, now):
+        """Drop matches that left the feed and have had no reader for a window."""
+        for match_id in [mid for mid, m in self._matches.items()
+                         if mid not in self._in_feed and now - m.last_demand > self.demand_window]:
+            del self._matches[match_id]
+
+    def _finish(self, match_id):
+        self._matches.pop(match_id, None)
+        self._finished[match_id] = True
+        self._finished.move_to_end(match_id)
+        while len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+    def sync_live(self, matches, stamp=None):
+        """Update match states from the merged /live list (once per feed stamp)."""
+        with self._lock:
+            if stamp is not None and stamp == self.live_stamp:
+                return
+            self.live_stamp = stamp
+            now = time.time()
+            in_feed = set()
+            for item in matches or []:
+                match_id = str(item.get('cricbuzz_id') or '')
+                if not match_id.isdigit():
+                    continue
+                in_feed.add(match_id)
+                state = classify_status(item.get('status'))
+                if match_id in self._finished:
+                    if state == "completed":
+                        continue
+                    del self._finished[match_id]
+                m = self._get(match_id)
+                if state != m.state:
+                    m.state = state
+                    if self._wanted(m, now):
+                        interval = self._interval(m, now)
+                        self._push(match_id, m, min(m.next_due or now, now + interval))
+                    else:
+                        m.next_due = 0.0     # queued again by its first reader
+            self._in_feed = in_feed
+            self._prune(now)
+
+    def record_demand(self, match_id, when=None):
+        """Note a reader of `match_id`; returns its interval (None once final)."""
+        now = when or time.time()
+        with self._lock:
+            if match_id in self._finished:
+                return None
+            if len(self._matches) > 1024:
+                self._prune(now)
+            m = self._get(match_id)
+            elapsed = now - m.last_demand if m.last_demand else self.demand_window
+            m.readers = m.readers * max(0.0, 1 - elapsed / self.demand_window) + 1
+            was_idle = now - m.last_demand > self.demand_window
+            m.last_demand = now
+            interval = self._interval(m, now)
+            if was_idle or not m.next_due:
+                self._push(match_id, m, now + (0 if was_idle else interval))
+            return interval
+
+    def record_fetch(self, match_id, changed, when=None):
+        """Feed back a fetch result and schedule the next poll."""
+        now = when or time.time()
+        with self._lock:
+            self.fetches += 1
+            m = self._matches.get(match_id)
+            if m is None:
+                return
+            m.change_rate = 0.7 * m.change_rate + 0.3 * (1.0 if changed else 0.0)
+            if m.state == "completed":
+                self._finish(match_id)
+                return
+            if not self._wanted(m, now):
+                m.next_due = 0.0
+                return
+            self._push(match_id, m, now + self._interval(m, now))
+
+    def interval(self, match_id):
+        """Current interval in seconds, or None once a completed match is final."""
+        with self._lock:
+            if match_id in self._finished:
+                return None
+            return self._interval(self._matches.get(match_id) or _Match(), time.time())
+
+    def due(self, now=None, limit=None):
+        """Pop up to `limit` match ids whose next fetch is due."""
+        now = now or time.time()
+        ready = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, match_id = heapq.heappop(self._heap)
+                m = self._matches.get(match_id)
+                if m is None or m.next_due != due_at or match_id in ready:
+                    continue
+                ready.append(match_id)
+                if limit is not None and len(ready) >= limit:
+                    break
+        return ready
+
+    def stats(self):
+        with self._lock:
+            states = {}
+            for m in self._matches.values():
+                states[m.state] = states.get(m.state, 0) + 1
+            return {"tracked": len(self._matches), "queued": len(self._heap),
+                    "finished": len(self._finished), "fetches": self.fetches,
+                    "states": states}
@@ -0,0 +1,172 @@
+"""
+Crawler — paginated cricapi reader with bounded parallelism.
+=============================================================
+cricapi list endpoints (`matches`, `players`) return 25 rows per `offset`
+window. `crawl` walks every window through a caller-supplied fetch function
+(normally a wrapper around `cricket_api`), fetching up to `max_workers`
+pages at once and stopping as soon as results run out or the daily quota
+reserve is reached. Pages are merged into a `PagedIndex` keyed by record id.
+
+cricapi has no conditional requests, so "only fetch changed pages" is
+approximated per page: a page whose content hash is unchanged doubles its
+refresh interval (up to `max_interval`), a page that changed resets it.
+With `due_by`, a page is never scheduled past the earliest deadline of its
+rows (a match start, say), though never sooner than `min_interval`.
+Offset 0 is always fetched because it carries the row total and quota info.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_SIZE = 25
+
+
+class PagedIndex:
+    """Records merged by id, with per-page fingerprints and refresh schedule."""
+
+    def __init__(self, min_interval=0, max_interval=3600, due_by=None):
+        self._lock = threading.Lock()
+        self._records = {}
+        self._owner = {}      # record id -> offset of the page it came from
+        self._pages = {}      # offset -> {"hash", "ids", "interval", "next_due"}
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.due_by = due_by  # row -> epoch seconds its page must be refetched by, or None
+
+    @staticmethod
+    def _fingerprint(rows):
+        raw = json.dumps(rows, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha1(raw).hexdigest()
+
+    def _next_due(self, now, interval, rows):
+        due = now + interval
+        if self.due_by:
+            deadlines = [d for d in map(self.due_by, rows) if d is not None]
+            if deadlines:
+                due = min(due, max(min(deadlines), now + self.min_interval))
+        return due
+
+    def is_due(self, offset, now=None):
+        with self._lock:
+            page = self._pages.get(offset)
+            return page is None or page["next_due"] <= (now or time.time())
+
+    def merge_page(self, offset, rows):
+        """Merge one page of rows; returns True if its contents changed."""
+        digest = self._fingerprint(rows)
+        now = time.time()
+        with self._lock:
+            page = self._pages.get(offset)
+            if page and page["hash"] == digest:
+                page["interval"] = min(max(page["interval"] * 2, 1), self.max_interval)
+                page["next_due"] = self._next_due(now, page["interval"], rows)
+                return False
+
+            ids = [r.get('id') for r in rows if r.get('id')]
+            if page:
+                for rid in set(page["ids"]) - set(ids):
+                    if self._owner.get(rid) == offset:
+                        self._owner.pop(rid, None)
+                        self._records.pop(rid, None)
+            for r in rows:
+                if r.get('id'):
+                    self._records[r['id']] = r
+                    self._owner[r['id']] = offset
+            self._pages[offset] = {"hash": digest, "ids": ids,
+                                   "interval": self.min_interval,
+                                   "next_due": self._next_due(now, self.min_interval, rows)}
+            return True
+
+    def truncate(self, total):
+        """Forget pages (and their records) at or beyond row `total`."""
+        with self._lock:
+            for offset in [o for o in self._pages if o >= total]:
+                for rid in self._pages.pop(offset)["ids"]:
+                    if self._owner.get(rid) == offset:
+                        self._owner.pop(rid, None)
+                        self._records.pop(rid, None)
+
+    def upsert(self, rows):
+        """Merge rows by id without page bookkeeping."""
+        with self._lock:
+            for r in rows:
+                if r.get('id'):
+                    self._records[r['id']] = r
+
+    def get(self, rid):
+        with self._lock:
+            return self._records.get(rid)
+
+    def values(self):
+        with self._lock:
+            return list(self._records.values())
+
+    def __len__(self):
+        return len(self._records)
+
+
+def _quota_pages(info, reserve):
+    """Pages we may still spend today according to cricapi's `info` block."""
+    try:
+        return max(int(info['hitsLimit']) - int(info['hitsToday']) - reserve, 0)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def crawl(fetch_page, index, max_workers=4, max_pages=10, quota_reserve=10):
+    """Crawl offset windows into `index`.
+
+    `fetch_page(offset)` must return a cricapi response dict (or one with
+    an "error" key). Returns a stats dict (with cricapi's `total_rows` when
+    reported), or the first page's error response if nothing could be fetched.
+    """
+    stats = {"pages_fetched": 0, "pages_changed": 0, "pages_skipped": 0}
+
+    first = fetch_page(0)
+    if 'error' in first:
+        return first
+    info = first.get('info') or {}
+    rows = first.get('data') or []
+    stats["pages_fetched"] += 1
+    stats["pages_changed"] += index.merge_page(0, rows)
+
+    budget = max_pages - 1
+    remaining_quota = _quota_pages(info, quota_reserve)
+    if remaining_quota is not None:
+        budget = min(budget, remaining_quota)
+
+    total = info.get('totalRows')
+    stats["total_rows"] = total
+    if total is not None:
+        index.truncate(total)
+    if len(rows) < PAGE_SIZE or (total is not None and PAGE_SIZE >= total):
+        return stats
+
+    offset = PAGE_SIZE
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while budget > 0 and not exhausted:
+            batch = []
+            while len(batch) < min(max_workers, budget):
+                if total is not None and offset >= total:
+                    exhausted = True
+                    break
+                if index.is_due(offset):
+                    batch.append(offset)
+                else:
+                    stats["pages_skipped"] += 1
+                offset += PAGE_SIZE
+            if not batch:
+                break
+            budget -= len(batch)
+            for page_offset, data in zip(batch, pool.map(fetch_page, batch)):
+                stats["pages_fetched"] += 1
+                if 'error' in data or not data.get('data'):
+                    # Error or empty window: nothing further to read this round.
+                    exhausted = True
+                    continue
+                stats["pages_changed"] += index.merge_page(page_offset, data['data'])
+    return stats
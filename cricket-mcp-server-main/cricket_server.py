@@ -0,0 +1,237 @@
+"""
+Cricket MCP Server — the bridge's data as MCP tools over stdio.
+===============================================================
+Speaks JSON-RPC 2.0 (one message per line) as described in CONFIG.md:
+`initialize`, `tools/list` and `tools/call`. Tools run the same loaders
+the Flask handlers use, so with CACHE_PATH set they read what the web
+processes and worker.py already cached instead of going upstream per call.
+
+bridge_server (Flask, requests, bs4) is imported on the first tool call, so
+the handshake is answered immediately. Tool calls run on a thread pool
+(MCP_WORKERS), so a slow scrape does not hold up other calls; responses are
+written as they finish, matched to requests by id.
+
+Usage:
+    python cricket_server.py
+    CACHE_PATH=/data/cache.db SCRAPE_INLINE=false python cricket_server.py
+"""
+
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PROTOCOL_VERSION = "2024-11-05"
+SERVER_INFO = {"name": "cricket", "version": "3.0"}
+MCP_WORKERS = int(os.environ.get('MCP_WORKERS', 8))
+
+_protocol_out = sys.stdout
+_write_lock = threading.Lock()
+
+_bridge = None
+_bridge_lock = threading.Lock()
+
+
+def bridge():
+    """bridge_server, imported on first use."""
+    global _bridge
+    if _bridge is None:
+        with _bridge_lock:
+            if _bridge is None:
+                import bridge_server
+                _bridge = bridge_server
+    return _bridge
+
+
+# =============================================================================
+# TOOLS
+# =============================================================================
+class InvalidParams(ValueError):
+    """Bad tool arguments, answered as a JSON-RPC invalid-params error."""
+
+
+def positive_int(args, key):
+    """args[key] as an int >= 1 (None when absent), coerced like the HTTP query string."""
+    value = args.get(key)
+    if value is None:
+        return None
+    try:
+        # Via str, as /schedule?limit= does: 5 and "5" pass, 2.5 and true do not
+        value = int(str(value))
+        if value < 1:
+            raise ValueError
+    except ValueError:
+        raise InvalidParams(f"{key} must be a positive integer")
+    return value
+
+
+def get_live_matches(args):
+    return bridge().load_live()
+
+
+def get_commentary(args):
+    return bridge().load_commentary(str(args['match_id']))
+
+
+def get_match_details(args):
+    payload, _ = bridge().load_match_details(str(args['match_id']))
+    return payload
+
+
+def get_cricket_schedule(args):
+    limit = positive_int(args, 'limit')
+    bs = bridge()
+    if bs.load_schedule() is None:
+        return []
+    results, _ = bs.schedule_index.query(
+        team=args.get('team'),
+        fmt=args.get('format'),
+        date_from=args.get('from'),
+        date_to=args.get('to'),
+        limit=limit,
+        upcoming=bool(args.get('upcoming')),
+    )
+    return results
+
+
+def get_rankings(args):
+    bs = bridge()
+    return bs.filter_rankings(bs.load_rankings(), args.get('category'), args.get('format'))
+
+
+def get_cricket_news(args):
+    return bridge().load_news()
+
+
+def get_player_stats(args):
+    payload, _ = bridge().load_player(args['player_name'])
+    fmt = (args.get('match_format') or '').lower()
+    if fmt and 'error' not in payload:
+        payload = dict(payload)
+        for key in ('batting_stats', 'bowling_stats'):
+            payload[key] = {k: v for k, v in payload[key].items() if k.startswith(fmt)}
+    return payload
+
+
+def _schema(properties=None, required=None):
+    schema = {"type": "object", "properties": properties or {}}
+    if required:
+        schema["required"] = required
+    return schema
+
+
+_STRING = {"type": "string"}
+
+TOOLS = {
+    "get_live_matches": (get_live_matches, "Live and recent matches (official + Cricbuzz).",
+                         _schema()),
+    "get_commentary": (get_commentary, "Ball-by-ball commentary for a Cricbuzz match id from get_live_matches.",
+                       _schema({"match_id": _STRING}, ["match_id"])),
+    "get_match_details": (get_match_details, "Scorecard by innings for a cricapi or Cricbuzz match id.",
+                          _schema({"match_id": _STRING}, ["match_id"])),
+    "get_cricket_schedule": (get_cricket_schedule, "Match schedule, optionally filtered.",
+                             _schema({"team": _STRING, "format": _STRING,
+                                      "from": {"type": "string", "description": "YYYY-MM-DD"},
+                                      "to": {"type": "string", "description": "YYYY-MM-DD"},
+                                      "upcoming": {"type": "boolean"},
+                                      "limit": {"type": "integer", "minimum": 1}})),
+    "get_rankings": (get_rankings, "ICC rankings (batting, bowling, allrounder, teams) by format.",
+                     _schema({"category": _STRING, "format": {"type": "string", "enum": ["test", "odi", "t20"]}})),
+    "get_cricket_news": (get_cricket_news, "Latest cricket news headlines.", _schema()),
+    "get_player_stats": (get_player_stats, "Career stats for a player, optionally one format (e.g. T20).",
+                         _schema({"player_name": _STRING, "match_format": _STRING}, ["player_name"])),
+}
+
+
+# =============================================================================
+# JSON-RPC over stdio
+# =============================================================================
+def send(message):
+    line = json.dumps(message, separators=(',', ':'))
+    with _write_lock:
+        _protocol_out.write(line + "\n")
+        _protocol_out.flush()
+
+
+def reply(msg_id, result=None, error=None):
+    message = {"jsonrpc": "2.0", "id": msg_id}
+    if error is not None:
+        message["error"] = error
+    else:
+        message["result"] = result
+    send(message)
+
+
+def call_tool(msg_id, params):
+    name = params.get('name')
+    args = params.get('arguments') or {}
+    tool = TOOLS.get(name)
+    if tool is None:
+        reply(msg_id, error={"code": -32602, "message": f"Unknown tool: {name}"})
+        return
+    try:
+        if not isinstance(args, dict):
+            raise InvalidParams("arguments must be an object")
+        missing = [key for key in tool[2].get('required', []) if key not in args]
+        if missing:
+            raise InvalidParams(f"Missing argument: {missing[0]}")
+        result = tool[0](args)
+        is_error = isinstance(result, dict) and 'error' in result
+        text = json.dumps(result, separators=(',', ':'))
+    except InvalidParams as e:
+        reply(msg_id, error={"code": -32602, "message": str(e)})
+        return
+    except Exception as e:
+        is_error, text = True, f"{type(e).__name__}: {e}"
+    reply(msg_id, {"content": [{"type": "text", "text": text}], "isError": is_error})
+
+
+def handle(message, pool):
+    method = message.get('method')
+    msg_id = message.get('id')
+    params = message.get('params') or {}
+
+    if method == 'tools/call':
+        pool.submit(call_tool, msg_id, params)
+    elif msg_id is None:
+        return  # notifications (e.g. notifications/initialized) need no reply
+    elif method == 'initialize':
+        reply(msg_id, {"protocolVersion": params.get('protocolVersion', PROTOCOL_VERSION),
+                       "capabilities": {"tools": {}}, "serverInfo": SERVER_INFO})
+    elif method == 'ping':
+        reply(msg_id, {})
+    elif method == 'tools/list':
+        reply(msg_id, {"tools": [{"name": name, "description": desc, "inputSchema": schema}
+                                 for name, (_, desc, schema) in TOOLS.items()]})
+    else:
+        reply(msg_id, error={"code": -32601, "message": f"Method not found: {method}"})
+
+
+def main():
+    global _protocol_out
+    # stdout carries the protocol; everything the loaders print goes to stderr
+    _protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+    pool = ThreadPoolExecutor(max_workers=MCP_WORKERS)
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                reply(None, error={"code": -32700, "message": "Parse error"})
+                continue
+            if not isinstance(message, dict):
+                reply(None, error={"code": -32600, "message": "Invalid Request"})
+                continue
+            handle(message, pool)
+    finally:
+        pool.shutdown(wait=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
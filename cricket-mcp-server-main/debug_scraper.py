@@ -1,38 +1,6 @@
-
 import scraper
 import json
-
-def get_match_priority(match):
-    score = 0
-    name = match.get('name', '').lower()
-    m_type = match.get('matchType', '').lower()
-    status = match.get('status', '').lower()
-
-    # 1. Premium / Scraped (Highest Priority)
-    if match.get('is_premium'): score += 2000
-
-    # 2. Status
-    if 'live' in status: score += 1000
-    elif 'common' in status or 'upcoming' in status: score += 200
-    
-    # 3. Tournaments / Keywords
-    if 'world cup' in name: score += 500
-    
-    if 'women' in name:
-        score += 500
-    else:
-        score += 1500 # Aggressive Men's Boost
-
-    if 'final' in name: score += 500
-    if 'semi-final' in name: score += 500
-
-    # 4. Big Teams
-    if 'india' in name or 'ind ' in name: score += 100
-    if 'australia' in name or 'aus ' in name: score += 80
-    if 'england' in name or 'eng ' in name: score += 80
-    if 'pakistan' in name or 'pak ' in name: score += 80
-
-    return score
+from match_priority import get_match_priority
 
 print("Fetching matches...")
 try:
@@ -0,0 +1,143 @@
+"""
+Extraction Rules — ordered selector fallbacks with per-rule telemetry.
+=====================================================================
+Each Cricbuzz page type owns a RuleChain: an ordered list of Rules tried
+until one yields a non-empty result. A Rule is a CSS selector (compiled
+once with soupsieve on first use) plus a function turning the matched
+elements into records, or a plain function of the whole soup for legacy
+heuristics.
+
+Every run records which rule matched and how long extraction took, so
+layout drift shows up as traffic moving to fallback rules (or to "empty")
+in /health rather than as silently empty lists.
+
+After use_shared_cache() (scraper.use_shared_cache calls it) the counters go
+to the shared cache instead, so runs in worker.py's pool children show up in
+the /health of whichever process serves it.
+"""
+
+import threading
+import time
+
+
+class Rule:
+    """One extraction strategy: `selector` + `extract(elements)` or `extract(soup)`."""
+
+    def __init__(self, name, extract, selector=None):
+        self.name = name
+        self.selector = selector
+        self.extract = extract
+        self._compiled = None
+
+    def apply(self, soup):
+        if self.selector is None:
+            return self.extract(soup)
+        if self._compiled is None:
+            import soupsieve
+            self._compiled = soupsieve.compile(self.selector)
+        elements = self._compiled.select(soup)
+        return self.extract(elements) if elements else []
+
+
+class RuleChain:
+    """Ordered fallback rules for one page type."""
+
+    def __init__(self, page, rules):
+        self.page = page
+        self.rules = rules
+        _register(self)
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.empty = 0
+        self.hits = {rule.name: 0 for rule in rules}
+        self.errors = {rule.name: 0 for rule in rules}
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_rule = None
+
+    def run(self, soup):
+        """Return the first non-empty rule result (or [])."""
+        started = time.perf_counter()
+        matched, result, failed = None, [], []
+        for rule in self.rules:
+            try:
+                result = rule.apply(soup)
+            except Exception as e:
+                print(f"Extraction rule {self.page}/{rule.name} failed: {e}")
+                failed.append(rule.name)
+                result = []
+            if result:
+                matched = rule.name
+                break
+
+        elapsed = (time.perf_counter() - started) * 1000
+        if _shared is not None:
+            counts = {"runs": 1, "total_ms": elapsed, f"hits.{matched}" if matched else "empty": 1}
+            counts.update({f"errors.{name}": 1 for name in failed})
+            _shared.merge_counts(f"{SHARED_KEY_PREFIX}{self.page}", counts,
+                                 peaks={"max_ms": elapsed}, values={"last_rule": matched})
+        else:
+            with self._lock:
+                self.runs += 1
+                self.total_ms += elapsed
+                self.max_ms = max(self.max_ms, elapsed)
+                self.last_rule = matched
+                for name in failed:
+                    self.errors[name] += 1
+                if matched:
+                    self.hits[matched] += 1
+                else:
+                    self.empty += 1
+        if not matched:
+            print(f"Extraction for {self.page} matched no rule (layout drift?)")
+        return result or []
+
+    def stats(self):
+        if _shared is not None:
+            return self._shared_stats()
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "empty": self.empty,
+                "hits": dict(self.hits),
+                "errors": {k: v for k, v in self.errors.items() if v},
+                "last_rule": self.last_rule,
+                "avg_ms": round(self.total_ms / self.runs, 2) if self.runs else 0,
+                "max_ms": round(self.max_ms, 2),
+            }
+
+    def _shared_stats(self):
+        data = _shared.get(f"{SHARED_KEY_PREFIX}{self.page}", float('inf')) or {}
+        runs = data.get("runs", 0)
+        return {
+            "runs": runs,
+            "empty": data.get("empty", 0),
+            "hits": {rule.name: data.get(f"hits.{rule.name}", 0) for rule in self.rules},
+            "errors": {rule.name: data[f"errors.{rule.name}"] for rule in self.rules
+                       if data.get(f"errors.{rule.name}")},
+            "last_rule": data.get("last_rule"),
+            "avg_ms": round(data.get("total_ms", 0) / runs, 2) if runs else 0,
+            "max_ms": round(data.get("max_ms", 0), 2),
+        }
+
+
+SHARED_KEY_PREFIX = "extraction:"
+_shared = None
+
+
+def use_shared_cache(cache):
+    """Record rule telemetry in `cache` (a SqliteCache) for every process."""
+    global _shared
+    _shared = cache
+
+
+_chains = {}
+
+
+def _register(chain):
+    _chains[chain.page] = chain
+
+
+def telemetry():
+    """Per page type: rule hit counts, empty runs and extraction timings."""
+    return {page: chain.stats() for page, chain in _chains.items()}
@@ -0,0 +1,122 @@
+"""
+Key Pool — spreads cricapi calls across several API keys.
+=========================================================
+Every cricapi response carries an `info` block with the key's `hitsToday`
+and `hitsLimit`. The pool remembers it per key and hands each call the key
+with the most budget left, discounted by its recent error rate and by calls
+already in flight on it, so concurrent requests fan out instead of draining
+one key first.
+
+A key that answers with a quota failure ("hits today exceeded hits limit",
+"Blocked for 15 minutes", HTTP 429) or reports no budget left is taken out
+of rotation for `cooldown` seconds. When every key is cooling, acquire()
+returns None and the caller fails fast without spending an upstream call.
+
+State is per process; budgets re-converge from `info` on the next call.
+"""
+
+import re
+import threading
+import time
+
+QUOTA_ERROR = re.compile(r"hits (today|limit)|blocked|quota|too many requests", re.IGNORECASE)
+UNKNOWN_BUDGET = 10 ** 6    # keys not seen yet rank first, so each reports its info once
+
+
+def mask(key):
+    return f"{key[:4]}…{key[-4:]}" if len(key) > 8 else "…"
+
+
+class _KeyState:
+    __slots__ = ("key", "hits_today", "hits_limit", "in_flight", "calls",
+                 "errors", "quota_errors", "error_rate", "cooling_until", "last_error")
+
+    def __init__(self, key):
+        self.key = key
+        self.hits_today = None
+        self.hits_limit = None
+        self.in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self.quota_errors = 0
+        self.error_rate = 0.0       # exponentially weighted, last ~10 calls
+        self.cooling_until = 0.0
+        self.last_error = None
+
+    def remaining(self):
+        if self.hits_today is None or self.hits_limit is None:
+            return UNKNOWN_BUDGET
+        return max(self.hits_limit - self.hits_today, 0)
+
+    def score(self):
+        return (self.remaining() - self.in_flight) * (1.0 - self.error_rate)
+
+
+class KeyPool:
+    """Thread-safe choice of the healthiest key for each upstream call."""
+
+    def __init__(self, keys, cooldown=900, error_decay=0.1):
+        keys = list(dict.fromkeys(k.strip() for k in keys if k and k.strip()))
+        self._states = [_KeyState(k) for k in keys]
+        self._lock = threading.Lock()
+        self.cooldown = cooldown
+        self.error_decay = error_decay
+        self.exhausted = 0
+
+    def __len__(self):
+        return len(self._states)
+
+    def acquire(self):
+        """Key to use for the next call (counted in flight), or None if all are cooling."""
+        now = time.monotonic()
+        with self._lock:
+            ready = [s for s in self._states if s.cooling_until <= now]
+            if not ready:
+                self.exhausted += 1
+                return None
+            best = max(ready, key=_KeyState.score)
+            best.in_flight += 1
+            best.calls += 1
+            return best.key
+
+    def release(self, key, info=None, error=None):
+        """Record the outcome of a call made with `key`."""
+        with self._lock:
+            state = next((s for s in self._states if s.key == key), None)
+            if state is None:
+                return
+            state.in_flight -= 1
+            if isinstance(info, dict):
+                try:
+                    state.hits_today = int(info['hitsToday'])
+                    state.hits_limit = int(info['hitsLimit'])
+                except (KeyError, TypeError, ValueError):
+                    pass
+            failed = 1.0 if error else 0.0
+            state.error_rate += self.error_decay * (failed - state.error_rate)
+            if error:
+                state.errors += 1
+                state.last_error = str(error).replace(key, mask(key))[:200]
+            quota_hit = bool(error) and QUOTA_ERROR.search(str(error)) is not None
+            if quota_hit:
+                state.quota_errors += 1
+            if quota_hit or (state.hits_limit is not None and state.remaining() <= 0):
+                state.cooling_until = time.monotonic() + self.cooldown
+
+    def stats(self):
+        """Per-key budget and health, keys masked."""
+        now = time.monotonic()
+        with self._lock:
+            keys = [{
+                "key": mask(s.key),
+                "hits_today": s.hits_today,
+                "hits_limit": s.hits_limit,
+                "in_flight": s.in_flight,
+                "calls": s.calls,
+                "errors": s.errors,
+                "quota_errors": s.quota_errors,
+                "error_rate": round(s.error_rate, 3),
+                "cooling_for": max(0, round(s.cooling_until - now)),
+                "last_error": s.last_error,
+            } for s in self._states]
+            return {"keys": keys, "exhausted": self.exhausted}
@@ -0,0 +1,82 @@
+"""
+Live State — versioned /live snapshots for delta polling.
+=========================================================
+Every time the merged live feed changes, its version increments and the
+snapshot is kept in a short history. `delta(since)` returns only the
+matches added, removed or changed since that version (with field-level
+diffs), or None when the version has fallen out of history.
+
+Versions are derived from the cache timestamp of the feed (milliseconds), not
+a per-process counter, so gunicorn workers reading the same cache agree on
+what a version means, and a version minted by another worker is not diffed
+against the wrong snapshot.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LiveState:
+    """Thread-safe, monotonically versioned live match list."""
+
+    def __init__(self, history=64):
+        self._lock = threading.Lock()
+        self._history = OrderedDict()   # version -> (order, {id: match})
+        self.max_history = history
+        self.version = 0
+        self.source_stamp = None
+
+    def sync(self, matches, stamp):
+        """Record `matches` as a new version unless `stamp` was already seen."""
+        with self._lock:
+            if stamp is not None and stamp == self.source_stamp:
+                return self.version
+            self.source_stamp = stamp
+            order = [m.get('id') for m in matches]
+            snapshot = {m.get('id'): m for m in matches}
+            current = self._history.get(self.version)
+            if current and current == (order, snapshot):
+                return self.version
+            version = int(stamp * 1000) if stamp is not None else self.version + 1
+            self.version = max(version, self.version + 1)
+            self._history[self.version] = (order, snapshot)
+            while len(self._history) > self.max_history:
+                self._history.popitem(last=False)
+            return self.version
+
+    def delta(self, since):
+        """Changes from version `since` to now, or None if `since` is unknown."""
+        with self._lock:
+            base = self._history.get(since)
+            if base is None:
+                return None
+            order, current = self._history[self.version]
+            old_order, old = base
+
+            added = [current[mid] for mid in order if mid not in old]
+            removed = [mid for mid in old_order if mid not in current]
+            changed = []
+            for mid in order:
+                before = old.get(mid)
+                after = current[mid]
+                if before is None or before == after:
+                    continue
+                fields = {k: v for k, v in after.items() if before.get(k) != v}
+                dropped = [k for k in before if k not in after]
+                entry = {"id": mid, "fields": fields}
+                if dropped:
+                    entry["dropped"] = dropped
+                changed.append(entry)
+
+            result = {"version": self.version, "since": since, "full": False,
+                      "added": added, "removed": removed, "changed": changed}
+            if order != old_order:
+                result["order"] = order
+            return result
+
+    def snapshot(self):
+        with self._lock:
+            entry = self._history.get(self.version)
+            order, current = entry if entry else ([], {})
+            return {"version": self.version, "full": True,
+                    "matches": [current[mid] for mid in order]}
@@ -0,0 +1,121 @@
+"""
+Match Priority — ordering for the merged /live feed.
+====================================================
+Scores each match (premium/Cricbuzz, live status, tournament keywords, big
+teams) and sorts the feed once per refresh, so /live and /live?limit=N are
+served in priority order without sorting per request.
+
+Weights can be overridden with LIVE_PRIORITY_WEIGHTS, a JSON object merged
+over DEFAULT_WEIGHTS, e.g. '{"womens": 1500, "teams": {"india": 300}}'.
+
+Benchmark:
+    python match_priority.py --matches 5000
+"""
+
+import json
+import os
+
+DEFAULT_WEIGHTS = {
+    "premium": 2000,        # Cricbuzz / commentary-enabled matches
+    "live": 1000,
+    "upcoming": 200,
+    "world_cup": 500,
+    "mens": 1500,
+    "womens": 500,
+    "final": 500,           # semi-finals also match "final"
+    "semi_final": 500,
+    "teams": {"india": 100, "australia": 80, "england": 80, "pakistan": 80},
+}
+
+_TEAM_ABBREVIATIONS = {"india": "ind ", "australia": "aus ", "england": "eng ", "pakistan": "pak "}
+
+
+def load_weights(raw=None):
+    """DEFAULT_WEIGHTS with the JSON overrides in `raw` (or the environment) applied."""
+    weights = dict(DEFAULT_WEIGHTS, teams=dict(DEFAULT_WEIGHTS["teams"]))
+    raw = os.environ.get('LIVE_PRIORITY_WEIGHTS', '') if raw is None else raw
+    if raw:
+        try:
+            overrides = json.loads(raw)
+            if not isinstance(overrides, dict):
+                raise ValueError("expected a JSON object")
+            weights["teams"].update(overrides.pop("teams", {}))
+            weights.update(overrides)
+        except ValueError as e:
+            print(f"Ignoring LIVE_PRIORITY_WEIGHTS: {e}")
+    return weights
+
+
+WEIGHTS = load_weights()
+
+
+def get_match_priority(match, weights=WEIGHTS):
+    score = 0
+    name = match.get('name', '').lower()
+    status = match.get('status', '').lower()
+
+    # 1. Premium / Scraped (Highest Priority)
+    if match.get('is_premium'): score += weights["premium"]
+
+    # 2. Status
+    if 'live' in status: score += weights["live"]
+    elif 'upcoming' in status: score += weights["upcoming"]
+
+    # 3. Tournaments / Keywords
+    if 'world cup' in name: score += weights["world_cup"]
+    score += weights["womens"] if 'women' in name else weights["mens"]
+    if 'final' in name: score += weights["final"]
+    if 'semi-final' in name: score += weights["semi_final"]
+
+    # 4. Big Teams
+    for team, boost in weights["teams"].items():
+        short = _TEAM_ABBREVIATIONS.get(team)
+        if team in name or (short and short in name):
+            score += boost
+
+    return score
+
+
+def rank_matches(matches, weights=WEIGHTS):
+    """Matches with a `priority` score, highest first (ties keep feed order)."""
+    for match in matches:
+        match["priority"] = get_match_priority(match, weights)
+    return sorted(matches, key=lambda m: m["priority"], reverse=True)
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+
+    parser = argparse.ArgumentParser(description="Time ranking once vs sorting per request.")
+    parser.add_argument('--matches', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    teams = ["India", "Australia", "England", "Pakistan", "Nepal", "Kenya", "Oman"]
+    statuses = ["Live", "Completed", "Upcoming", "Stumps - Day 2"]
+    feed = [{"id": str(i),
+             "name": f"{random.choice(teams)} vs {random.choice(teams)}"
+                     f"{random.choice(['', ' Women', ', Final', ', World Cup'])}",
+             "status": random.choice(statuses),
+             "is_premium": random.random() < 0.2} for i in range(args.matches)]
+
+    start = time.perf_counter()
+    ranked = rank_matches(feed)
+    rank_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        ranked[:args.limit]
+    slice_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        sorted(feed, key=get_match_priority, reverse=True)[:args.limit]
+    per_request_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{args.matches} matches, {args.requests} requests of top {args.limit}")
+    print(f"  rank once per refresh:  {rank_ms:8.1f} ms + {slice_ms:.2f} ms slicing")
+    print(f"  sort on every request:  {per_request_ms:8.1f} ms")
@@ -0,0 +1,133 @@
+"""
+Payload shaping — sparse fieldsets and negotiated compression.
+==============================================================
+  - project(): keep only the requested top-level fields (?fields=a,b,c)
+  - negotiate_encoding()/compress(): br (`brotli`, in requirements.txt) or
+    gzip; without the package br is never offered
+  - VariantCache: encoded response bodies keyed by request variant and
+    invalidated by the cache stamp of the data they were built from, so a
+    cache hit costs neither serialization nor compression CPU.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli  # in requirements.txt; gzip only if it fails to install
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth a compression frame
+MIN_COMPRESS_BYTES = 512
+
+
+def parse_fields(raw):
+    """'a, b,c' -> ['a', 'b', 'c'] (None when no projection was requested)."""
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(',') if f.strip()]
+    return fields or None
+
+
+def project(data, fields):
+    """Apply a sparse fieldset to a dict or to each dict in a list."""
+    if not fields:
+        return data
+    if isinstance(data, list):
+        return [project(item, fields) for item in data]
+    if isinstance(data, dict):
+        return {k: data[k] for k in fields if k in data}
+    return data
+
+
+def project_live(envelope, fields):
+    """Apply a sparse fieldset to the matches inside a /live?since= envelope.
+
+    `added` and snapshot `matches` are projected per match; `changed` entries
+    keep only the listed fields and are dropped when none of them changed.
+    """
+    if not fields or not isinstance(envelope, dict):
+        return envelope
+    wanted = set(fields)
+    result = dict(envelope)
+    for key in ("added", "matches"):
+        if key in result:
+            result[key] = project(result[key], fields)
+    if "changed" in result:
+        changed = []
+        for entry in result["changed"]:
+            item = {"id": entry["id"],
+                    "fields": {k: v for k, v in entry["fields"].items() if k in wanted}}
+            dropped = [k for k in entry.get("dropped", []) if k in wanted]
+            if dropped:
+                item["dropped"] = dropped
+            if item["fields"] or dropped:
+                changed.append(item)
+        result["changed"] = changed
+    return result
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick 'br', 'gzip' or None from an Accept-Encoding header."""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0 or accepted.get('*', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+class VariantCache:
+    """LRU of encoded bodies, each valid only for the stamp it was built from."""
+
+    def __init__(self, max_entries=512):
+        self._entries = OrderedDict()   # key -> (stamp, body, encoding)
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, stamp):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def set(self, key, stamp, body, encoding):
+        with self._lock:
+            self._entries[key] = (stamp, body, encoding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits,
+                    "misses": self.misses}
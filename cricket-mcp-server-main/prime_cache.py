@@ -0,0 +1,153 @@
+"""
+Cache primer — warm every hot key before a traffic spike.
+=========================================================
+Runs the same loaders the Flask handlers use (`load_live`, `load_schedule`,
+`load_rankings`, `load_news`, `load_player`, `load_commentary`) in parallel
+against the shared `bridge_server.cache`, and reports the time spent per key.
+
+Usage:
+    CACHE_PATH=/data/cache.db python prime_cache.py   # prime the shared cache file
+    CACHE_PATH=/data/cache.db python prime_cache.py --players 20 --matches 12345,67890
+    ADMIN_TOKEN=... python prime_cache.py --url https://api.example.com   # ask a running server
+
+Without CACHE_PATH the CLI would only warm its own in-memory cache, which
+disappears when it exits, so it refuses to run; use --url instead.
+
+The web process can also prime itself on a schedule (PRIME_INTERVAL) or on
+demand via POST /cache/prime, which returns 202 and primes in the background.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+        ok = result is not None and result != []
+        error = None
+    except Exception as e:
+        result, ok, error = None, False, str(e)
+    report = {"ms": round((time.perf_counter() - start) * 1000, 1), "ok": ok}
+    if error:
+        report["error"] = error
+    return result, report
+
+
+def _load_player(bs, name, refresh):
+    payload, status = bs.load_player(name, refresh=refresh)
+    return payload if status == 200 else None
+
+
+def _top_players(rankings, limit):
+    """Names of the highest-ranked players across every ranking block."""
+    names = []
+    depth = 0
+    while len(names) < limit:
+        added = False
+        for block in rankings or []:
+            if block.get('type') == 'Teams':
+                continue
+            rows = block.get('rank') or []
+            if depth < len(rows):
+                added = True
+                name = rows[depth].get('name')
+                if name and name not in names:
+                    names.append(name)
+                    if len(names) >= limit:
+                        break
+        if not added:
+            break
+        depth += 1
+    return names
+
+
+def prime(top_players=10, match_ids=None, max_workers=6, refresh=True, server=None):
+    """Warm live, schedule, rankings, news, top players and commentary.
+
+    `server` is the bridge_server module to prime (imported when omitted).
+    Returns {cache_key: {"ms": float, "ok": bool[, "error": str]}}.
+    """
+    bs = server
+    if bs is None:
+        import bridge_server as bs
+
+    report = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Phase 1: list endpoints (players/commentary targets derive from these)
+        futures = {
+            "live": pool.submit(_timed, bs.load_live, refresh=refresh),
+            "schedule": pool.submit(_timed, bs.load_schedule, refresh=refresh),
+            "rankings": pool.submit(_timed, bs.load_rankings, refresh=refresh),
+            "news": pool.submit(_timed, bs.load_news, refresh=refresh),
+        }
+        results = {}
+        for key, future in futures.items():
+            results[key], report[key] = future.result()
+
+        # Phase 2: per-entity keys
+        ids = list(match_ids or [])
+        for m in results["live"] or []:
+            cb_id = str(m.get('cricbuzz_id') or '')
+            if cb_id.isdigit() and cb_id not in ids:
+                ids.append(cb_id)
+
+        futures = {}
+        for name in _top_players(results["rankings"], top_players):
+            futures[f"player:{name}"] = pool.submit(
+                _timed, _load_player, bs, name, refresh)
+        for match_id in ids:
+            futures[f"commentary:{match_id}"] = pool.submit(
+                _timed, bs.load_commentary, match_id, refresh=refresh)
+        for key, future in futures.items():
+            _, report[key] = future.result()
+    return report
+
+
+def _prime_remote(url, top_players, match_ids):
+    import requests
+
+    res = requests.post(f"{url.rstrip('/')}/cache/prime",
+                        json={"players": top_players, "matches": match_ids},
+                        headers={"X-Admin-Token": os.environ.get('ADMIN_TOKEN', '')},
+                        timeout=600)
+    res.raise_for_status()
+    return res.json()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prime the Cricket Khelega cache.")
+    parser.add_argument('--players', type=int, default=10,
+                        help="number of top-ranked players to warm (default 10)")
+    parser.add_argument('--matches', default='',
+                        help="comma-separated Cricbuzz match ids for commentary")
+    parser.add_argument('--workers', type=int, default=6)
+    parser.add_argument('--url', help="prime a running server via POST /cache/prime")
+    args = parser.parse_args(argv)
+
+    match_ids = [m.strip() for m in args.matches.split(',') if m.strip()]
+    if args.url:
+        status = _prime_remote(args.url, args.players, match_ids)
+        print(f"{args.url}: {status.get('status')} (progress under \"primer\" in /health)")
+        return 0
+    if not os.environ.get('CACHE_PATH'):
+        print("CACHE_PATH is not set; priming this process's memory would be lost on exit. "
+              "Set CACHE_PATH to the server's cache file or use --url.")
+        return 1
+
+    started = time.perf_counter()
+    report = prime(args.players, match_ids, args.workers)
+
+    for key, entry in report.items():
+        flag = "ok " if entry.get("ok") else "ERR"
+        print(f"{flag} {entry.get('ms', 0):>9.1f} ms  {key}")
+    print(f"Primed {len(report)} keys in {time.perf_counter() - started:.1f}s")
+    return 0 if all(e.get("ok") for e in report.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
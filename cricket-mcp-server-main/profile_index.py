@@ -0,0 +1,98 @@
+"""
+Profile Index — player name -> Cricbuzz profile id, kept in the shared cache.
+============================================================================
+Every ranking scrape already links each listed player to their
+/profiles/<id>/ page, so those ids are learned for free; web searches
+(scraper.find_profile_url) are only needed for players never seen in a
+ranking table, and their result is learned too.
+
+The index lives under one cache key, so with CACHE_PATH it survives
+restarts and is shared by gunicorn workers and the scrape worker. Without
+CACHE_PATH it is per process and starts empty; the bridge refills it from
+the next rankings scrape. Names are matched case-, punctuation- and
+whitespace-insensitively.
+
+Names a search could not resolve are remembered for `miss_ttl` seconds
+(at most `max_misses` of them) so repeats do not search again.
+"""
+
+import re
+import threading
+import time
+
+INDEX_KEY = "profile_index"
+MISSES_KEY = "profile_misses"
+
+
+def normalize(name):
+    """'M.S.  Dhoni' -> 'ms dhoni'."""
+    name = re.sub(r"[.'’]", "", (name or "").lower())
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+
+class ProfileIndex:
+    """Name -> profile id map stored in `cache` under INDEX_KEY."""
+
+    def __init__(self, cache, ttl, miss_ttl=3600, max_misses=5000):
+        self.cache = cache
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_misses = max_misses
+        self._lock = threading.Lock()
+
+    def _load(self):
+        return self.cache.get(INDEX_KEY, self.ttl) or {}
+
+    def lookup(self, name):
+        """Profile id for `name`, or None."""
+        return self._load().get(normalize(name))
+
+    def learn(self, pairs):
+        """Record (name, profile_id) pairs.
+
+        Writes when something is new, or when the entry is half-way to
+        expiry so a stable index does not age out.
+        """
+        with self._lock:
+            index = self._load()
+            fresh = {normalize(name): str(pid) for name, pid in pairs
+                     if pid and normalize(name) and index.get(normalize(name)) != str(pid)}
+            stamp = self.cache.stamp(INDEX_KEY)
+            aging = stamp is None or time.time() - stamp > self.ttl / 2
+            if fresh or (aging and index):
+                index = dict(index)
+                index.update(fresh)
+                self.cache.set(INDEX_KEY, index)
+            return len(fresh)
+
+    def learn_rankings(self, blocks):
+        """Learn every player id linked from /rankings blocks."""
+        return self.learn((row.get('name'), row.get('profile_id'))
+                          for block in blocks for row in block.get('rank') or [])
+
+    def missed(self, name):
+        """True if a search for `name` found nothing within miss_ttl."""
+        misses = self.cache.get(MISSES_KEY, self.miss_ttl) or {}
+        return time.time() - misses.get(normalize(name), 0) < self.miss_ttl
+
+    def miss(self, name):
+        """Remember that a search for `name` found nothing."""
+        now = time.time()
+        with self._lock:
+            misses = {k: t for k, t in (self.cache.get(MISSES_KEY, self.miss_ttl) or {}).items()
+                      if now - t < self.miss_ttl}
+            misses[normalize(name)] = now
+            if len(misses) > self.max_misses:
+                misses = dict(sorted(misses.items(), key=lambda kv: kv[1])[-self.max_misses:])
+            self.cache.set(MISSES_KEY, misses)
+
+    def entries(self):
+        return dict(self._load())
+
+    def restore(self, entries):
+        """Put back entries saved with entries() (e.g. across a cache clear)."""
+        if entries:
+            self.cache.set(INDEX_KEY, entries)
+
+    def __len__(self):
+        return len(self._load())
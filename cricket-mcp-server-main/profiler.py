@@ -0,0 +1,144 @@
+"""
+Profiler — opt-in statistical stack sampling for request handlers.
+==================================================================
+A background thread wakes every `interval` seconds, reads the stacks of the
+threads currently serving watched requests (sys._current_frames) and counts
+them per request. Two things get watched:
+
+  - a random `sample_rate` fraction of requests; their stacks are added to
+    the "sampled" aggregate
+  - with `slow_ms` set, every request; stacks of those that end up slower
+    than `slow_ms` go to the "slow" aggregate (plus a short record each),
+    the rest are dropped
+
+Aggregates are exported in folded format ("root;caller;callee count" per
+line), which flamegraph.pl, speedscope and inferno read directly. Stacks are
+rooted at the route ("GET /live"), so network waits, BeautifulSoup parsing,
+the merge loop and serialization show up as separate towers.
+
+With sample_rate 0 and slow_ms 0 nothing is watched, no thread runs, and
+begin() is a single comparison.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+
+class _Watch:
+    __slots__ = ("root", "started", "sampled", "stacks")
+
+    def __init__(self, root, sampled):
+        self.root = root
+        self.started = time.perf_counter()
+        self.sampled = sampled
+        self.stacks = Counter()
+
+
+def _fold(frame, root):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.append(root)
+    return ";".join(reversed(names))
+
+
+class Profiler:
+    """Thread-safe sampler keyed by the OS thread serving each request."""
+
+    def __init__(self, sample_rate=0.0, slow_ms=0, interval=0.01, max_slow=50):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.interval = interval
+        self.enabled = sample_rate > 0 or slow_ms > 0
+        self._lock = threading.Lock()
+        self._active = {}          # thread id -> _Watch
+        self._thread = None
+        self.sampled = Counter()
+        self.slow = Counter()
+        self.slow_requests = deque(maxlen=max_slow)
+        self.ticks = 0
+        self.requests_sampled = 0
+
+    def begin(self, root):
+        """Start watching the current thread's request; returns a token or None."""
+        if not self.enabled:
+            return None
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled and self.slow_ms <= 0:
+            return None
+        watch = _Watch(root, sampled)
+        with self._lock:
+            self._active[threading.get_ident()] = watch
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+        return watch
+
+    def end(self, watch):
+        """Stop watching; keep the stacks if sampled or slow."""
+        if watch is None:
+            return
+        elapsed_ms = (time.perf_counter() - watch.started) * 1000
+        with self._lock:
+            if self._active.get(threading.get_ident()) is watch:
+                del self._active[threading.get_ident()]
+            if watch.sampled:
+                self.requests_sampled += 1
+                self.sampled.update(watch.stacks)
+            if self.slow_ms > 0 and elapsed_ms >= self.slow_ms:
+                self.slow.update(watch.stacks)
+                self.slow_requests.append({
+                    "route": watch.root,
+                    "ms": round(elapsed_ms, 1),
+                    "samples": sum(watch.stacks.values()),
+                    "top": [{"stack": s, "samples": n} for s, n in watch.stacks.most_common(3)],
+                    "at": time.time(),
+                })
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self._tick()
+
+    def _tick(self):
+        with self._lock:
+            if not self._active:
+                return
+            watching = list(self._active.items())
+        # Fold outside the lock; count under it, and only for watches still
+        # active, so end() never reads a Counter that is being written
+        frames = sys._current_frames()
+        folded = [(ident, watch, _fold(frames[ident], watch.root))
+                  for ident, watch in watching if ident in frames]
+        with self._lock:
+            for ident, watch, stack in folded:
+                if self._active.get(ident) is watch:
+                    watch.stacks[stack] += 1
+            self.ticks += 1
+
+    def folded(self, kind="sampled"):
+        """Aggregate as folded-stack text for flame graph tools."""
+        with self._lock:
+            counts = dict(self.slow if kind == "slow" else self.sampled)
+        return "".join(f"{stack} {n}\n" for stack, n in sorted(counts.items()))
+
+    def reset(self):
+        with self._lock:
+            self.sampled.clear()
+            self.slow.clear()
+            self.slow_requests.clear()
+            self.ticks = 0
+            self.requests_sampled = 0
+
+    def stats(self):
+        with self._lock:
+            return {"enabled": self.enabled, "sample_rate": self.sample_rate,
+                    "slow_ms": self.slow_ms, "watching": len(self._active),
+                    "ticks": self.ticks, "requests_sampled": self.requests_sampled,
+                    "slow_requests": len(self.slow_requests)}
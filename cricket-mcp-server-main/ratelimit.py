@@ -0,0 +1,84 @@
+"""
+Rate limiting & admission control — in-process, O(1) per request.
+=================================================================
+  - RateLimiter: token buckets keyed by (client, route), held in an LRU
+    bounded to `max_keys` entries so abusive key churn cannot grow memory.
+  - ConcurrencyGate: global cap on in-flight upstream work; callers that
+    cannot get a slot immediately get `Overloaded` (served as 503).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Overloaded(Exception):
+    """Raised when the upstream concurrency cap is reached."""
+
+
+class RateLimiter:
+    """Thread-safe token-bucket limiter with bounded key storage."""
+
+    def __init__(self, max_keys=10000):
+        self._buckets = OrderedDict()   # key -> [tokens, last_refill]
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+        self.rejected = 0
+
+    def allow(self, key, rate_per_min, burst):
+        """Take one token for `key`; returns (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        refill = rate_per_min / 60.0
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(burst), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * refill)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0
+            self.rejected += 1
+            return False, (1 - bucket[0]) / refill if refill else 60
+
+    def stats(self):
+        with self._lock:
+            return {"tracked_keys": len(self._buckets), "rejected": self.rejected}
+
+
+class ConcurrencyGate:
+    """Non-blocking semaphore around upstream-bound work."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._sem = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self):
+        if not self._sem.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise Overloaded("Upstream capacity exhausted, retry shortly")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._sem.release()
+
+    def stats(self):
+        with self._lock:
+            return {"limit": self.limit, "in_flight": self.in_flight,
+                    "rejected": self.rejected}
@@ -0,0 +1,140 @@
+"""
+Schedule Store — sorted in-memory index over transformed schedule records.
+=========================================================================
+Answers /schedule filters (team, format, series, date range, not yet
+started) and cursor pagination without scanning the whole list on every
+request.
+"""
+
+import bisect
+import threading
+
+
+class ScheduleStore:
+    """Thread-safe schedule index keyed by date, team, format and series."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._order = []      # sorted (date, id) keys
+        self._team = {}       # team (lower) -> set of ids
+        self._format = {}     # matchType (lower) -> set of ids
+        self._series = {}     # series_id -> set of ids
+        self._upcoming = set()  # ids with started == False
+        self.stamp = None     # cache timestamp of the data last loaded
+        self.sources = {}     # supplementary source -> stamp last merged
+
+    @staticmethod
+    def _key(record):
+        return (record.get('date') or '', record['id'])
+
+    def _index(self, record):
+        mid = record['id']
+        self._by_id[mid] = record
+        bisect.insort(self._order, self._key(record))
+        for team in record.get('teams') or []:
+            self._team.setdefault(team.lower(), set()).add(mid)
+        fmt = (record.get('matchType') or '').lower()
+        if fmt:
+            self._format.setdefault(fmt, set()).add(mid)
+        series = record.get('series_id')
+        if series:
+            self._series.setdefault(series, set()).add(mid)
+        if record.get('started') is False:
+            self._upcoming.add(mid)
+
+    def _unindex(self, mid):
+        record = self._by_id.pop(mid, None)
+        if record is None:
+            return
+        key = self._key(record)
+        pos = bisect.bisect_left(self._order, key)
+        if pos < len(self._order) and self._order[pos] == key:
+            del self._order[pos]
+        for team in record.get('teams') or []:
+            self._team.get(team.lower(), set()).discard(mid)
+        self._format.get((record.get('matchType') or '').lower(), set()).discard(mid)
+        self._series.get(record.get('series_id'), set()).discard(mid)
+        self._upcoming.discard(mid)
+
+    def load(self, records, stamp=None):
+        """Replace the whole index with `records`."""
+        with self._lock:
+            self._by_id.clear()
+            self._order = []
+            self._team.clear()
+            self._format.clear()
+            self._series.clear()
+            self._upcoming.clear()
+            for r in records:
+                if r.get('id'):
+                    self._index(r)
+            self.stamp = stamp
+            self.sources = {}
+
+    def merge(self, records, source=None, stamp=None):
+        """Upsert records by id, keeping the indexes sorted.
+
+        With `source`, `stamp` is remembered in `sources` until the next load().
+        """
+        with self._lock:
+            if source:
+                self.sources[source] = stamp
+            for r in records:
+                if not r.get('id'):
+                    continue
+                self._unindex(r['id'])
+                self._index(r)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def query(self, team=None, fmt=None, series=None, date_from=None,
+              date_to=None, limit=None, cursor=None, upcoming=False):
+        """Return (records, next_cursor) in date order.
+
+        `date_from`/`date_to` are inclusive ISO date prefixes (YYYY-MM-DD).
+        `cursor` is the opaque value returned as next_cursor by a prior call;
+        anything else raises ValueError.
+        `upcoming` keeps only matches that have not started.
+        """
+        with self._lock:
+            allowed = None
+            for postings, value in ((self._team, team and team.lower()),
+                                    (self._format, fmt and fmt.lower()),
+                                    (self._series, series)):
+                if not value:
+                    continue
+                ids = postings.get(value, set())
+                allowed = ids if allowed is None else allowed & ids
+                if not allowed:
+                    return [], None
+            if upcoming:
+                allowed = set(self._upcoming) if allowed is None else allowed & self._upcoming
+                if not allowed:
+                    return [], None
+
+            start = 0
+            if date_from:
+                start = bisect.bisect_left(self._order, (date_from, ''))
+            if cursor:
+                date, sep, mid = cursor.partition('|')
+                if not sep or not mid:
+                    raise ValueError("invalid cursor")
+                start = max(start, bisect.bisect_right(self._order, (date, mid)))
+            end = len(self._order)
+            if date_to:
+                end = bisect.bisect_left(self._order, (date_to + '\uffff', ''))
+
+            results = []
+            next_cursor = None
+            for i in range(start, end):
+                key = self._order[i]
+                if allowed is not None and key[1] not in allowed:
+                    continue
+                if limit is not None and len(results) >= limit:
+                    date, mid = self._key(results[-1])
+                    next_cursor = f"{date}|{mid}"
+                    break
+                results.append(self._by_id[key[1]])
+            return results, next_cursor
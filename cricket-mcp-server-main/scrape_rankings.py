@@ -1,32 +1,23 @@
 import json
-from scraper import get_icc_rankings
+from scraper import get_icc_rankings_page
 
 def generate_rankings_json():
     all_rankings = []
-    # Added teams to categories
     categories = {'batting': 'Batsmen', 'bowling': 'Bowlers', 'allrounder': 'All-Rounders', 'teams': 'Teams'} 
     formats = ['test', 'odi', 't20']
     
     print("Generating rankings snapshot...")
     
     for api_cat, display_cat in categories.items():
+        print(f"Fetching {display_cat}...")
+        # Fix: scraper.py expects 'all-rounder' not 'allrounder'
+        scrape_cat = 'all-rounder' if api_cat == 'allrounder' else api_cat
+
+        # One page fetch returns every format for the category
+        page = get_icc_rankings_page(scrape_cat)
+
         for fmt in formats:
-            print(f"Fetching {display_cat} - {fmt}...")
-            scrape_cat = 'all-rounder' if api_cat == 'allrounder' else api_cat
-            # Fix: scraper.py expects 'all-rounder' not 'allrounder'
-            
-            if api_cat == 'teams': 
-                scrape_cat = 'teams'
-            
-            # Formats for teams might be different? Scraper handles it?
-            # Scraper `get_icc_rankings` handles `teams` logic?
-            # Let's check scraper.py logic for teams. 
-            # In Step 1208 snippet: "if not player_links and category == 'teams': pass"
-            # It seems teams logic wasn't fully implemented in scraper.py?
-            # I will skip teams if it returns empty.
-            
-            data = get_icc_rankings(scrape_cat, fmt)
-            
+            data = page.get(fmt)
             if data:
                 all_rankings.append({
                     "type": display_cat,
@@ -1,200 +1,743 @@
-import requests
-from bs4 import BeautifulSoup
+import hashlib
+import os
 import re
-import time
-import json
+from datetime import datetime, timezone
+import threading
+from collections import OrderedDict
+
+import extract_rules
+from extract_rules import Rule, RuleChain
+
+# requests and bs4 are imported on first use (see _session/_soup) so that
+# importing this module stays cheap for the web process's cold start.
 
 # Use mimic headers to avoid basic bot detection
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+_session_obj = None
+_session_lock = threading.Lock()
+
+
+def _session():
+    """Pooled HTTP session shared by all scrapes, created on first use."""
+    global _session_obj
+    if _session_obj is None:
+        with _session_lock:
+            if _session_obj is None:
+                import requests
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                _session_obj = session
+    return _session_obj
+
+
+def _soup(content, parse_only=None):
+    """Parse `content`; `parse_only=(tag, attrs)` builds only matching subtrees."""
+    from bs4 import BeautifulSoup, SoupStrainer
+    strainer = SoupStrainer(*parse_only) if parse_only else None
+    return BeautifulSoup(content, "html.parser", parse_only=strainer)
+
+
+# =============================================================================
+# CHANGE DETECTION — skip re-parsing pages that did not change
+# =============================================================================
+# Per URL we remember the validators (ETag / Last-Modified), a hash of the body
+# and the parsed result. A 304, or a 200 whose body hashes the same, reuses the
+# previous parse instead of running BeautifulSoup again.
+#
+# The memo lives in this process unless use_shared_cache() was called (the
+# bridge does so when CACHE_PATH is set, worker.py in each pool child): then
+# memo entries and the fetch counters are kept in the shared cache, so every
+# web process and scrape process revalidates against the same memo.
+PAGE_MEMO_SIZE = 256
+PAGE_MEMO_TTL = int(os.environ.get('PAGE_MEMO_TTL', 7 * 86400))
+FETCH_STATS_KEY = "scraper_fetch_stats"
+_page_memo = OrderedDict()
+_memo_lock = threading.Lock()
+_fetch_stats = {"fetches": 0, "not_modified": 0, "unchanged": 0, "parsed": 0}
+_shared = None
+
+
+def use_shared_cache(cache):
+    """Keep the page memo, fetch counters and extraction telemetry in `cache`
+    (a SqliteCache or its path)."""
+    global _shared
+    if isinstance(cache, str):
+        from shared_cache import SqliteCache
+        cache = SqliteCache(cache)
+    _shared = cache
+    extract_rules.use_shared_cache(cache)
+
+
+def _memo_get(key):
+    if _shared is not None:
+        return _shared.get(f"page_memo:{key}", PAGE_MEMO_TTL)
+    with _memo_lock:
+        return _page_memo.get(key)
+
+
+def _memo_set(key, memo):
+    if _shared is not None:
+        _shared.set(f"page_memo:{key}", memo)
+        return
+    with _memo_lock:
+        _page_memo[key] = memo
+        _page_memo.move_to_end(key)
+        while len(_page_memo) > PAGE_MEMO_SIZE:
+            _page_memo.popitem(last=False)
+
+
+def _count(name):
+    if _shared is not None:
+        _shared.merge_counts(FETCH_STATS_KEY, {name: 1})
+        return
+    with _memo_lock:
+        _fetch_stats[name] += 1
+
+
+def _fetch_parsed(url, parse, parse_only=None, memo_key=None):
+    """GET `url` and return (parse(soup), status), reusing unchanged parses.
+
+    Callers that parse one URL several ways pass a distinct `memo_key`.
+    """
+    memo_key = memo_key or url
+    memo = _memo_get(memo_key)
+    _count("fetches")
+    headers = {}
+    if memo:
+        if memo["etag"]: headers['If-None-Match'] = memo["etag"]
+        if memo["last_modified"]: headers['If-Modified-Since'] = memo["last_modified"]
+
+    response = _session().get(url, headers=headers, timeout=10)
+    if response.status_code == 304 and memo:
+        _count("not_modified")
+        return memo["parsed"], 200
+    if response.status_code != 200:
+        return None, response.status_code
+
+    digest = hashlib.sha1(response.content).hexdigest()
+    if memo and memo["digest"] == digest:
+        _count("unchanged")
+        return memo["parsed"], 200
+
+    parsed = parse(_soup(response.content, parse_only))
+    _count("parsed")
+    _memo_set(memo_key, {
+        "etag": response.headers.get('ETag'),
+        "last_modified": response.headers.get('Last-Modified'),
+        "digest": digest,
+        "parsed": parsed,
+    })
+    return parsed, 200
+
+
+def fetch_stats():
+    """Counters for /health: how many parses the change detection skipped."""
+    if _shared is not None:
+        stats = dict.fromkeys(_fetch_stats, 0)
+        stats.update(_shared.get(FETCH_STATS_KEY, float('inf')) or {})
+        stats["memo"] = "shared"
+    else:
+        with _memo_lock:
+            stats = dict(_fetch_stats)
+            stats["memo_pages"] = len(_page_memo)
+    stats["parses_skipped"] = stats["not_modified"] + stats["unchanged"]
+    return stats
+
+
+# =============================================================================
+# LIVE SCORES — https://www.cricbuzz.com/cricket-match/live-scores
+# =============================================================================
+_LIVE_HREF = re.compile(r"/live-cricket-scores/(\d+)/")
+
+def _live_record(match_id, match_name, score_div):
+    status_text = ""
+    score_text = ""
+    if score_div:
+        raw_text = score_div.get_text(" ", strip=True) 
+        extracted = raw_text.split("•") 
+        if extracted:
+            status_text = extracted[-1].strip()
+            if len(extracted) > 1: score_text = extracted[0].strip()
+            else: score_text = raw_text
+
+    # Parse Teams from Name
+    # Name format: "India vs Pakistan, 1st Test"
+    team1, team2 = "Team 1", "Team 2"
+    try:
+        # Remove comma suffix (e.g. ", 1st Test")
+        clean_name = match_name.split(",")[0].strip()
+        if " vs " in clean_name:
+            t_parts = clean_name.split(" vs ")
+            team1 = t_parts[0].strip()
+            team2 = t_parts[1].strip()
+        elif " v " in clean_name:
+            t_parts = clean_name.split(" v ")
+            team1 = t_parts[0].strip()
+            team2 = t_parts[1].strip()
+    except: pass
+
+    return {
+        "id": match_id, 
+        "name": match_name, 
+        "status": status_text or "Live/Upcoming", 
+        "score": score_text, 
+        "team1": team1,
+        "team2": team2,
+        "source": "cricbuzz"
+    }
+
+def _live_from_cards(cards):
+    """One `cb-mtch-lst` card per match: header link plus score strip inside it."""
+    matches = []
+    seen_ids = set()
+    for card in cards:
+        try:
+            link = card.find("a", href=_LIVE_HREF)
+            if not link: continue
+            match_id = _LIVE_HREF.search(link.get("href")).group(1)
+            if match_id in seen_ids: continue
+            seen_ids.add(match_id)
+            score_div = card.find("div", class_="cb-scr-wll-chvrn")
+            matches.append(_live_record(match_id, link.text.strip(), score_div))
+        except: continue
+    return matches
+
+def _live_from_links(soup):
+    """Legacy heuristic: walk up from each score link to find its score strip."""
+    matches = []
+    seen_ids = set()
+    for link in soup.find_all("a", href=_LIVE_HREF):
+        try:
+            match_id = _LIVE_HREF.search(link.get("href")).group(1)
+            if match_id in seen_ids: continue
+            seen_ids.add(match_id)
+            match_item_container = link.parent.parent
+            score_div = match_item_container.find("div", class_="cb-scr-wll-chvrn")
+            if not score_div: score_div = match_item_container.find_next("div", class_="cb-scr-wll-chvrn")
+            matches.append(_live_record(match_id, link.text.strip(), score_div))
+        except: continue
+    return matches
+
+LIVE_RULES = RuleChain("live_matches", [
+    Rule("match-cards", _live_from_cards, "div.cb-mtch-lst"),
+    Rule("link-parent-walk", _live_from_links),
+])
+
 def get_cricbuzz_matches():
     try:
         url = "https://www.cricbuzz.com/cricket-match/live-scores"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        if response.status_code != 200: return []
-        soup = BeautifulSoup(response.content, "html.parser")
-        matches = []
-        match_links = soup.find_all("a", href=lambda href: href and "/live-cricket-scores/" in href)
-        seen_ids = set()
-        for link in match_links:
-            try:
-                href = link.get("href")
-                match_match = re.search(r"/live-cricket-scores/(\d+)/", href)
-                if not match_match: continue
-                match_id = match_match.group(1)
-                if match_id in seen_ids: continue
-                seen_ids.add(match_id)
-                match_name = link.text.strip()
-                status_text = ""
-                score_text = ""
-                header_container = link.parent
-                match_item_container = header_container.parent
-                score_div = match_item_container.find("div", class_="cb-scr-wll-chvrn")
-                if not score_div: score_div = match_item_container.find_next("div", class_="cb-scr-wll-chvrn")
-                if score_div:
-                    raw_text = score_div.get_text(" ", strip=True) 
-                    extracted = raw_text.split("•") 
-                    if extracted:
-                        status_text = extracted[-1].strip()
-                        if len(extracted) > 1: score_text = extracted[0].strip()
-                        else: score_text = raw_text
-                
-                # Parse Teams from Name
-                # Name format: "India vs Pakistan, 1st Test"
-                team1, team2 = "Team 1", "Team 2"
-                try:
-                    # Remove comma suffix (e.g. ", 1st Test")
-                    clean_name = match_name.split(",")[0].strip()
-                    if " vs " in clean_name:
-                        t_parts = clean_name.split(" vs ")
-                        team1 = t_parts[0].strip()
-                        team2 = t_parts[1].strip()
-                    elif " v " in clean_name:
-                        t_parts = clean_name.split(" v ")
-                        team1 = t_parts[0].strip()
-                        team2 = t_parts[1].strip()
-                except: pass
-
-                matches.append({
-                    "id": match_id, 
-                    "name": match_name, 
-                    "status": status_text or "Live/Upcoming", 
-                    "score": score_text, 
-                    "team1": team1,
-                    "team2": team2,
-                    "source": "cricbuzz"
-                })
-            except: continue
-        return matches
+        matches, status = _fetch_parsed(url, LIVE_RULES.run)
+        if status != 200: return []
+        return list(matches)  # callers prepend to this list
     except: return []
 
+# =============================================================================
+# COMMENTARY — https://www.cricbuzz.com/live-cricket-scores/<id>/commentary
+# =============================================================================
+def _commentary_lines(elements):
+    commentary_lines = []
+    for el in elements:
+        text = el.get_text(strip=True)
+        if text: commentary_lines.append(text)
+    return commentary_lines[:25]
+
+COMMENTARY_RULES = RuleChain("commentary", [
+    Rule("com-ln-paragraphs", _commentary_lines, "p.cb-com-ln"),
+    Rule("com-ln-in-columns", _commentary_lines, ".cb-col.cb-col-100 .cb-com-ln"),
+    Rule("com-ln-any", _commentary_lines, ".cb-com-ln"),
+])
+
 def get_commentary(match_id):
     try:
         url = f"https://www.cricbuzz.com/live-cricket-scores/{match_id}/commentary"
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        if response.status_code != 200: return [f"Could not load commentary (Status {response.status_code})"]
-        soup = BeautifulSoup(response.content, "html.parser")
-        commentary_lines = []
-        comm_elements = soup.find_all("p", class_="cb-com-ln")
-        if not comm_elements: comm_elements = soup.select(".cb-col.cb-col-100 .cb-com-ln")
-        for el in comm_elements:
-            text = el.get_text(strip=True)
-            if text: commentary_lines.append(text)
-        return commentary_lines[:25]
+        lines, status = _fetch_parsed(url, COMMENTARY_RULES.run)
+        if status != 200: return [f"Could not load commentary (Status {status})"]
+        return list(lines)
     except Exception as e: return [f"Could not load commentary: {str(e)}"]
 
-def get_icc_rankings(category, format_type):
+# =============================================================================
+# ICC RANKINGS — https://www.cricbuzz.com/cricket-stats/icc-rankings/men/<cat>
+# =============================================================================
+# Format tabs are sections toggled by ng-show="'tests' == act_rank_format"
+_RANK_FORMATS = {'tests': 'test', 'odis': 'odi', 't20s': 't20'}
+_PROFILE_HREF = re.compile(r"/profiles/(\d+)/")
+
+def _profile_id(link):
+    match = _PROFILE_HREF.search(link.get("href", ""))
+    return match.group(1) if match else None
+
+def _rank_row(row, fmt):
+    """Rank, name, country and rating from one `cb-lst-itm` ranking row."""
+    cells = row.select(".cb-rank-tbl")
+    link = row.find("a", href=_PROFILE_HREF)
+    if not cells or not link: return None
+    rank = cells[0].get_text(strip=True)
+    if not rank.isdigit(): return None
+    country = row.select_one(".cb-font-12.text-gray")
+    return {
+        "rank": rank,
+        "name": link.get_text(strip=True),
+        "rating": cells[-1].get_text(strip=True) if len(cells) > 1 else "",
+        "country": country.get_text(strip=True).title() if country else "",
+        "trend": "flat",
+        "format": fmt,
+        "profile_id": _profile_id(link),
+    }
+
+def _rankings_from_sections(sections):
+    rankings = []
+    for section in sections:
+        toggle = section.get("ng-show", "")
+        fmt = next((f for key, f in _RANK_FORMATS.items() if f"'{key}'" in toggle), None)
+        if not fmt: continue
+        for row in section.select("div.cb-lst-itm"):
+            record = _rank_row(row, fmt)
+            if record: rankings.append(record)
+    return rankings
+
+def _rankings_from_rows(rows):
+    return [r for r in (_rank_row(row, None) for row in rows) if r]
+
+def _rankings_from_links(soup):
+    """Legacy heuristic: climb from each profile link to a row starting with a rank."""
+    rankings = []
+
+    # Strategy: Find all player links.
+    player_links = soup.find_all('a', href=_PROFILE_HREF)
+
+    for link in player_links:
+        try:
+            # Use get_text with separator to see boundaries
+            full_text = link.get_text("|", strip=True) # "Joe Root|England"
+            parts = full_text.split("|")
+            
+            name = parts[0].strip()
+            if not name: continue
+            
+            # Heuristic: The row text usually starts with a digit (Rank)
+            # We check the parent chain for a "Row" candidate.
+            row_candidate = None
+            curr = link.parent
+            for _ in range(3):
+                if not curr: break
+                txt = curr.get_text(" ", strip=True)
+                # aggressive check: does it start with digit?
+                if txt and txt[0].isdigit():
+                    row_candidate = curr
+                    # Usually the row is the first container that has Rank + Name + Rating
+                    # Rating is usually 3-4 digits at end.
+                    if re.search(r"\d{3,4}$", txt):
+                         break
+                curr = curr.parent
+            
+            if row_candidate:
+                 row_text = row_candidate.get_text(" ", strip=True)
+                 parts = row_text.split()
+                 if len(parts) >= 3:
+                     rank = parts[0]
+                     rating = parts[-1]
+                     # Filter out if rank is not digit (header?)
+                     if not rank.isdigit(): continue
+                     
+                     rankings.append({
+                        "rank": rank,
+                        "name": name,
+                        "rating": rating,
+                        "country": "", 
+                        "trend": "flat",
+                        "format": None,
+                        "profile_id": _profile_id(link),
+                     })
+        except:
+            continue
+    return rankings
+
+def _team_row(row, fmt):
+    """Position, team, rating and points from one team ranking row."""
+    cells = [c.get_text(" ", strip=True) for c in row.find_all("div", recursive=False)]
+    cells = [c for c in cells if c]
+    if len(cells) < 3 or not cells[0].isdigit() or cells[1].isdigit(): return None
+    return {
+        "rank": cells[0],
+        "name": cells[1],
+        "rating": cells[2],
+        "points": cells[3] if len(cells) > 3 else "",
+        "country": cells[1],
+        "trend": "flat",
+        "format": fmt,
+    }
+
+def _team_rankings_from_sections(sections):
+    rankings = []
+    for section in sections:
+        toggle = section.get("ng-show", "")
+        fmt = next((f for key, f in _RANK_FORMATS.items() if f"'{key}'" in toggle), None)
+        if not fmt: continue
+        for row in section.select("div.cb-brdr-thin-btm, div.cb-lst-itm"):
+            record = _team_row(row, fmt)
+            if record: rankings.append(record)
+    return rankings
+
+def _team_rankings_from_rows(rows):
+    return [r for r in (_team_row(row, None) for row in rows) if r]
+
+RANKING_RULES = RuleChain("rankings", [
+    Rule("format-sections", _rankings_from_sections, 'div[ng-show*="act_rank_format"]'),
+    Rule("rank-rows", _rankings_from_rows, "div.cb-lst-itm.text-center"),
+    Rule("profile-link-walk", _rankings_from_links),
+])
+
+TEAM_RANKING_RULES = RuleChain("team_rankings", [
+    Rule("format-sections", _team_rankings_from_sections, 'div[ng-show*="act_rank_format"]'),
+    Rule("table-rows", _team_rankings_from_rows, "div.cb-brdr-thin-btm.text-center"),
+])
+
+RANKING_FORMATS = ('test', 'odi', 't20')
+
+def _split_formats(rankings):
+    """{format: rows} from one page's rows, dropping the internal format tag."""
+    def clean(rows):
+        return [{k: v for k, v in r.items() if k != "format"} for r in rows]
+
+    # Rows tagged with their format tab need no guessing
+    if any(r["format"] for r in rankings):
+        return {fmt: clean([r for r in rankings if r["format"] == fmt]) for fmt in RANKING_FORMATS}
+
+    # Slicing Logic: untagged rows are assumed to be Test, ODI, T20 in thirds
+    rankings = clean(rankings)
+    section = len(rankings) // 3
+    if section == 0:
+        return {fmt: rankings[:10] for fmt in RANKING_FORMATS}
+    return {
+        'test': rankings[:section],
+        'odi': rankings[section:section * 2],
+        't20': rankings[section * 2:],
+    }
+
+def get_icc_rankings_page(category):
+    """All three formats of one rankings category from a single page fetch."""
     try:
         cat_map = {'batting':'batting', 'bowling':'bowling', 'all-rounder':'all-rounder', 'teams':'teams'}
         url_cat = cat_map.get(category, 'batting')
         url = f"https://www.cricbuzz.com/cricket-stats/icc-rankings/men/{url_cat}"
-        
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        if response.status_code != 200: return []
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        rankings = []
-        
-        # Strategy: Find all player links.
-        player_links = soup.find_all('a', href=re.compile(r"/profiles/\d+/"))
-        
-        if not player_links and category == 'teams':
-            # Teams logic: Look for divs with country names?
-            # Or table structure.
-            # Teams usually have 'cb-rank-tbl' or similar?
-            # Let's try to find numeric ranks.
-            pass
-
-        for link in player_links:
-            try:
-                # Debug HTML structure
-                # print(f"Link HTML: {link}") 
-                
-                # Attempt to split name and country
-                # Typically country is in a separate span or div if inside anchor?
-                # Or maybe it's just text?
-                
-                # Use get_text with separator to see boundaries
-                full_text = link.get_text("|", strip=True) # "Joe Root|England"
-                parts = full_text.split("|")
-                
-                name = parts[0].strip()
-                country = ""
-                if len(parts) > 1:
-                    country = parts[1].strip()
-                
-                # Fallback if no separator found (just text)
-                if not country and name:
-                     # Check if country is in name? No, risky.
-                     pass
-                
-                if not name: continue
-                
-                # Navigate to Row
-                # Usually Link -> Div -> Div (Row)
-                # Level 1 Parent (Cell) -> Level 2 Parent (Row)
-                
-                # Heuristic: The row text usually starts with a digit (Rank)
-                # We check the parent chain for a "Row" candidate.
-                
-                row_candidate = None
-                curr = link.parent
-                for _ in range(3):
-                    if not curr: break
-                    txt = curr.get_text(" ", strip=True)
-                    # aggressive check: does it start with digit?
-                    if txt and txt[0].isdigit():
-                        row_candidate = curr
-                        # Don't break immediately, higher up might be better?
-                        # Usually the row is the first container that has Rank + Name + Rating
-                        # Check if "Rating" is present? Rating is usually 3-4 digits at end.
-                        if re.search(r"\d{3,4}$", txt):
-                             break
-                    curr = curr.parent
-                
-                if row_candidate:
-                     row_text = row_candidate.get_text(" ", strip=True)
-                     parts = row_text.split()
-                     if len(parts) >= 3:
-                         rank = parts[0]
-                         rating = parts[-1]
-                         # Filter out if rank is not digit (header?)
-                         if not rank.isdigit(): continue
-                         
-                         rankings.append({
-                            "rank": rank,
-                            "name": name,
-                            "rating": rating,
-                            "country": "", 
-                            "trend": "flat"
-                         })
-            except:
+
+        rules = TEAM_RANKING_RULES if url_cat == 'teams' else RANKING_RULES
+        rankings, status = _fetch_parsed(url, rules.run)
+        if status != 200: return {}
+        return _split_formats(rankings)
+
+    except Exception as e:
+        print(f"Scraper Error: {e}")
+        return {}
+
+def get_icc_rankings(category, format_type):
+    return get_icc_rankings_page(category).get(format_type.lower(), [])
+
+# =============================================================================
+# UPCOMING SCHEDULE — https://www.cricbuzz.com/cricket-schedule/upcoming-series/<kind>
+# =============================================================================
+# Only the day containers are built (SoupStrainer); headers, ads and scripts
+# around them are skipped by the parser entirely.
+SCHEDULE_PARSE_ONLY = ("div", {"class": "cb-col-100 cb-col"})
+_SCORE_HREF = re.compile(r"/(?:live-)?cricket-scores/(\d+)/")
+_SERIES_HREF = re.compile(r"/cricket-series/(\d+)/")
+
+def _match_type(name):
+    lowered = name.lower()
+    for fmt in ("test", "odi", "t20"):
+        if fmt in lowered: return fmt
+    return ""
+
+def _schedule_date(day_text, timestamp):
+    """ISO start time from the ms `timestamp` attribute, else the day heading."""
+    if timestamp and timestamp.isdigit():
+        start = datetime.fromtimestamp(int(timestamp) / 1000, timezone.utc)
+        return start.strftime("%Y-%m-%dT%H:%M:%S")
+    try:
+        return datetime.strptime(day_text.strip().title(), "%a, %b %d %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return ""
+
+def _schedule_record(link, day_text):
+    match = _SCORE_HREF.search(link.get("href", ""))
+    if not match: return None
+    name = link.get("title") or link.get_text(" ", strip=True)
+    if not name: return None
+
+    row = link.find_parent("div")
+    venue = row.find("div", class_="text-gray") if row else None
+    block = link.find_parent("div", class_="cb-col-100")
+    series = block.find("a", href=_SERIES_HREF) if block else None
+    # Only the match's own block: a row without a time must not take the next row's
+    scope = block or row
+    start = scope.find("span", attrs={"timestamp": True}) if scope else None
+
+    clean_name = name.split(",")[0]
+    teams = [t.strip() for t in re.split(r"\s+vs?\s+", clean_name) if t.strip()]
+    return {
+        "id": f"cb-{match.group(1)}",
+        "name": name,
+        "venue": venue.get_text(" ", strip=True).removeprefix("at ").strip() if venue else "TBA",
+        "date": _schedule_date(day_text, start.get("timestamp") if start else None),
+        "matchType": _match_type(name),
+        "status": "Upcoming",
+        "teams": teams[:2],
+        "series_id": "",
+        "series": series.get_text(" ", strip=True) if series else "",
+        "started": False,
+        "cricbuzz_id": match.group(1),
+        "source": "cricbuzz",
+    }
+
+def _schedule_from_days(strips):
+    """Each date strip heads the match rows that follow it until the next strip."""
+    records = []
+    for strip in strips:
+        day_text = strip.get_text(strip=True)
+        for sibling in strip.find_next_siblings():
+            if "cb-lv-grn-strip" in (sibling.get("class") or []): break
+            for link in sibling.find_all("a", href=_SCORE_HREF):
+                record = _schedule_record(link, day_text)
+                if record: records.append(record)
+    return records
+
+def _schedule_from_links(soup):
+    """Fallback: every scorecard link, dated by its timestamp or nearest strip."""
+    records = []
+    for link in soup.find_all("a", href=_SCORE_HREF):
+        strip = link.find_previous("div", class_="cb-lv-grn-strip")
+        record = _schedule_record(link, strip.get_text(strip=True) if strip else "")
+        if record: records.append(record)
+    return records
+
+SCHEDULE_RULES = RuleChain("upcoming_schedule", [
+    Rule("day-strips", _schedule_from_days, "div.cb-lv-grn-strip"),
+    Rule("match-links", _schedule_from_links),
+])
+
+def get_upcoming_schedule(kind="international"):
+    """Structured upcoming fixtures from Cricbuzz, deduplicated by match id."""
+    try:
+        url = f"https://www.cricbuzz.com/cricket-schedule/upcoming-series/{kind}"
+        records, status = _fetch_parsed(url, SCHEDULE_RULES.run, SCHEDULE_PARSE_ONLY)
+        if status != 200: return []
+        return list({r["id"]: r for r in records}.values())
+    except Exception as e:
+        print(f"Scraper Error: {e}")
+        return []
+
+
+# =============================================================================
+# SCORECARD — https://www.cricbuzz.com/live-cricket-scorecard/<id>/<slug>
+# =============================================================================
+# Innings live in div#innings_<n>. Callers pass how many innings they already
+# hold as final; only later innings are built by the parser at all.
+_INNINGS_ID = re.compile(r"^innings_(\d+)$")
+
+def _innings_after(skip):
+    def wanted(value):
+        match = _INNINGS_ID.match(value or "")
+        return bool(match) and int(match.group(1)) > skip
+    return ("div", {"id": wanted})
+
+def _row_cells(row):
+    return [c.get_text(" ", strip=True) for c in row.find_all("div", recursive=False)]
+
+def _innings_from_divs(divs):
+    innings = []
+    for div in divs:
+        number = int(_INNINGS_ID.match(div.get("id")).group(1))
+        header = div.select_one("div.cb-scrd-hdr-rw")
+        cells = [c.get_text(" ", strip=True) for c in header.find_all(recursive=False)] if header else []
+        batting, bowling, extras = [], [], ""
+        for row in div.select("div.cb-scrd-itms"):
+            cols = _row_cells(row)
+            if not cols: continue
+            if cols[0].lower().startswith("extras"):
+                extras = " ".join(cols[1:])
+            elif row.find("a", href=_PROFILE_HREF) is None:
                 continue
-                
-        # Slicing Logic
-        total = len(rankings)
-        if total > 0:
-            section = total // 3
-            start = 0
-            end = total
-            if format_type.lower() == 'test': end = section
-            elif format_type.lower() == 'odi': start = section; end = section * 2
-            elif format_type.lower() == 't20': start = section * 2
-            
-            # Bound checks
-            if start >= total: start = 0; end = 0
-            if end > total: end = total
-            
-            return rankings[start:end]
-            
-        return rankings[:10]
+            elif len(cols) == 7:    # batter, dismissal, R, B, 4s, 6s, SR
+                batting.append({"name": row.find("a").get_text(strip=True), "dismissal": cols[1],
+                                "r": cols[2], "b": cols[3], "4s": cols[4], "6s": cols[5], "sr": cols[6]})
+            elif len(cols) >= 8:    # bowler, O, M, R, W, NB, WD, ECO
+                bowling.append({"name": cols[0], "o": cols[1], "m": cols[2], "r": cols[3],
+                                "w": cols[4], "nb": cols[5], "wd": cols[6], "eco": cols[7]})
+        innings.append({
+            "number": number,
+            "title": cells[0] if cells else f"Innings {number}",
+            "score": cells[1] if len(cells) > 1 else "",
+            "batting": batting,
+            "bowling": bowling,
+            "extras": extras,
+        })
+    return sorted(innings, key=lambda i: i["number"])
+
+SCORECARD_RULES = RuleChain("scorecard", [
+    Rule("innings-blocks", _innings_from_divs, "div[id^=innings_]"),
+])
 
+def get_scorecard(match_id, skip=0):
+    """Innings of a Cricbuzz scorecard after the first `skip` ([] if unavailable)."""
+    try:
+        url = f"https://www.cricbuzz.com/live-cricket-scorecard/{match_id}/scorecard"
+        innings, status = _fetch_parsed(url, SCORECARD_RULES.run, _innings_after(skip),
+                                        memo_key=f"{url}#after-{skip}")
+        if status != 200: return []
+        return list(innings or [])
     except Exception as e:
         print(f"Scraper Error: {e}")
         return []
 
+
+# The result line sits outside the innings blocks. It is only scraped for ids
+# the /live feed does not carry; their status comes from there otherwise.
+def _div_with_class(name):
+    # The strainer may see the raw attribute string, so a plain value would
+    # have to equal the whole multi-class attribute
+    def wanted(value):
+        return name in (value.split() if isinstance(value, str) else value or [])
+    return ("div", {"class": wanted})
+
+SCORECARD_STATUS_PARSE_ONLY = _div_with_class("cb-scrcrd-status")
+
+def _status_line(divs):
+    return divs[0].get_text(" ", strip=True)
+
+SCORECARD_STATUS_RULES = RuleChain("scorecard_status", [
+    Rule("status-line", _status_line, "div.cb-scrcrd-status"),
+])
+
+def get_scorecard_status(match_id):
+    """Status or result line of a Cricbuzz scorecard ("" if unavailable)."""
+    try:
+        url = f"https://www.cricbuzz.com/live-cricket-scorecard/{match_id}/scorecard"
+        status, code = _fetch_parsed(url, SCORECARD_STATUS_RULES.run, SCORECARD_STATUS_PARSE_ONLY,
+                                     memo_key=f"{url}#status")
+        if code != 200: return ""
+        return status or ""
+    except Exception as e:
+        print(f"Scraper Error: {e}")
+        return ""
+
+def get_scorecard_and_status(match_id, skip=0, status=True):
+    """(get_scorecard(), get_scorecard_status() or "" unless `status`) as one job."""
+    return get_scorecard(match_id, skip), get_scorecard_status(match_id) if status else ""
+
+
+# =============================================================================
+# PLAYER PROFILES — https://www.cricbuzz.com/profiles/<id>/<slug>
+# =============================================================================
+def _cells(row):
+    return [td.get_text(strip=True) for td in row.find_all("td")]
+
+def _col(cols, i):
+    return cols[i] if i < len(cols) else ""
+
+def _profile_from_page(soup):
+    profile = soup.find("div", id="playerProfile")
+    if not profile: return {}
+    pc = profile.find("div", class_="cb-col cb-col-100 cb-bg-white") or profile
+
+    name = pc.find("h1", class_="cb-font-40")
+    if not name: return {}
+    country = pc.find("h3", class_="cb-font-18 text-gray")
+    image = pc.find("img")
+
+    personal = soup.find_all("div", class_="cb-col cb-col-60 cb-lst-itm-sm")
+    role = personal[2].get_text(strip=True) if len(personal) > 2 else "Unknown"
+
+    # ICC ranks: Test/ODI/T20 batting, then Test/ODI/T20 bowling
+    icc = [d.get_text(strip=True) for d in soup.find_all("div", class_="cb-col cb-col-25 cb-plyr-rank text-right")]
+    icc += ["--"] * (6 - len(icc))
+    formats = ("test", "odi", "t20")
+
+    batting_stats, bowling_stats = {}, {}
+    tables = soup.find_all("div", class_="cb-plyr-tbl")
+    if tables and tables[0].find("tbody"):
+        for row in tables[0].find("tbody").find_all("tr"):
+            cols = _cells(row)
+            if not cols: continue
+            batting_stats[cols[0].lower()] = {
+                "matches": _col(cols, 1), "runs": _col(cols, 3),
+                "highest_score": _col(cols, 5), "average": _col(cols, 6),
+                "strike_rate": _col(cols, 7), "hundreds": _col(cols, 12),
+                "fifties": _col(cols, 11),
+            }
+    if len(tables) > 1 and tables[1].find("tbody"):
+        for row in tables[1].find("tbody").find_all("tr"):
+            cols = _cells(row)
+            if not cols: continue
+            bowling_stats[cols[0].lower()] = {
+                "balls": _col(cols, 3), "runs": _col(cols, 4),
+                "wickets": _col(cols, 5), "best_bowling_innings": _col(cols, 9),
+                "economy": _col(cols, 7), "five_wickets": _col(cols, 11),
+            }
+
+    return {
+        "name": name.get_text(strip=True),
+        "country": country.get_text(strip=True) if country else "",
+        "image": image.get("src") if image else None,
+        "role": role,
+        "rankings": {
+            "batting": dict(zip(formats, icc[:3])),
+            "bowling": dict(zip(formats, icc[3:6])),
+        },
+        "batting_stats": batting_stats,
+        "bowling_stats": bowling_stats,
+        "source": "cricbuzz",
+    }
+
+PROFILE_RULES = RuleChain("player_profile", [
+    Rule("profile-page", _profile_from_page),
+])
+
+def profile_url(profile_id, player_name=""):
+    """Profile page URL for a Cricbuzz player id (the slug is cosmetic)."""
+    slug = re.sub(r"[^a-z0-9]+", "-", player_name.lower()).strip("-") or "player"
+    return f"https://www.cricbuzz.com/profiles/{profile_id}/{slug}"
+
+def find_profile_url(player_name):
+    """Cricbuzz profile URL for a player via web search (googlesearch is optional)."""
+    try:
+        from googlesearch import search  # optional: pip install googlesearch-python
+    except ImportError:
+        return None
+    try:
+        for link in search(f"{player_name} cricbuzz", num_results=5):
+            if "cricbuzz.com/profiles/" in link:
+                return link
+    except Exception as e:
+        print(f"Profile search failed: {e}")
+    return None
+
+def profile_id_from_url(url):
+    """Cricbuzz player id in a profile URL (None if it is not one)."""
+    match = _PROFILE_HREF.search(url or "")
+    return match.group(1) if match else None
+
+def get_player_profile(url):
+    """Parsed Cricbuzz profile page ({} when unavailable)."""
+    try:
+        profile, status = _fetch_parsed(url, PROFILE_RULES.run)
+        if status != 200: return {}
+        return dict(profile) if profile else {}
+    except Exception as e:
+        print(f"Scraper Error: {e}")
+        return {}
+
+def get_profile_by_name(player_name, profile_id=None):
+    """(profile id, url, profile) for a player, searching for the id when not given."""
+    if not profile_id:
+        profile_id = profile_id_from_url(find_profile_url(player_name))
+        if not profile_id: return None, None, {}
+    url = profile_url(profile_id, player_name)
+    return profile_id, url, get_player_profile(url)
+
+
 if __name__ == "__main__":
     print("Testing extraction...")
     r = get_icc_rankings('batting', 'test')
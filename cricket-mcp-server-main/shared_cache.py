@@ -0,0 +1,122 @@
+"""
+Shared Cache — SQLite-backed TTL cache visible to every process on the host.
+=============================================================================
+Drop-in replacement for bridge_server.Cache (get/set/stamp/claim/clear/stats),
+selected with CACHE_PATH, plus merge_counts for counters shared by processes. Gunicorn workers, the scrape worker (worker.py)
+and the MCP server all read and write the same file.
+
+Values are stored as JSON. Each process keeps the last decoded value per key
+together with its timestamp, so a read whose row has not changed costs one
+indexed lookup and no JSON decoding.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SqliteCache:
+    """Process-safe TTL cache stored in a SQLite file (WAL mode)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._decoded = {}              # key -> (timestamp, data)
+        self._lock = threading.Lock()
+        conn = self._conn()
+        conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                     "key TEXT PRIMARY KEY, timestamp REAL NOT NULL, data TEXT NOT NULL)")
+        conn.commit()
+
+    def _conn(self):
+        # Connections do not survive fork(); pool children open their own
+        if self._local.__dict__.get('pid') != os.getpid():
+            self._local.conn = None
+            self._local.pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, ttl_seconds=120):
+        conn = self._conn()
+        row = conn.execute("SELECT timestamp FROM cache WHERE key = ?", (key,)).fetchone()
+        if not row or time.time() - row[0] >= ttl_seconds:
+            return None
+        with self._lock:
+            memo = self._decoded.get(key)
+        if memo and memo[0] == row[0]:
+            return memo[1]
+        row = conn.execute("SELECT timestamp, data FROM cache WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        data = json.loads(row[1])
+        with self._lock:
+            self._decoded[key] = (row[0], data)
+        return data
+
+    def set(self, key, data):
+        timestamp = time.time()
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO cache (key, timestamp, data) VALUES (?, ?, ?)",
+                     (key, timestamp, json.dumps(data)))
+        conn.commit()
+        with self._lock:
+            self._decoded[key] = (timestamp, data)
+
+    def stamp(self, key):
+        """Timestamp of the current entry for `key` (None if absent)."""
+        row = self._conn().execute("SELECT timestamp FROM cache WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def claim(self, key, ttl_seconds):
+        """Atomically stamp `key` unless another process did within `ttl_seconds`."""
+        now = time.time()
+        conn = self._conn()
+        cur = conn.execute("INSERT INTO cache (key, timestamp, data) VALUES (?, ?, 'true') "
+                           "ON CONFLICT(key) DO UPDATE SET timestamp = excluded.timestamp "
+                           "WHERE cache.timestamp <= ?", (key, now, now - ttl_seconds))
+        conn.commit()
+        return cur.rowcount == 1
+
+    def merge_counts(self, key, counts, peaks=None, values=None):
+        """Atomically add `counts` to the dict at `key`, raise its `peaks`, set `values`.
+
+        Used for counters every process contributes to (fetch and extraction
+        stats), which a plain get/set would lose under concurrent writers.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM cache WHERE key = ?", (key,)).fetchone()
+            data = json.loads(row[0]) if row else {}
+            for name, n in counts.items():
+                data[name] = data.get(name, 0) + n
+            for name, v in (peaks or {}).items():
+                data[name] = max(data.get(name, v), v)
+            data.update(values or {})
+            conn.execute("INSERT OR REPLACE INTO cache (key, timestamp, data) VALUES (?, ?, ?)",
+                         (key, time.time(), json.dumps(data)))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM cache")
+        conn.commit()
+        with self._lock:
+            self._decoded.clear()
+
+    def stats(self):
+        conn = self._conn()
+        total = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        active = conn.execute("SELECT COUNT(*) FROM cache WHERE timestamp > ?",
+                              (time.time() - 86400,)).fetchone()[0]
+        return {"total_keys": total, "active_keys": active, "backend": "sqlite"}
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('PRIME_INTERVAL', '0')
+os.environ.pop('CACHE_PATH', None)
+
+import bridge_server  # noqa: E402
+from ratelimit import RateLimiter  # noqa: E402
+
+
+@pytest.fixture
+def bs(monkeypatch):
+    """bridge_server with an empty cache and fresh rate limits."""
+    bridge_server.cache.clear()
+    bridge_server.response_variants.clear()
+    monkeypatch.setattr(bridge_server, 'rate_limiter', RateLimiter())
+    return bridge_server
+
+
+@pytest.fixture
+def client(bs):
+    return bs.app.test_client()
@@ -0,0 +1,30 @@
+def test_rate_limit_ignores_forged_forwarded_for(bs, client):
+    statuses = []
+    for i in range(4):
+        res = client.post('/cache/clear', environ_base={'REMOTE_ADDR': '10.0.0.1'},
+                          headers={'X-Forwarded-For': f'1.2.3.{i}, 203.0.113.7'})
+        statuses.append(res.status_code)
+    assert statuses[2:] == [429, 429]
+
+
+def test_clients_behind_router_get_separate_buckets(bs, client):
+    for i in range(3):
+        res = client.post('/cache/clear', environ_base={'REMOTE_ADDR': '10.0.0.1'},
+                          headers={'X-Forwarded-For': f'203.0.113.{i}'})
+        assert res.status_code != 429
+
+
+def test_admin_routes_disabled_without_token(bs, client, monkeypatch):
+    monkeypatch.setattr(bs, 'ADMIN_TOKEN', '')
+    assert client.post('/cache/clear').status_code == 403
+    assert client.get('/debug/profile').status_code == 403
+    assert client.get('/debug/slow').status_code == 403
+
+
+def test_admin_routes_require_matching_token(bs, client, monkeypatch):
+    monkeypatch.setattr(bs, 'ADMIN_TOKEN', 'secret')
+    for i, (token, expected) in enumerate([(None, 401), ('nope', 401), ('secret', 200)]):
+        headers = {'X-Admin-Token': token} if token else {}
+        res = client.post('/cache/clear', headers=headers,
+                          environ_base={'REMOTE_ADDR': f'10.0.0.{i}'})
+        assert res.status_code == expected
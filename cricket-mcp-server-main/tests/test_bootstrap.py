@@ -0,0 +1,50 @@
+import pytest
+
+from live_state import LiveState
+
+MATCH = {"id": "a", "name": "Kenya vs Oman", "matchStarted": True, "matchEnded": False,
+         "teams": ["Kenya", "Oman"], "score": []}
+NEWS = [{"title": "Toss delayed"}]
+
+
+@pytest.fixture
+def seeded(bs, monkeypatch):
+    """Every /bootstrap source cached, nothing fetched upstream."""
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    monkeypatch.setattr(bs, 'live_state', LiveState())
+    monkeypatch.setattr(bs, '_bootstrap', {"stamps": None, "document": None, "etag": None})
+    bs.cache.set("live_matches", [MATCH])
+    bs.cache.set("scraped_live", [])
+    bs.cache.set("schedule", [])
+    bs.cache.set("schedule_complete", True)
+    bs.cache.set("rankings_all", [])
+    bs.cache.set("news", NEWS)
+    return bs
+
+
+def test_cold_client_etag_matches_next_request(seeded, client):
+    first = client.get('/bootstrap')
+    assert first.status_code == 200
+    again = client.get('/bootstrap', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.headers['ETag'] == first.headers['ETag']
+
+
+def test_rewrite_with_same_content_keeps_etag(seeded, client):
+    etag = client.get('/bootstrap').headers['ETag']
+    # The worker re-stores identical scrapes; TTL refreshes rewrite unchanged data
+    seeded.cache.set("scraped_live", [])
+    seeded.cache.set("live_matches", [dict(MATCH)])
+    seeded.cache.set("news", list(NEWS))
+    res = client.get('/bootstrap', headers={'If-None-Match': etag})
+    assert res.status_code == 304
+
+
+def test_changed_source_changes_etag(seeded, client):
+    first = client.get('/bootstrap')
+    seeded.cache.set("news", NEWS + [{"title": "Rain stops play"}])
+    res = client.get('/bootstrap', headers={'If-None-Match': first.headers['ETag']})
+    assert res.status_code == 200
+    assert res.headers['ETag'] != first.headers['ETag']
+    assert len(res.get_json()["news"]) == 2
+    assert client.get('/bootstrap', headers={'If-None-Match': res.headers['ETag']}).status_code == 304
@@ -0,0 +1,112 @@
+from commentary_scheduler import CommentaryScheduler, classify_status
+
+
+def test_toss_text_is_live():
+    assert classify_status("India won the toss and opt to bat") == "live"
+    assert classify_status("Australia opt to bowl") == "live"
+
+
+def test_results_are_completed():
+    for status in ("India won by 6 wkts", "Match drawn", "Match tied",
+                   "No result", "Match abandoned due to rain",
+                   "England won the Super Over"):
+        assert classify_status(status) == "completed", status
+
+
+def test_completed_match_gets_one_fetch_then_is_dropped():
+    s = CommentaryScheduler()
+    feed = [{"cricbuzz_id": "101", "status": "India won by 6 wkts"}]
+    s.sync_live(feed, stamp=1)
+    s.record_demand("101")
+    assert s.due(now=10 ** 10) == ["101"]
+    s.record_fetch("101", changed=True)
+    assert s.stats()["tracked"] == 0 and s.stats()["finished"] == 1
+    # Still in the feed on the next rebuild: not re-added
+    s.sync_live(feed, stamp=2)
+    assert s.stats()["tracked"] == 0
+    assert s.record_demand("101") is None
+    assert s.due(now=10 ** 10) == []
+
+
+def test_toss_status_keeps_polling():
+    s = CommentaryScheduler()
+    s.sync_live([{"cricbuzz_id": "7", "status": "India won the toss and opt to bat"}], stamp=1)
+    s.due(now=10 ** 10)
+    s.record_fetch("7", changed=True)
+    assert s.interval("7") is not None
+    assert s.due(now=10 ** 10) == ["7"]
+
+
+FEED = [{"cricbuzz_id": "1", "status": "Live"},
+        {"cricbuzz_id": "2", "status": "Upcoming"},
+        {"cricbuzz_id": "3", "status": "India won by 6 wkts"}]
+
+
+def test_unread_feed_polls_only_live_matches():
+    s = CommentaryScheduler()
+    s.sync_live(FEED, stamp=1)
+    assert s.due(now=10 ** 10) == ["1"]
+    assert s.stats()["states"] == {"live": 1, "upcoming": 1, "completed": 1}
+
+
+def test_unread_live_match_keeps_polling_slowly():
+    s = CommentaryScheduler()
+    s.sync_live(FEED[:1], stamp=1)
+    s.due(now=10 ** 10)
+    s.record_fetch("1", changed=True)
+    assert s.interval("1") == 60      # 15s live base, stretched 4x with no readers
+    assert s.due(now=10 ** 10) == ["1"]
+
+
+def test_upcoming_match_polled_only_while_read():
+    s = CommentaryScheduler(demand_window=60)
+    s.sync_live(FEED, stamp=1)
+    s.due(now=10 ** 10)
+    s.record_demand("2", when=1000)
+    assert s.due(now=1000) == ["2"]
+    s.record_fetch("2", changed=False, when=1010)
+    assert s.due(now=1010 + 900) == ["2"]
+    # Readers gone: not queued again after its next fetch
+    s.record_fetch("2", changed=False, when=5000)
+    assert s.due(now=10 ** 10) == []
+
+
+def test_completed_match_fetched_on_first_read_only():
+    s = CommentaryScheduler()
+    s.sync_live(FEED, stamp=1)
+    assert "3" not in s.due(now=10 ** 10)
+    s.record_demand("3")
+    assert s.due(now=10 ** 10) == ["3"]
+    s.record_fetch("3", changed=True)
+    assert s.record_demand("3") is None
+
+
+def test_live_match_finishing_unread_is_not_fetched_again():
+    s = CommentaryScheduler()
+    s.sync_live(FEED[:1], stamp=1)
+    s.due(now=10 ** 10)
+    s.sync_live([{"cricbuzz_id": "1", "status": "India won by 6 wkts"}], stamp=2)
+    assert s.due(now=10 ** 10) == []
+
+
+def test_unread_matches_outside_the_feed_are_pruned():
+    s = CommentaryScheduler(demand_window=60)
+    s.record_demand("55", when=1000)
+    s.sync_live([{"cricbuzz_id": "1", "status": "Live"}], stamp=1)
+    assert s.stats()["tracked"] == 1
+
+
+def test_non_numeric_commentary_ids_are_not_tracked(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    monkeypatch.setattr(bs.scraper, 'get_commentary', lambda mid: ["ball"])
+    before = bs.commentary_scheduler.stats()["tracked"]
+    assert bs.load_commentary("../../etc") == []
+    assert bs.commentary_scheduler.stats()["tracked"] == before
+
+
+def test_web_demand_notes_are_trimmed(bs, monkeypatch):
+    monkeypatch.setattr(bs, '_demand_noted', {str(i): 0 for i in range(1000)})
+    bs.cache.set(bs.COMMENTARY_DEMAND_KEY, {str(i): 0 for i in range(1000)})
+    bs.note_commentary_demand("42")
+    assert len(bs._demand_noted) == 1
+    assert list(bs.cache.get(bs.COMMENTARY_DEMAND_KEY, 60)) == ["42"]
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+import crawler
+
+HOUR = 3600
+
+
+def _row(id, starts_in=None, started=False, ended=False):
+    start = time.gmtime(time.time() + (starts_in or 0))
+    return {"id": id, "matchStarted": started, "matchEnded": ended,
+            "dateTimeGMT": time.strftime('%Y-%m-%dT%H:%M:%S', start)}
+
+
+def _index(bs):
+    return crawler.PagedIndex(min_interval=2 * HOUR, max_interval=24 * HOUR, due_by=bs.match_due_by)
+
+
+def _backoff(index, rows, rounds=6):
+    for _ in range(rounds):
+        index.merge_page(0, rows)
+    return index._pages[0]["next_due"] - time.time()
+
+
+def test_finished_pages_back_off_to_the_cap(bs):
+    assert _backoff(_index(bs), [_row("a", ended=True)]) > 20 * HOUR
+
+
+def test_pages_never_wait_past_a_match_start(bs):
+    wait = _backoff(_index(bs), [_row("a", ended=True), _row("b", starts_in=5 * HOUR)])
+    assert 4.9 * HOUR < wait <= 5 * HOUR
+
+
+def test_imminent_and_live_pages_refetch_at_min_interval(bs):
+    assert _backoff(_index(bs), [_row("a", starts_in=10 * 60)]) == pytest.approx(2 * HOUR, abs=5)
+    assert _backoff(_index(bs), [_row("a", started=True)]) == pytest.approx(2 * HOUR, abs=5)
+    # Start passed but not flagged started yet (delayed toss)
+    assert _backoff(_index(bs), [_row("a", starts_in=-HOUR)]) == pytest.approx(2 * HOUR, abs=5)
+
+
+def test_unparseable_dates_fall_back_to_backoff(bs):
+    assert bs.match_due_by({"id": "a", "dateTimeGMT": "TBC"}) is None
+    assert bs.match_due_by({"id": "a"}) is None
+    assert crawler.PagedIndex(max_interval=10).due_by is None
+
@@ -0,0 +1,40 @@
+import pytest
+
+from profiler import Profiler
+
+STACK = "GET /live;get_live;load_live;cricket_api"
+
+
+@pytest.fixture
+def profiled(bs, monkeypatch):
+    """A profiler holding one sampled stack and one slow request."""
+    prof = Profiler()
+    prof.sampled[STACK] = 3
+    prof.slow_requests.append({"route": "GET /live", "ms": 900, "top": [STACK]})
+    monkeypatch.setattr(bs, 'profiler', prof)
+    return prof
+
+
+def test_debug_routes_denied_without_token(bs, client, profiled, monkeypatch):
+    monkeypatch.setattr(bs, 'ADMIN_TOKEN', '')
+    for path in ('/debug/profile', '/debug/profile?kind=slow', '/debug/slow'):
+        res = client.get(path)
+        assert res.status_code == 403
+        assert STACK not in res.get_data(as_text=True)
+
+
+def test_denied_reset_keeps_samples(bs, client, profiled, monkeypatch):
+    monkeypatch.setattr(bs, 'ADMIN_TOKEN', 'secret')
+    assert client.get('/debug/profile?reset=1').status_code == 401
+    assert client.get('/debug/profile?reset=1', headers={'X-Admin-Token': 'wrong'}).status_code == 401
+    assert profiled.sampled[STACK] == 3
+
+
+def test_debug_routes_with_token(bs, client, profiled, monkeypatch):
+    monkeypatch.setattr(bs, 'ADMIN_TOKEN', 'secret')
+    headers = {'X-Admin-Token': 'secret'}
+    assert client.get('/debug/slow', headers=headers).get_json()["requests"][0]["ms"] == 900
+    res = client.get('/debug/profile?reset=1', headers=headers)
+    assert res.status_code == 200
+    assert res.get_data(as_text=True) == f"{STACK} 3\n"
+    assert not profiled.sampled
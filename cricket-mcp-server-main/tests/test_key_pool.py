@@ -0,0 +1,126 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from key_pool import KeyPool
+
+KEY_A, KEY_B, KEY_C = "aaaa-key-0001", "bbbb-key-0002", "cccc-key-0003"
+
+
+class CricapiStub:
+    """Local stand-in for api.cricapi.com: per-key budgets, 429s on demand."""
+
+    def __init__(self):
+        self.budgets = {}           # key -> [hits_today, hits_limit]
+        self.throttled = set()      # keys answered with HTTP 429
+        self.used = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                key = parse_qs(urlparse(self.path).query)['apikey'][0]
+                stub.used.append(key)
+                if key in stub.throttled:
+                    self.send_response(429)
+                    self.end_headers()
+                    return
+                hits = stub.budgets[key]
+                if hits[0] >= hits[1]:
+                    body = {"status": "failure", "reason": "hits today exceeded hits limit"}
+                else:
+                    hits[0] += 1
+                    body = {"status": "success", "data": []}
+                body["info"] = {"hitsToday": hits[0], "hitsLimit": hits[1]}
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+
+@pytest.fixture
+def cricapi(bs, monkeypatch):
+    stub = CricapiStub()
+    monkeypatch.setattr(bs, 'CRICKET_API_BASE', stub.url)
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def _pool(bs, monkeypatch, *keys):
+    pool = KeyPool(keys, cooldown=900)
+    monkeypatch.setattr(bs, 'cricapi_keys', pool)
+    return pool
+
+
+def _stats(pool):
+    return {k["key"]: k for k in pool.stats()["keys"]}
+
+
+def test_calls_go_to_the_key_with_most_budget(bs, cricapi, monkeypatch):
+    cricapi.budgets = {KEY_A: [95, 100], KEY_B: [10, 100]}
+    _pool(bs, monkeypatch, KEY_A, KEY_B)
+    results = [bs.cricket_api('matches') for _ in range(6)]
+    assert all(r["status"] == "success" for r in results)
+    # Each key reports its budget once, then B (more left) takes the rest
+    assert sorted(cricapi.used[:2]) == [KEY_A, KEY_B]
+    assert cricapi.used[2:] == [KEY_B] * 4
+
+
+def test_quota_failure_cools_the_key(bs, cricapi, monkeypatch):
+    cricapi.budgets = {KEY_A: [3, 3], KEY_B: [0, 100]}
+    pool = _pool(bs, monkeypatch, KEY_A, KEY_B)
+    results = [bs.cricket_api('matches') for _ in range(5)]
+    assert cricapi.used.count(KEY_A) == 1
+    assert sum(r["status"] == "success" for r in results) == 4
+    a = _stats(pool)["aaaa…0001"]
+    assert a["quota_errors"] == 1 and a["cooling_for"] > 0
+    assert "hits today" in a["last_error"]
+
+
+def test_http_429_cools_the_key_and_masks_it(bs, cricapi, monkeypatch):
+    cricapi.budgets = {KEY_B: [0, 100]}
+    cricapi.throttled = {KEY_C}
+    pool = _pool(bs, monkeypatch, KEY_C, KEY_B)
+    results = [bs.cricket_api('matches') for _ in range(4)]
+    assert cricapi.used.count(KEY_C) == 1
+    failed = [r for r in results if r["status"] == "error"]
+    assert len(failed) == 1 and "429" in failed[0]["error"]
+    assert KEY_C not in json.dumps(results)
+    assert "cccc…0003" in failed[0]["error"]
+    c = _stats(pool)["cccc…0003"]
+    assert c["cooling_for"] > 0 and KEY_C not in c["last_error"]
+
+
+def test_all_keys_exhausted_fails_fast(bs, cricapi, monkeypatch):
+    cricapi.budgets = {KEY_A: [5, 5], KEY_B: [5, 5]}
+    pool = _pool(bs, monkeypatch, KEY_A, KEY_B)
+    bs.cricket_api('matches')
+    bs.cricket_api('matches')
+    calls = len(cricapi.used)
+    result = bs.cricket_api('matches')
+    assert "exhausted" in result["error"]
+    assert len(cricapi.used) == calls
+    assert pool.stats()["exhausted"] == 1
+
+
+def test_health_masks_keys(bs, client, cricapi, monkeypatch):
+    cricapi.budgets = {KEY_A: [0, 100]}
+    cricapi.throttled = {KEY_C}
+    _pool(bs, monkeypatch, KEY_A, KEY_C)
+    bs.cricket_api('matches')
+    bs.cricket_api('matches')
+    body = client.get('/health').get_data(as_text=True)
+    assert KEY_A not in body and KEY_C not in body
+    keys = json.loads(body)["cricapi_keys"]["keys"]
+    assert {k["key"] for k in keys} == {"aaaa…0001", "cccc…0003"}
@@ -0,0 +1,120 @@
+"""Cricket-API-main/main.py routes served by the bridge keep their old fields."""
+
+import importlib.util
+import os
+
+import dotenv
+import pytest
+
+MAIN_PY = os.path.join(os.path.dirname(__file__), '..', '..', 'Cricket-API-main',
+                       'Cricket-API-main', 'main.py')
+
+MATCHES = [
+    {"id": "m1", "name": "India vs Australia, 1st Test", "status": "Live", "venue": "Perth",
+     "date": "2026-10-19", "dateTimeGMT": "2026-10-19T02:00:00", "matchType": "test",
+     "teams": ["India", "Australia"], "score": [{"r": 120, "w": 3, "o": 40, "inning": "India Inning 1"}],
+     "matchStarted": True},
+    {"id": "m2", "name": "England vs Pakistan, 1st ODI", "status": "Match not started",
+     "venue": "Lord's", "date": "2026-11-02", "dateTimeGMT": "2026-11-02T09:30:00",
+     "matchType": "odi", "teams": ["England", "Pakistan"], "score": [], "matchStarted": False},
+]
+
+PROFILE = {
+    "name": "Virat Kohli", "country": "India", "image": "https://img/1413.jpg", "role": "Batsman",
+    "rankings": {"batting": {"test": "9", "odi": "4", "t20": "--"},
+                 "bowling": {"test": "--", "odi": "--", "t20": "--"}},
+    "batting_stats": {"test": {"matches": "113", "runs": "8848", "highest_score": "254",
+                               "average": "49.2", "strike_rate": "55.6",
+                               "hundreds": "29", "fifties": "30"}},
+    "bowling_stats": {}, "source": "cricbuzz",
+}
+
+
+@pytest.fixture
+def legacy(bs, monkeypatch):
+    """Cricket-API-main's main.py app with upstreams stubbed."""
+    monkeypatch.setattr(bs, 'LEGACY_ROUTES', bs.LEGACY_ROUTES)  # restored afterwards
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    loaded = []
+    monkeypatch.setattr(dotenv, 'load_dotenv', lambda path=None, **kw: loaded.append(path))
+    spec = importlib.util.spec_from_file_location("legacy_main", MAIN_PY)
+    main = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(main)
+    main.dotenv_paths = loaded
+
+    def cricket_api(endpoint, params=None):
+        return {"status": "success", "data": list(MATCHES), "info": {"totalRows": 2}}
+    monkeypatch.setattr(bs, 'cricket_api', cricket_api)
+    monkeypatch.setattr(bs, 'news_api', lambda params=None: {"results": [
+        {"title": "Kohli hundred", "description": "...", "link": "https://news/1"}]})
+    monkeypatch.setattr(bs.scraper, 'get_cricbuzz_matches', lambda: [])
+    monkeypatch.setattr(bs.scraper, 'get_upcoming_schedule', lambda *a: [])
+    monkeypatch.setattr(bs.scraper, 'get_icc_rankings_page', lambda cat: {
+        "test": [{"rank": "1", "name": "Joe Root", "country": "England", "rating": "899"}]})
+    monkeypatch.setattr(bs.scraper, 'find_profile_url',
+                        lambda name: "https://www.cricbuzz.com/profiles/1413/virat-kohli")
+    monkeypatch.setattr(bs.scraper, 'get_player_profile', lambda url: dict(PROFILE))
+    monkeypatch.setattr(bs.time, 'sleep', lambda seconds: None)
+    return main
+
+
+def test_shim_reads_its_dotenv(legacy):
+    assert legacy.dotenv_paths == [os.path.join(os.path.dirname(os.path.abspath(MAIN_PY)), '.env')]
+
+
+def test_live_keeps_old_shape_and_items(legacy):
+    data = legacy.app.test_client().get('/live').get_json()
+    # cricapi's own score blocks; no Cricbuzz items and no demo fixture
+    assert data == [
+        {"id": "m1", "name": "India vs Australia, 1st Test", "status": "Live",
+         "score": [{"r": 120, "w": 3, "o": 40, "inning": "India Inning 1"}],
+         "teams": ["India", "Australia"], "venue": "Perth"},
+        {"id": "m2", "name": "England vs Pakistan, 1st ODI", "status": "Match not started",
+         "score": [], "teams": ["England", "Pakistan"], "venue": "Lord's"},
+    ]
+
+
+def test_live_upstream_failure_is_an_error(legacy, monkeypatch):
+    monkeypatch.setattr(legacy.bridge_server, 'cricket_api',
+                        lambda endpoint, params=None: {"error": "down", "status": "error"})
+    res = legacy.app.test_client().get('/live')
+    assert res.status_code == 500
+    assert res.get_json() == {"error": "Failed to fetch from API"}
+
+
+def test_schedule_keeps_old_shape_and_items(legacy):
+    client = legacy.app.test_client()
+    assert client.get('/schedule').get_json() == [
+        {"id": "m2", "name": "England vs Pakistan, 1st ODI", "date": "2026-11-02",
+         "venue": "Lord's", "teams": ["England", "Pakistan"]},
+    ]
+    assert [m["id"] for m in client.get('/schedule?upcoming=0').get_json()] == ["m1", "m2"]
+
+
+def test_players_serves_the_cricbuzz_profile_in_the_old_shape(legacy):
+    res = legacy.app.test_client().get('/players/Virat Kohli')
+    assert res.status_code == 200
+    data = res.get_json()
+    assert {"name", "country", "image", "role", "batting_stats"} <= set(data)
+    assert data["batting_stats"]["test"]["avg"] == "49.2"
+    assert data["batting_stats"]["test"]["sr"] == "55.6"
+    assert {"matches", "runs"} <= set(data["batting_stats"]["test"])
+    assert data["rankings"]["batting"]["odi"] == "4"   # read by templates/index.html
+
+
+def test_rankings_and_news(legacy):
+    client = legacy.app.test_client()
+    # Breaking (documented): the old route proxied a cricapi endpoint that
+    # does not exist; these are the bridge's Cricbuzz ranking blocks
+    rankings = client.get('/rankings?category=batting&format=test').get_json()
+    assert rankings[0]["rank"][0]["name"] == "Joe Root"
+    news = client.get('/news').get_json()
+    assert news[0]["title"] == "Kohli hundred"
+    assert news[0]["description"] == "..."
+    assert news[0]["url"] == "https://news/1"
+
+
+def test_bridge_players_route_is_unchanged(bs, client, monkeypatch):
+    monkeypatch.setattr(bs, 'LEGACY_ROUTES', False)
+    monkeypatch.setattr(bs, 'load_player', lambda name: ({"name": name, "batting_stats": {}}, 200))
+    assert client.get('/players/Virat Kohli').get_json()["name"] == "Virat Kohli"
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import scraper
+import worker
+
+CARD = (Path(__file__).parent / "fixtures" / "scorecard_result.html").read_bytes()
+
+
+def _innings(number, runs):
+    return {"number": number, "title": f"Innings {number}", "score": f"{runs}-2 (20 Ov)",
+            "batting": [], "bowling": [], "extras": "0"}
+
+
+def _feed(bs, status):
+    bs.cache.set("live_feed", {"matches": [
+        {"id": "900", "cricbuzz_id": "900", "source": "cricbuzz",
+         "name": "India vs Australia", "status": status, "venue": "Perth"}]})
+
+
+def test_toss_stage_scorecard_is_not_final(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    monkeypatch.setattr(bs.scraper, 'get_scorecard', lambda mid, skip=0: [_innings(1, 12)])
+    _feed(bs, "India won the toss and opt to bat")
+    payload, status = bs.load_match_details("900")
+    assert status == 200
+    assert payload["final"] is False
+    assert payload["innings"][0]["complete"] is False
+
+
+def test_completed_innings_are_reused(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    calls = []
+
+    def scorecard(mid, skip=0):
+        calls.append(skip)
+        return [_innings(n, 100 + n) for n in (1, 2) if n > skip]
+    monkeypatch.setattr(bs.scraper, 'get_scorecard', scorecard)
+    _feed(bs, "Live")
+    bs.load_match_details("900")
+    payload, _ = bs.load_match_details("900", refresh=True)
+    assert calls == [0, 1]
+    assert [i["complete"] for i in payload["innings"]] == [True, False]
+
+
+def test_web_process_does_not_scrape_without_inline(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    monkeypatch.setattr(bs, '_demand_noted', {})
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("scraped in the web process")
+    monkeypatch.setattr(bs.scraper, 'get_scorecard', forbidden)
+    payload, status = bs.load_match_details("900")
+    assert status == 404
+    assert "900" in bs.cache.get(bs.SCORECARD_DEMAND_KEY, 60)
+
+
+def test_worker_builds_requested_scorecards(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    monkeypatch.setattr(bs, '_demand_noted', {})
+    monkeypatch.setattr(worker.scraper, 'get_scorecard', lambda mid, skip=0: [_innings(1, 50)])
+    _feed(bs, "Live")
+    bs.load_match_details("900")
+
+    w = worker.ScrapeWorker(bs, processes=1)
+    w.pool.shutdown()
+    w.pool = ThreadPoolExecutor(max_workers=1)
+    w.run_scorecards()
+    w.pool.shutdown(wait=True)
+
+    payload, status = bs.load_match_details("900")
+    assert status == 200
+    assert payload["innings"][0]["score"] == "50-2 (20 Ov)"
+    w.run_scorecards()   # fetched this MATCH_TTL already
+    assert not w._cards_in_flight
+
+
+def test_refresh_does_not_touch_cards_readers_hold(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    # Like the scraper's page memo: the same innings dicts on every call
+    memo = [_innings(1, 180), _innings(2, 20)]
+    pages = iter([memo[:1], memo])
+    monkeypatch.setattr(bs.scraper, 'get_scorecard', lambda mid, skip=0: [i for i in next(pages) if i["number"] > skip])
+    _feed(bs, "Live")
+    first, _ = bs.load_match_details("900")
+    bs.load_match_details("900", refresh=True)
+    assert first["innings"] == [{**memo[0], "complete": False}]
+    assert all("complete" not in i for i in memo)
+
+
+class _Response:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+        self.headers = {}
+
+
+class _Session:
+    """Serves the saved scorecard and counts GETs."""
+
+    def __init__(self):
+        self.gets = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.gets.append(url)
+        return _Response(CARD)
+
+
+def test_match_not_on_live_is_final_from_its_result_line(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    session = _Session()
+    monkeypatch.setattr(scraper, '_session', lambda: session)
+    scraper._page_memo.clear()
+    bs.cache.set("live_feed", {"matches": []})
+    payload, status = bs.load_match_details("900")
+    assert status == 200
+    assert payload["status"] == "West Indies won by 6 wkts"
+    assert payload["final"] is True
+    assert [(i["score"], i["complete"]) for i in payload["innings"]] == [
+        ("148-7 (20 Ov)", True), ("149-4 (18.2 Ov)", True)]
+    assert payload["innings"][1]["batting"][0]["r"] == "72"
+    assert bs.load_match_details("900")[0] is payload    # final: served without a refetch
+    assert len(session.gets) == 2
+
+    # While /live lists the match, its status comes from there and the line is not fetched
+    _feed(bs, "West Indies need 12 runs")
+    bs.cache.set("match_900", None)
+    payload, _ = bs.load_match_details("900", refresh=True)
+    assert payload["final"] is False and len(session.gets) == 3
+    scraper._page_memo.clear()
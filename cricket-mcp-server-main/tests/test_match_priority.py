@@ -0,0 +1,68 @@
+import match_priority
+from match_priority import get_match_priority, load_weights, rank_matches
+
+
+def _match(id, name, status="Completed", premium=False):
+    return {"id": id, "name": name, "status": status, "is_premium": premium}
+
+
+def test_default_scoring():
+    weights = load_weights('')
+    assert get_match_priority(_match("1", "Nepal vs Oman"), weights) == 1500
+    assert get_match_priority(_match("2", "Nepal Women vs Oman Women"), weights) == 500
+    assert get_match_priority(_match("3", "India vs Australia, Final", "Live", True), weights) == \
+        2000 + 1000 + 1500 + 500 + 100 + 80
+
+
+def test_weight_overrides_merge_over_defaults(monkeypatch):
+    monkeypatch.setenv('LIVE_PRIORITY_WEIGHTS', '{"womens": 3000, "teams": {"nepal": 400}}')
+    weights = load_weights()
+    assert weights["womens"] == 3000
+    assert weights["mens"] == match_priority.DEFAULT_WEIGHTS["mens"]
+    assert weights["teams"]["nepal"] == 400
+    assert weights["teams"]["india"] == 100
+    # Overrides never leak into the defaults
+    assert "nepal" not in match_priority.DEFAULT_WEIGHTS["teams"]
+
+    ranked = rank_matches([_match("1", "Kenya vs Oman"), _match("2", "Nepal Women vs Oman Women")], weights)
+    assert [m["id"] for m in ranked] == ["2", "1"]
+    assert ranked[0]["priority"] == 3400
+
+
+def test_bad_overrides_are_ignored():
+    assert load_weights('not json') == match_priority.DEFAULT_WEIGHTS
+    assert load_weights('[1, 2]') == match_priority.DEFAULT_WEIGHTS
+
+
+def test_ties_keep_feed_order():
+    feed = [_match(str(i), f"Team {i} vs Team {i + 10}") for i in range(6)]
+    feed.insert(3, _match("live", "Kenya vs Oman", "Live"))
+    ranked = rank_matches(feed)
+    assert [m["id"] for m in ranked] == ["live", "0", "1", "2", "3", "4", "5"]
+
+
+def _official(id, name, started=False, ended=True):
+    return {"id": id, "name": name, "matchStarted": started, "matchEnded": ended,
+            "teams": name.split(" vs "), "score": []}
+
+
+def test_live_limit_serves_stored_order(bs, client, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    bs.cache.set("live_matches", [
+        _official("a", "Kenya vs Oman"),
+        _official("b", "India vs Pakistan", started=True, ended=False),
+        _official("c", "Nepal Women vs Oman Women"),
+        _official("d", "England vs Australia, Final"),
+    ])
+    bs.cache.set("scraped_live", [])
+    ranks = []
+    real_rank = match_priority.rank_matches
+    monkeypatch.setattr(match_priority, 'rank_matches', lambda m: ranks.append(1) or real_rank(m))
+
+    full = client.get('/live').get_json()
+    assert [m["id"] for m in full] == ["b", "d", "a", "c"]
+    for n in (1, 2, 4, 10):
+        assert client.get(f'/live?limit={n}').get_json() == full[:n]
+    # Ranked once when the feed was built, not per request
+    assert ranks == [1]
+    assert client.get('/live?limit=0').status_code == 400
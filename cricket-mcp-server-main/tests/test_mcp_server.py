@@ -0,0 +1,89 @@
+import io
+import json
+import sys
+
+import pytest
+
+import cricket_server
+from schedule_store import ScheduleStore
+
+MATCHES = [{"id": "a", "date": "2026-11-01", "teams": ["India", "Pakistan"], "started": False},
+           {"id": "b", "date": "2026-11-02", "teams": ["England", "Oman"], "started": False}]
+
+
+def _serve(monkeypatch, *lines):
+    """Run the stdio loop over `lines` and return its replies in order."""
+    out = io.StringIO()
+    monkeypatch.setattr(sys, 'stdin', io.StringIO("".join(
+        (line if isinstance(line, str) else json.dumps(line)) + "\n" for line in lines)))
+    monkeypatch.setattr(sys, 'stdout', out)
+    monkeypatch.setattr(cricket_server, '_protocol_out', out)
+    assert cricket_server.main() == 0
+    replies = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert all(r["jsonrpc"] == "2.0" for r in replies)
+    return replies
+
+
+def _by_id(replies):
+    return {r["id"]: r for r in replies}
+
+
+def _call(id, name, **arguments):
+    return {"jsonrpc": "2.0", "id": id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}}
+
+
+@pytest.fixture
+def schedule(bs, monkeypatch):
+    index = ScheduleStore()
+    index.load(MATCHES)
+    monkeypatch.setattr(bs, 'schedule_index', index)
+    monkeypatch.setattr(bs, 'load_schedule', lambda refresh=False: MATCHES)
+    return bs
+
+
+def test_handshake_and_tool_list(monkeypatch):
+    replies = _by_id(_serve(monkeypatch,
+                            {"jsonrpc": "2.0", "id": 1, "method": "initialize",
+                             "params": {"protocolVersion": "2025-03-26"}},
+                            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+                            {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+                            {"jsonrpc": "2.0", "id": 3, "method": "resources/list"}))
+    assert set(replies) == {1, 2, 3}
+    assert replies[1]["result"] == {"protocolVersion": "2025-03-26", "capabilities": {"tools": {}},
+                                    "serverInfo": cricket_server.SERVER_INFO}
+    tools = {t["name"]: t for t in replies[2]["result"]["tools"]}
+    assert set(tools) == set(cricket_server.TOOLS)
+    assert tools["get_commentary"]["inputSchema"]["required"] == ["match_id"]
+    assert replies[3]["error"]["code"] == -32601
+
+
+def test_malformed_lines_get_errors_and_the_loop_continues(monkeypatch):
+    replies = _serve(monkeypatch, "{not json", "[1, 2]", "",
+                     {"jsonrpc": "2.0", "id": 7, "method": "ping"})
+    assert [(r["id"], r["error"]["code"]) for r in replies[:2]] == [(None, -32700), (None, -32600)]
+    assert replies[2] == {"jsonrpc": "2.0", "id": 7, "result": {}}
+
+
+def test_unknown_tool_and_bad_arguments_are_invalid_params(schedule, monkeypatch):
+    replies = _by_id(_serve(monkeypatch,
+                            _call(1, "get_weather"),
+                            _call(2, "get_cricket_schedule", limit="ten"),
+                            _call(3, "get_cricket_schedule", limit=0),
+                            _call(4, "get_cricket_schedule", limit=2.5),
+                            _call(5, "get_commentary"),
+                            {"jsonrpc": "2.0", "id": 6, "method": "tools/call",
+                             "params": {"name": "get_live_matches", "arguments": ["x"]}}))
+    assert {id: r["error"]["code"] for id, r in replies.items()} == dict.fromkeys(range(1, 7), -32602)
+    assert replies[1]["error"]["message"] == "Unknown tool: get_weather"
+    assert replies[2]["error"]["message"] == "limit must be a positive integer"
+    assert replies[5]["error"]["message"] == "Missing argument: match_id"
+
+
+def test_schedule_limit_is_coerced(schedule, monkeypatch):
+    replies = _by_id(_serve(monkeypatch,
+                            _call(1, "get_cricket_schedule", limit="1"),
+                            _call(2, "get_cricket_schedule", limit=5, team="oman")))
+    assert not replies[1]["result"]["isError"]
+    assert [m["id"] for m in json.loads(replies[1]["result"]["content"][0]["text"])] == ["a"]
+    assert [m["id"] for m in json.loads(replies[2]["result"]["content"][0]["text"])] == ["b"]
@@ -0,0 +1,128 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import extract_rules
+import scraper
+from shared_cache import SqliteCache
+
+PAGE = (Path(__file__).parent / "fixtures" / "rankings_batting.html").read_bytes()
+URL = "https://www.cricbuzz.com/cricket-stats/icc-rankings/men/batting"
+
+
+class _Response:
+    def __init__(self, status, content=b"", headers=None):
+        self.status_code = status
+        self.content = content
+        self.headers = headers or {}
+
+
+class _Site:
+    """One page that honours If-None-Match when `etag` is set; `broken` URLs
+    serve a page no rule matches."""
+
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.content = PAGE
+        self.broken = set()
+        self.gets = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.gets.append(dict(headers or {}))
+        if url in self.broken:
+            return _Response(200, b"<html><body>maintenance</body></html>")
+        if self.etag and (headers or {}).get('If-None-Match') == self.etag:
+            return _Response(304)
+        return _Response(200, self.content, {'ETag': self.etag} if self.etag else {})
+
+
+@pytest.fixture
+def site(monkeypatch):
+    fake = _Site()
+    monkeypatch.setattr(scraper, '_session', lambda: fake)
+    monkeypatch.setattr(scraper, '_shared', None)
+    monkeypatch.setattr(extract_rules, '_shared', None)
+    monkeypatch.setattr(scraper, '_fetch_stats', dict.fromkeys(scraper._fetch_stats, 0))
+    scraper._page_memo.clear()
+    yield fake
+    scraper._page_memo.clear()
+
+
+def _parses(monkeypatch):
+    calls = []
+    real = scraper.RANKING_RULES.run
+    monkeypatch.setattr(scraper.RANKING_RULES, 'run', lambda soup: calls.append(1) or real(soup))
+    return calls
+
+
+def test_not_modified_reuses_the_parse(site, monkeypatch):
+    site.etag = 'W/"r1"'
+    parses = _parses(monkeypatch)
+    first = scraper.get_icc_rankings_page('batting')
+    again = scraper.get_icc_rankings_page('batting')
+    assert again == first and first['test']
+    assert site.gets[1] == {'If-None-Match': 'W/"r1"'}
+    assert parses == [1]
+    stats = scraper.fetch_stats()
+    assert (stats["fetches"], stats["not_modified"], stats["parsed"]) == (2, 1, 1)
+
+
+def test_unchanged_body_skips_the_parse(site, monkeypatch):
+    parses = _parses(monkeypatch)
+    scraper.get_icc_rankings_page('batting')
+    scraper.get_icc_rankings_page('batting')
+    assert parses == [1]
+    assert scraper.fetch_stats()["unchanged"] == 1
+
+    site.content = PAGE.replace(b"Joe Root", b"Ben Duckett")
+    assert scraper.get_icc_rankings_page('batting')['test'][0]["name"] == "Ben Duckett"
+    assert parses == [1, 1]
+    assert scraper.fetch_stats()["parses_skipped"] == 1
+
+
+def test_shared_memo_spans_processes(site, monkeypatch, tmp_path):
+    path = str(tmp_path / "cache.db")
+    site.etag = 'W/"r1"'
+    parses = _parses(monkeypatch)
+    scraper.use_shared_cache(path)
+    scraper.get_icc_rankings_page('batting')
+    # Another process: its own SqliteCache on the same file, empty local memo
+    scraper.use_shared_cache(SqliteCache(path))
+    assert scraper.get_icc_rankings_page('batting')['odi'][0]["name"] == "Shubman Gill"
+    assert parses == [1]
+    assert not scraper._page_memo
+
+    scraper.use_shared_cache(path)
+    stats = scraper.fetch_stats()
+    assert (stats["fetches"], stats["not_modified"], stats["parsed"], stats["memo"]) == (2, 1, 1, "shared")
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_pool_children_share_memo_and_counters(site, tmp_path):
+    path = str(tmp_path / "cache.db")
+    site.etag = 'W/"r1"'
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('fork'),
+                             initializer=scraper.use_shared_cache, initargs=(path,)) as pool:
+        for _ in range(4):
+            assert pool.submit(scraper.get_icc_rankings_page, 'batting').result()['test']
+    # The web process reads what the children counted
+    scraper.use_shared_cache(path)
+    stats = scraper.fetch_stats()
+    assert (stats["fetches"], stats["parsed"], stats["not_modified"]) == (4, 1, 3)
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_pool_children_report_extraction_telemetry(site, tmp_path):
+    path = str(tmp_path / "cache.db")
+    site.broken.add(URL.replace("batting", "bowling"))
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('fork'),
+                             initializer=scraper.use_shared_cache, initargs=(path,)) as pool:
+        pool.submit(scraper.get_icc_rankings_page, 'batting').result()
+        pool.submit(scraper.get_icc_rankings_page, 'bowling').result()
+    scraper.use_shared_cache(path)
+    rankings = extract_rules.telemetry()["rankings"]
+    assert rankings["runs"] == 2 and rankings["empty"] == 1
+    assert rankings["hits"]["format-sections"] == 1
+    assert rankings["last_rule"] is None and rankings["max_ms"] > 0
@@ -0,0 +1,53 @@
+import threading
+
+import prime_cache
+from shared_cache import SqliteCache
+
+
+def test_cli_refuses_without_cache_path(monkeypatch, capsys):
+    monkeypatch.delenv('CACHE_PATH', raising=False)
+    monkeypatch.setattr(prime_cache, 'prime', lambda *a, **k: _must_not_prime())
+    assert prime_cache.main([]) == 1
+    assert "CACHE_PATH" in capsys.readouterr().out
+
+
+def _must_not_prime():
+    raise AssertionError("primed a throwaway cache")
+
+
+def test_prime_endpoint_runs_in_background(bs, client, monkeypatch):
+    monkeypatch.setattr(bs, 'ADMIN_TOKEN', 'secret')
+    release, seen = threading.Event(), []
+
+    def slow_prime(players, match_ids, **kwargs):
+        seen.append((players, match_ids))
+        release.wait(5)
+        return {"live": {"ok": True, "ms": 1}}
+    monkeypatch.setattr(prime_cache, 'prime', slow_prime)
+
+    headers = {'X-Admin-Token': 'secret'}
+    res = client.post('/cache/prime', json={"players": 3, "matches": [123]}, headers=headers)
+    assert res.status_code == 202 and res.get_json()["status"] == "priming"
+    res = client.post('/cache/prime', headers=headers, environ_base={'REMOTE_ADDR': '10.1.1.1'})
+    assert res.get_json()["status"] == "already priming"
+    release.set()
+    with bs._prime_lock:
+        pass
+    assert seen == [(3, ["123"])]
+    assert bs.primer_state["last"]["keys"] == 1
+
+
+def test_primer_is_not_started_on_import(bs):
+    assert not bs._primer_started
+    assert "cache-primer" not in [t.name for t in threading.enumerate()]
+
+
+def test_claim_lets_one_process_prime_per_interval(tmp_path, bs):
+    a = SqliteCache(str(tmp_path / "cache.db"))
+    b = SqliteCache(str(tmp_path / "cache.db"))
+    assert a.claim("prime_lease", 60) is True
+    assert b.claim("prime_lease", 60) is False
+    assert b.claim("prime_lease", 0) is True
+
+    assert bs.cache.claim("prime_lease", 60) is True
+    assert bs.cache.claim("prime_lease", 60) is False
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import profiler
+from profiler import Profiler
+
+
+def test_request_ending_mid_tick_is_not_counted(monkeypatch):
+    prof = Profiler(slow_ms=1)
+    watch = prof.begin("GET /live")
+    time.sleep(0.002)
+    real_fold = profiler._fold
+
+    def fold_then_end(frame, root):
+        # The request finishes while the sampler is still folding its stack
+        prof.end(watch)
+        return real_fold(frame, root)
+
+    monkeypatch.setattr(profiler, '_fold', fold_then_end)
+    prof._tick()
+    assert not watch.stacks
+    assert prof.slow_requests[0]["samples"] == 0
+    assert prof.ticks == 1
+
+
+def test_sampler_and_requests_run_concurrently():
+    prof = Profiler(sample_rate=1.0, slow_ms=1, interval=0.0001)
+    errors = []
+
+    def serve():
+        try:
+            for _ in range(300):
+                watch = prof.begin("GET /live")
+                sum(range(2000))
+                prof.end(watch)
+        except Exception as e:      # RuntimeError: dictionary changed size ...
+            errors.append(e)
+
+    threads = [threading.Thread(target=serve) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert prof.requests_sampled == 8 * 300
+    assert prof.stats()["watching"] == 0
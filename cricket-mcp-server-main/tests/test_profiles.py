@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import worker
+
+
+PROFILE = {"name": "Virat Kohli", "batting": {}, "bowling": {}}
+
+
+def _no_rankings(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'load_rankings', lambda refresh=False: [])
+
+
+def test_failed_search_is_not_repeated(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    _no_rankings(bs, monkeypatch)
+    searches = []
+    monkeypatch.setattr(bs.scraper, 'find_profile_url', lambda name: searches.append(name))
+    assert bs.load_profile("Nobody Special")[1] == 404
+    assert bs.load_profile("nobody  special")[1] == 404
+    assert searches == ["Nobody Special"]
+
+
+def test_empty_index_is_refilled_from_rankings(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    monkeypatch.setattr(bs, 'load_rankings', lambda refresh=False: bs.profile_index.learn(
+        [("Virat Kohli", "1413")]))
+    monkeypatch.setattr(bs.scraper, 'find_profile_url',
+                        lambda name: (_ for _ in ()).throw(AssertionError("searched")))
+    assert bs.resolve_profile_id("Virat Kohli") == "1413"
+
+
+def test_index_survives_cache_clear(bs, client, monkeypatch):
+    monkeypatch.setattr(bs, 'ADMIN_TOKEN', 'secret')
+    bs.profile_index.learn([("Virat Kohli", "1413")])
+    assert client.post('/cache/clear', headers={'X-Admin-Token': 'secret'}).status_code == 200
+    assert bs.profile_index.lookup("virat kohli") == "1413"
+
+
+def test_web_process_only_reads_without_inline(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    monkeypatch.setattr(bs, '_demand_noted', {})
+    for name in ('find_profile_url', 'get_player_profile'):
+        monkeypatch.setattr(bs.scraper, name,
+                            lambda *a: (_ for _ in ()).throw(AssertionError("scraped")))
+    payload, status = bs.load_profile("Virat Kohli")
+    assert status == 404
+    assert "Virat Kohli" in bs.cache.get(bs.PROFILE_DEMAND_KEY, 60)
+
+
+def test_worker_resolves_requested_profiles(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    monkeypatch.setattr(bs, '_demand_noted', {})
+    monkeypatch.setattr(worker.scraper, 'get_profile_by_name',
+                        lambda name, pid=None: ("1413", "https://cb/profiles/1413/virat-kohli",
+                                                dict(PROFILE)))
+    bs.load_profile("Virat Kohli")
+
+    w = worker.ScrapeWorker(bs, processes=1)
+    w.pool.shutdown()
+    w.pool = ThreadPoolExecutor(max_workers=1)
+    w.run_profiles()
+    w.pool.shutdown(wait=True)
+
+    payload, status = bs.load_profile("Virat Kohli")
+    assert status == 200
+    assert payload["profile_id"] == "1413"
@@ -0,0 +1,93 @@
+import time
+from pathlib import Path
+
+import pytest
+
+import scraper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGES = {
+    "batting": "rankings_batting.html",
+    "bowling": "rankings_batting.html",
+    "all-rounder": "rankings_batting.html",
+    "teams": "rankings_teams.html",
+}
+
+
+class _Response:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+        self.headers = {}
+
+
+class _Session:
+    """Serves saved rankings pages and counts GETs per URL."""
+
+    def __init__(self):
+        self.gets = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.gets.append(url)
+        category = url.rsplit('/', 1)[-1]
+        return _Response((FIXTURES / PAGES[category]).read_bytes())
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = _Session()
+    monkeypatch.setattr(scraper, '_session', lambda: fake)
+    scraper._page_memo.clear()
+    yield fake
+    scraper._page_memo.clear()
+
+
+def test_player_page_splits_formats(session):
+    page = scraper.get_icc_rankings_page('batting')
+    assert set(page) == {'test', 'odi', 't20'}
+    assert [r["name"] for r in page['test']] == ["Joe Root", "Kane Williamson", "Harry Brook"]
+    assert page['test'][0] == {
+        **page['test'][0],
+        "rank": "1", "name": "Joe Root", "country": "England", "rating": "899", "profile_id": "8019",
+    }
+    assert "format" not in page['test'][0]
+    assert page['odi'][0]["name"] == "Shubman Gill"
+    assert page['t20'][2]["profile_id"] == "10896"
+    assert scraper.RANKING_RULES.last_rule == "format-sections"
+
+
+def test_team_page_splits_formats(session):
+    page = scraper.get_icc_rankings_page('teams')
+    assert [r["name"] for r in page['test']] == ["Australia", "South Africa", "England"]
+    assert page['odi'][0] == {**page['odi'][0], "rank": "1", "name": "India", "rating": "122", "points": "5840"}
+    assert page['t20'][1]["points"] == "11293"
+    assert scraper.TEAM_RANKING_RULES.last_rule == "format-sections"
+
+
+def test_formats_of_one_category_share_a_fetch(session):
+    page = scraper.get_icc_rankings_page('batting')
+    assert len(session.gets) == 1
+    assert all(page[fmt] for fmt in ('test', 'odi', 't20'))
+
+
+def test_load_rankings_fetches_each_category_once(bs, session, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    monkeypatch.setattr(bs.time, 'sleep', lambda s: None)
+    blocks = bs.load_rankings(refresh=True)
+    assert sorted(u.rsplit('/', 1)[-1] for u in session.gets) == sorted(PAGES)
+    assert len(blocks) == 12
+    assert all(b["rank"] for b in blocks)
+    teams_t20 = bs.filter_rankings(blocks, 'teams', 't20')[0]
+    assert teams_t20["rank"][0]["name"] == "India"
+
+
+def test_rankings_page_parses_quickly(session):
+    scraper.get_icc_rankings_page('batting')
+    scraper._page_memo.clear()
+    started = time.perf_counter()
+    for _ in range(5):
+        scraper._page_memo.clear()
+        scraper.get_icc_rankings_page('batting')
+    # Generous bound: catches a parser falling back to full-tree walks, not CPU jitter
+    assert (time.perf_counter() - started) / 5 < 0.25
+    assert scraper.RANKING_RULES.stats()["max_ms"] > 0
@@ -0,0 +1,81 @@
+import pytest
+
+from live_state import LiveState
+
+OLD_NEWS = [{"title": "Toss delayed"}]
+NEW_NEWS = [{"title": "India win by 5 wickets"}]
+
+
+def test_body_read_across_a_rewrite_is_not_kept(bs, client, monkeypatch):
+    bs.cache.set("news", OLD_NEWS)
+    calls = []
+
+    def load_news(refresh=False):
+        data = bs.cache.get("news", 3600)
+        if not calls:
+            # Another process rewrites the key after this request read it
+            bs.cache.set("news", NEW_NEWS)
+        calls.append(1)
+        return data
+
+    monkeypatch.setattr(bs, 'load_news', load_news)
+    assert client.get('/news').get_json() == OLD_NEWS
+    assert client.get('/news').get_json() == NEW_NEWS
+    assert client.get('/news').get_json() == NEW_NEWS
+
+
+def test_body_is_reused_while_unchanged(bs, client, monkeypatch):
+    bs.cache.set("news", OLD_NEWS)
+    monkeypatch.setattr(bs, 'load_news', lambda refresh=False: bs.cache.get("news", 3600))
+    encoded = []
+    real_dumps = bs.json.dumps
+    monkeypatch.setattr(bs.json, 'dumps', lambda *a, **k: encoded.append(1) or real_dumps(*a, **k))
+    client.get('/news')
+    client.get('/news')
+    assert encoded == [1]
+
+
+def _official(id, name, ended=False):
+    return {"id": id, "name": name, "matchStarted": True, "matchEnded": ended,
+            "teams": name.split(" vs "), "score": []}
+
+
+def test_since_applies_fields_to_delta_entries(bs, client, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    monkeypatch.setattr(bs, 'live_state', LiveState())
+    bs.cache.set("scraped_live", [])
+    bs.cache.set("live_matches", [_official("a", "Kenya vs Oman")])
+    version = client.get('/live').headers['X-Live-Version']
+
+    bs.cache.set("live_matches", [_official("a", "Kenya vs Oman", ended=True),
+                                  _official("b", "Nepal vs Scotland")])
+    delta = client.get(f'/live?since={version}&fields=id,status').get_json()
+    assert delta["full"] is False and int(delta["version"]) > int(version)
+    assert delta["added"] == [{"id": "b", "status": "Live"}]
+    assert delta["changed"] == [{"id": "a", "fields": {"status": "Completed"}}]
+
+    # Changes outside the fieldset leave no empty entries behind
+    delta = client.get(f'/live?since={version}&fields=id,venue').get_json()
+    assert delta["changed"] == []
+    assert delta["added"] == [{"id": "b", "venue": ""}]
+
+    # Too old a version: the full snapshot, its matches projected
+    snapshot = client.get('/live?since=0&fields=id').get_json()
+    assert snapshot["full"] is True
+    assert snapshot["matches"] == [{"id": "b"}, {"id": "a"}]
+
+
+def test_brotli_negotiated_when_installed(bs, client, monkeypatch):
+    pytest.importorskip('brotli')
+    bs.cache.set("news", OLD_NEWS * 100)
+    monkeypatch.setattr(bs, 'load_news', lambda refresh=False: bs.cache.get("news", 3600))
+    res = client.get('/news', headers={'Accept-Encoding': 'gzip, br'})
+    assert res.headers['Content-Encoding'] == 'br'
+
+
+def test_gzip_without_brotli(bs, client, monkeypatch):
+    monkeypatch.setattr(bs.payloads, 'brotli', None)
+    bs.cache.set("news", OLD_NEWS * 100)
+    monkeypatch.setattr(bs, 'load_news', lambda refresh=False: bs.cache.get("news", 3600))
+    res = client.get('/news', headers={'Accept-Encoding': 'gzip, br'})
+    assert res.headers['Content-Encoding'] == 'gzip'
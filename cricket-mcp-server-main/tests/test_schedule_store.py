@@ -0,0 +1,117 @@
+import pytest
+
+from schedule_store import ScheduleStore
+
+RECORDS = [
+    {"id": "c", "date": "2026-11-03T09:00:00", "teams": ["India", "Australia"],
+     "matchType": "test", "series_id": "s1", "started": False},
+    {"id": "a", "date": "2026-11-01T09:00:00", "teams": ["England", "Pakistan"],
+     "matchType": "odi", "series_id": "s2", "started": True},
+    {"id": "b", "date": "2026-11-01T09:00:00", "teams": ["India", "Pakistan"],
+     "matchType": "t20", "series_id": "s2", "started": False},
+    {"id": "d", "date": "2026-11-05T14:00:00", "teams": ["India", "England"],
+     "matchType": "odi", "series_id": "s3", "started": False},
+]
+
+
+def _ids(result):
+    return [r["id"] for r in result[0]]
+
+
+@pytest.fixture
+def store():
+    store = ScheduleStore()
+    store.load(RECORDS)
+    return store
+
+
+def test_results_are_sorted_by_date_then_id(store):
+    assert _ids(store.query()) == ["a", "b", "c", "d"]
+    store.merge([{"id": "a", "date": "2026-11-04T09:00:00", "teams": ["England", "Pakistan"]}])
+    assert _ids(store.query()) == ["b", "c", "a", "d"]
+    # The old postings went with the old record
+    assert _ids(store.query(fmt="odi")) == ["d"]
+
+
+def test_filters_intersect(store):
+    assert _ids(store.query(team="INDIA")) == ["b", "c", "d"]
+    assert _ids(store.query(team="india", fmt="ODI")) == ["d"]
+    assert _ids(store.query(series="s2")) == ["a", "b"]
+    assert _ids(store.query(series="s2", upcoming=True)) == ["b"]
+    assert _ids(store.query(team="Kenya")) == []
+    assert _ids(store.query(date_from="2026-11-02", date_to="2026-11-03")) == ["c"]
+    assert _ids(store.query(date_to="2026-11-01")) == ["a", "b"]
+
+
+def test_cursor_pages_through_to_the_end(store):
+    page, cursor = store.query(limit=3)
+    assert [r["id"] for r in page] == ["a", "b", "c"]
+    assert cursor == "2026-11-03T09:00:00|c"
+    page, cursor = store.query(limit=3, cursor=cursor)
+    assert [r["id"] for r in page] == ["d"] and cursor is None
+    # Same date on both sides of a page boundary
+    page, cursor = store.query(limit=1)
+    assert _ids(store.query(limit=1, cursor=cursor)) == ["b"]
+
+
+def test_cursor_keeps_the_filters(store):
+    page, cursor = store.query(team="india", limit=2)
+    assert [r["id"] for r in page] == ["b", "c"]
+    assert store.query(team="india", limit=2, cursor=cursor) == ([store._by_id["d"]], None)
+
+
+def test_bad_cursor_is_rejected(store):
+    for cursor in ("garbage", "2026-11-01|", "|"):
+        with pytest.raises(ValueError):
+            store.query(cursor=cursor)
+
+
+# ----- /schedule -----
+
+def _crawl(rows, stale=False):
+    return lambda: {"data": rows, "status": "success", "complete": True, "stale": stale}
+
+
+def _expire(bs, key):
+    bs.cache._store[key]["timestamp"] -= bs.SCHEDULE_TTL + 1
+
+
+@pytest.fixture
+def schedule(bs, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', False)
+    monkeypatch.setattr(bs, 'SCHEDULE_MIN_UPCOMING', 0)
+    monkeypatch.setattr(bs, 'schedule_index', ScheduleStore())
+    rows = [{"id": r["id"], "dateTimeGMT": r["date"], "teams": r["teams"],
+             "matchStarted": r["started"]} for r in RECORDS]
+    monkeypatch.setattr(bs, 'fetch_all_matches', _crawl(rows))
+    return bs
+
+
+def test_route_pages_with_next_cursor(schedule, client):
+    res = client.get('/schedule?limit=3')
+    assert [m["id"] for m in res.get_json()] == ["a", "b", "c"]
+    res = client.get('/schedule?limit=3&cursor=' + res.headers['X-Next-Cursor'])
+    assert [m["id"] for m in res.get_json()] == ["d"]
+    assert 'X-Next-Cursor' not in res.headers
+    res = client.get('/schedule?cursor=garbage')
+    assert res.status_code == 400
+
+
+def test_failed_crawl_serves_the_index_flagged_stale(schedule, client, monkeypatch):
+    res = client.get('/schedule')
+    assert len(res.get_json()) == 4 and 'X-Schedule-Stale' not in res.headers
+
+    _expire(schedule, "schedule")
+    monkeypatch.setattr(schedule, 'fetch_all_matches', lambda: {"error": "quota", "status": "error"})
+    res = client.get('/schedule')
+    assert len(res.get_json()) == 4
+    assert res.headers['X-Schedule-Stale'] == '1'
+
+    # Partial crawl: some pages failed, rows from earlier crawls fill the gaps
+    _expire(schedule, "schedule")
+    monkeypatch.setattr(schedule, 'fetch_all_matches', _crawl([], stale=True))
+    assert client.get('/schedule').headers['X-Schedule-Stale'] == '1'
+
+    _expire(schedule, "schedule")
+    monkeypatch.setattr(schedule, 'fetch_all_matches', _crawl([]))
+    assert 'X-Schedule-Stale' not in client.get('/schedule').headers
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import pytest
+
+import scraper
+from schedule_store import ScheduleStore
+
+PAGE = (Path(__file__).parent / "fixtures" / "upcoming_series.html").read_bytes()
+
+
+class _Response:
+    def __init__(self, content):
+        self.status_code = 200
+        self.content = content
+        self.headers = {}
+
+
+class _Session:
+    """Serves the saved upcoming-series page and counts GETs."""
+
+    def __init__(self):
+        self.content = PAGE
+        self.gets = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.gets.append(url)
+        return _Response(self.content)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = _Session()
+    monkeypatch.setattr(scraper, '_session', lambda: fake)
+    scraper._page_memo.clear()
+    yield fake
+    scraper._page_memo.clear()
+
+
+def test_upcoming_schedule_from_day_strips(session):
+    records = scraper.get_upcoming_schedule()
+    assert session.gets == ["https://www.cricbuzz.com/cricket-schedule/upcoming-series/international"]
+    assert scraper.SCHEDULE_RULES.last_rule == "day-strips"
+    # The Perth Test is listed twice (scheduled and live links): one record
+    assert [r["id"] for r in records] == ["cb-118402", "cb-118455", "cb-118417"]
+    assert records[0] == {
+        "id": "cb-118402",
+        "name": "Australia vs India, 1st Test",
+        "venue": "Perth Stadium, Perth",
+        "date": "2026-10-26T02:30:00",
+        "matchType": "test",
+        "status": "Upcoming",
+        "teams": ["Australia", "India"],
+        "series_id": "",
+        "series": "India tour of Australia, 2026",
+        "started": False,
+        "cricbuzz_id": "118402",
+        "source": "cricbuzz",
+    }
+    # No start time: dated by its strip, not by the next row's timestamp
+    assert records[1]["date"] == "2026-10-26"
+    assert records[1]["teams"] == ["Ireland", "West Indies"]
+    assert records[1]["matchType"] == "t20"
+    assert records[2]["venue"] == "Multan Cricket Stadium, Multan"
+
+
+def test_upcoming_schedule_falls_back_to_match_links(session):
+    session.content = PAGE.replace(b"cb-lv-grn-strip", b"cb-day-hdr")
+    records = scraper.get_upcoming_schedule()
+    assert scraper.SCHEDULE_RULES.last_rule == "match-links"
+    assert [(r["id"], r["date"]) for r in records] == [
+        ("cb-118402", "2026-10-26T02:30:00"), ("cb-118455", ""), ("cb-118417", "2026-11-01T09:30:00")]
+
+
+# ----- /schedule supplement -----
+
+def _cricapi(id, name, when):
+    return {"id": id, "name": name, "dateTimeGMT": when, "date": when[:10],
+            "teams": name.split(",")[0].split(" vs "), "matchStarted": False}
+
+
+@pytest.fixture
+def schedule(bs, session, monkeypatch):
+    monkeypatch.setattr(bs, 'SCRAPE_INLINE', True)
+    monkeypatch.setattr(bs, 'schedule_index', ScheduleStore())
+    # cricapi lists the Perth Test (other team order, other hour) but not the ODI
+    rows = [_cricapi("c1", "India vs Australia, 1st Test", "2026-10-26T01:30:00"),
+            _cricapi("c2", "Ireland vs West Indies, 3rd T20I", "2026-10-27T18:00:00")]
+    monkeypatch.setattr(bs, 'fetch_all_matches',
+                        lambda: {"data": rows, "status": "success", "complete": False, "stale": False})
+    return bs
+
+
+def test_supplement_adds_fixtures_cricapi_missed(schedule, client):
+    # Same teams and day as c1 is a duplicate; same teams as c2 on another day is not
+    ids = [m["id"] for m in client.get('/schedule').get_json()]
+    assert ids == ["cb-118455", "c1", "c2", "cb-118417"]
+    assert schedule.schedule_index.sources["cricbuzz"] == schedule.cache.stamp("schedule_cricbuzz")
+
+
+def test_supplement_only_when_cricapi_falls_short(schedule, client, monkeypatch):
+    monkeypatch.setattr(schedule, 'SCHEDULE_MIN_UPCOMING', 2)
+    rows = schedule.fetch_all_matches()["data"]
+    monkeypatch.setattr(schedule, 'fetch_all_matches',
+                        lambda: {"data": rows, "status": "success", "complete": True, "stale": False})
+    assert [m["id"] for m in client.get('/schedule').get_json()] == ["c1", "c2"]
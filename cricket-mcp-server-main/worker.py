@@ -0,0 +1,261 @@
+"""
+Scrape Worker — runs every Cricbuzz scrape outside the web process.
+===================================================================
+Parsing Cricbuzz HTML is CPU-bound, so the scrapes run in a process pool
+(SCRAPE_PROCESSES, default: CPU count) on a fixed schedule, and their
+results are written into the shared cache (CACHE_PATH) through the same
+store_* helpers the inline handlers use. Web processes started with
+SCRAPE_INLINE=false only read those keys.
+
+Usage:
+    CACHE_PATH=/data/cache.db python worker.py
+    (and run gunicorn with CACHE_PATH=/data/cache.db SCRAPE_INLINE=false)
+
+Jobs:
+    live         scraper.get_cricbuzz_matches   every SCRAPE_LIVE_INTERVAL s
+    rankings     scraper.get_icc_rankings_page  per category, every RANKINGS_TTL s
+    schedule     scraper.get_upcoming_schedule  every SCHEDULE_TTL s (the
+                 /schedule supplement when cricapi's listing falls short)
+    commentary   scraper.get_commentary         per match, when the
+                 CommentaryScheduler says it is due (match state from the
+                 /live feed, change rate, reader demand); at most
+                 SCRAPE_COMMENTARY_BATCH fetches in flight
+    scorecards   scraper.get_scorecard_and_status  per match readers asked
+                 for (noted by web processes), once MATCH_TTL old and not
+                 final; the result line only for ids /live does not list
+    profiles     scraper.get_profile_by_name    per player name readers asked
+                 for that is unknown or whose profile is older than PLAYER_TTL
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import scraper
+from commentary_scheduler import CommentaryScheduler
+
+SCRAPE_PROCESSES = int(os.environ.get('SCRAPE_PROCESSES', os.cpu_count() or 2))
+SCRAPE_LIVE_INTERVAL = int(os.environ.get('SCRAPE_LIVE_INTERVAL', 60))
+SCRAPE_COMMENTARY_BATCH = int(os.environ.get('SCRAPE_COMMENTARY_BATCH', SCRAPE_PROCESSES * 2))
+COMMENTARY_DEMAND_WINDOW = int(os.environ.get('COMMENTARY_DEMAND_WINDOW', 600))
+
+
+class ScrapeWorker:
+    """Schedules scrape jobs on a process pool and stores their results."""
+
+    def __init__(self, server, processes=SCRAPE_PROCESSES):
+        self.server = server
+        self.processes = processes
+        initializer, initargs = None, ()
+        if server.CACHE_PATH:
+            # Children keep the page memo, fetch counters and rule telemetry in the shared cache too
+            initializer, initargs = scraper.use_shared_cache, (server.CACHE_PATH,)
+        self.pool = ProcessPoolExecutor(max_workers=processes, initializer=initializer,
+                                        initargs=initargs)
+        self._busy = set()
+        self._lock = threading.Lock()
+        self.next_due = {"live": 0, "rankings": 0, "schedule": 0}
+        self.intervals = {
+            "live": SCRAPE_LIVE_INTERVAL,
+            "rankings": server.RANKINGS_TTL,
+            "schedule": server.SCHEDULE_TTL,
+        }
+        self.scheduler = CommentaryScheduler(demand_window=COMMENTARY_DEMAND_WINDOW)
+        self._demand_seen = {}
+        self._comm_in_flight = set()
+        self._cards_in_flight = set()
+        self._cards_fetched = {}
+        self._profiles_in_flight = set()
+        self._profiles_tried = {}
+
+    def _start(self, job):
+        with self._lock:
+            if job in self._busy:
+                return False
+            self._busy.add(job)
+            return True
+
+    def _finish(self, job, started):
+        with self._lock:
+            self._busy.discard(job)
+        print(f"[worker] {job} done in {time.time() - started:.1f}s")
+
+    def run_live(self):
+        started = time.time()
+        future = self.pool.submit(scraper.get_cricbuzz_matches)
+
+        def done(f):
+            try:
+                matches = f.result()
+                if matches:
+                    self.server.store_scraped_live(matches)
+            except Exception as e:
+                print(f"[worker] live scrape failed: {e}")
+            self._finish("live", started)
+        future.add_done_callback(done)
+
+    def run_rankings(self):
+        started = time.time()
+        jobs = self.server.ranking_jobs()
+        futures = [self.pool.submit(scraper.get_icc_rankings_page, cat) for cat in jobs]
+
+        def collect():
+            scraped = {}
+            for job, future in zip(jobs, futures):
+                try:
+                    scraped[job] = future.result()
+                except Exception as e:
+                    print(f"[worker] rankings {job} failed: {e}")
+            self.server.store_rankings(scraped)
+            self._finish("rankings", started)
+        threading.Thread(target=collect, daemon=True).start()
+
+    def run_schedule(self):
+        started = time.time()
+        future = self.pool.submit(scraper.get_upcoming_schedule)
+
+        def done(f):
+            try:
+                records = f.result()
+                if records:
+                    self.server.store_upcoming_series(records)
+            except Exception as e:
+                print(f"[worker] schedule scrape failed: {e}")
+            self._finish("schedule", started)
+        future.add_done_callback(done)
+
+    def sync_commentary_inputs(self):
+        """Feed the scheduler match states and the demand web processes noted."""
+        cache = self.server.cache
+        feed = cache.get("live_feed", self.server.WORKER_STALE_TTL)
+        if feed:
+            self.scheduler.sync_live(feed["matches"], cache.stamp("live_feed"))
+        demand = cache.get(self.server.COMMENTARY_DEMAND_KEY, COMMENTARY_DEMAND_WINDOW * 2) or {}
+        for mid, seen in demand.items():
+            if str(mid).isdigit() and seen > self._demand_seen.get(mid, 0):
+                self._demand_seen[mid] = seen
+                self.scheduler.record_demand(mid, seen)
+        self._demand_seen = {mid: seen for mid, seen in self._demand_seen.items() if mid in demand}
+
+    def run_commentary(self):
+        self.sync_commentary_inputs()
+        room = SCRAPE_COMMENTARY_BATCH - len(self._comm_in_flight)
+        if room <= 0:
+            return
+        for mid in self.scheduler.due(limit=room):
+            if mid in self._comm_in_flight:
+                continue
+            self._comm_in_flight.add(mid)
+            self.pool.submit(scraper.get_commentary, mid).add_done_callback(
+                lambda f, mid=mid: self._store_commentary(mid, f))
+
+    def _store_commentary(self, mid, future):
+        cache = self.server.cache
+        changed = False
+        try:
+            data = future.result()
+            key = f"comm_{mid}"
+            changed = data != cache.get(key, self.server.WORKER_STALE_TTL)
+            cache.set(key, data)
+        except Exception as e:
+            print(f"[worker] commentary {mid} failed: {e}")
+        finally:
+            self.scheduler.record_fetch(mid, changed)
+            self._comm_in_flight.discard(mid)
+
+    def run_scorecards(self):
+        server = self.server
+        demand = server.cache.get(server.SCORECARD_DEMAND_KEY, COMMENTARY_DEMAND_WINDOW * 2) or {}
+        now = time.time()
+        # Also spaces out retries of scorecards that are not available yet
+        self._cards_fetched = {m: t for m, t in self._cards_fetched.items()
+                               if m in demand and now - t < server.MATCH_TTL}
+        for mid in demand:
+            if len(self._cards_in_flight) >= SCRAPE_COMMENTARY_BATCH:
+                return
+            if not str(mid).isdigit() or mid in self._cards_in_flight or mid in self._cards_fetched:
+                continue
+            cached, due = server.scorecard_due(mid)
+            if not due:
+                continue
+            self._cards_in_flight.add(mid)
+            self._cards_fetched[mid] = now
+            self.pool.submit(scraper.get_scorecard_and_status, mid, len(server.frozen_innings(cached)),
+                             not server.cricbuzz_feed_match(mid)
+                             ).add_done_callback(lambda f, mid=mid: self._store_scorecard(mid, f))
+
+    def _store_scorecard(self, mid, future):
+        try:
+            cached, _ = self.server.scorecard_due(mid)
+            innings, status = future.result()
+            self.server.store_match_details(mid, cached, innings,
+                                            self.server.cricbuzz_meta(mid, status))
+        except Exception as e:
+            print(f"[worker] scorecard {mid} failed: {e}")
+        finally:
+            self._cards_in_flight.discard(mid)
+
+    def run_profiles(self):
+        server = self.server
+        demand = server.cache.get(server.PROFILE_DEMAND_KEY, COMMENTARY_DEMAND_WINDOW * 2) or {}
+        now = time.time()
+        self._profiles_tried = {n: t for n, t in self._profiles_tried.items()
+                                if n in demand and now - t < server.MATCH_TTL}
+        for name in demand:
+            if len(self._profiles_in_flight) >= SCRAPE_COMMENTARY_BATCH:
+                return
+            if name in self._profiles_in_flight or name in self._profiles_tried:
+                continue
+            profile_id = server.profile_index.lookup(name)
+            if profile_id is None and server.profile_index.missed(name):
+                continue
+            if profile_id and not server.profile_due(profile_id):
+                continue
+            self._profiles_in_flight.add(name)
+            self._profiles_tried[name] = now
+            self.pool.submit(scraper.get_profile_by_name, name, profile_id).add_done_callback(
+                lambda f, name=name: self._store_profile(name, f))
+
+    def _store_profile(self, name, future):
+        try:
+            profile_id, url, profile = future.result()
+            self.server.learn_profile_id(name, profile_id)
+            self.server.store_profile(profile_id, url, profile)
+        except Exception as e:
+            print(f"[worker] profile {name} failed: {e}")
+        finally:
+            self._profiles_in_flight.discard(name)
+
+    def tick(self):
+        now = time.time()
+        for job, due in self.next_due.items():
+            if now >= due and self._start(job):
+                self.next_due[job] = now + self.intervals[job]
+                getattr(self, f"run_{job}")()
+        self.run_commentary()
+        self.run_scorecards()
+        self.run_profiles()
+
+    def run_forever(self):
+        print(f"[worker] scraping with {self.processes} processes")
+        try:
+            while True:
+                self.tick()
+                time.sleep(1)
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    import bridge_server
+    if not bridge_server.CACHE_PATH:
+        print("[worker] CACHE_PATH is not set; results would stay in this process only.")
+        return 1
+    ScrapeWorker(bridge_server).run_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())